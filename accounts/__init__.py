@@ -43,4 +43,6 @@ The first version of this app should provide the following functionality:
     - Send an email to the user as confirmation
     - Validate the incoming data
     - Update the password
-"""
\ No newline at end of file
+"""
+
+default_app_config = "accounts.apps.AccountsConfig"
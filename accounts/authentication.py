@@ -0,0 +1,110 @@
+"""Accounts Authentication
+
+The token authentication used for the API.
+
+DRF's `TokenAuthentication` looks the token and the user up on every request,
+and most views then load the user's languages with more queries. Instead, the
+token is looked up along with the user and their languages in a single query,
+and kept in a small in-process cache for a short time, so requests that hit
+the cache don't need any queries to authenticate.
+
+The cache is a least recently used cache of at most `TOKEN_CACHE_SIZE`
+tokens, and each token is only kept for `TOKEN_CACHE_TTL` seconds. The user's
+tokens are removed from the cache when they log out or their profile is
+saved, such as when they change their password, see `accounts.signals`. As
+each process has its own cache, the other processes will only notice the
+change once the token expires from their cache, so the TTL should be kept
+short.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+
+_TOKEN_CACHE = OrderedDict()
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+
+def _get_cached_token(key):
+    """Get a cached token
+
+    Returns:
+        Token: The cached token, or None if it isn't cached or has expired
+    """
+    with _TOKEN_CACHE_LOCK:
+        cached = _TOKEN_CACHE.get(key)
+        if cached is None:
+            return None
+
+        token, expires_at = cached
+        if expires_at <= time.monotonic():
+            del _TOKEN_CACHE[key]
+            return None
+
+        _TOKEN_CACHE.move_to_end(key)
+        return token
+
+
+def _cache_token(token):
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE[token.key] = (token, time.monotonic() + settings.TOKEN_CACHE_TTL)
+        _TOKEN_CACHE.move_to_end(token.key)
+        while len(_TOKEN_CACHE) > settings.TOKEN_CACHE_SIZE:
+            _TOKEN_CACHE.popitem(last=False)
+
+
+def invalidate_user_tokens(user_id):
+    """Invalidate the user's tokens
+
+    Remove any of the user's tokens from the cache, so that the next request
+    with the token will look it up again.
+
+    Args:
+        user_id (int): The ID of the user
+    """
+    with _TOKEN_CACHE_LOCK:
+        for key in [key for key, (token, _) in _TOKEN_CACHE.items()
+                    if token.user_id == user_id]:
+            del _TOKEN_CACHE[key]
+
+
+def clear_token_cache():
+    """Clear the token cache
+
+    Remove all of the tokens from the current process's cache.
+    """
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE.clear()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Cached Token Authentication
+
+    Token authentication that fetches the user and their languages along with
+    the token, and caches them for a short time, see the module docstring.
+
+    Each request is given its own copy of the cached user, so changes that a
+    view makes to `request.user` aren't seen by other requests.
+    """
+
+    def authenticate_credentials(self, key):
+        token = _get_cached_token(key)
+        if token is None:
+            try:
+                token = self.get_model().objects.select_related(
+                    "user__first_language", "user__language_being_learned",
+                    "user__language_preference").get(key=key)
+            except self.get_model().DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+            _cache_token(token)
+
+        token = copy.deepcopy(token)
+        return (token.user, token)
@@ -0,0 +1,200 @@
+"""Accounts Login History
+
+The helpers used to record when users log in and to work out their daily
+login streaks.
+
+Writing a row for every login would add a write to each login request, so
+the login events are collected in an in-process buffer instead and written
+with a single `bulk_create`. The buffer is flushed once it holds
+`LOGIN_EVENT_BATCH_SIZE` events, or `LOGIN_EVENT_FLUSH_INTERVAL` seconds
+after the first event was buffered, whichever comes first, and when the
+process exits. The writes happen on a background thread, so the login that
+fills the buffer doesn't wait for them.
+
+As the events are only kept in memory until they're flushed, the events
+that are buffered when a process is killed are lost. The streaks only count
+days, so missing the odd login rarely changes them. The same goes for the
+events that can't be written, which are logged and dropped rather than
+breaking the thread that writes them.
+"""
+import atexit
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from accounts.models import LoginEvent, UserProfile
+
+
+logger = logging.getLogger(__name__)
+
+
+_BUFFER = []
+_BUFFER_LOCK = threading.Lock()
+_flush_timer = None
+
+
+def _take_buffer():
+    """Take the buffer
+
+    Empty the buffer and cancel the timer. Must be called with the lock held.
+
+    Returns:
+        list: The buffered events
+    """
+    global _flush_timer
+    if _flush_timer is not None:
+        _flush_timer.cancel()
+        _flush_timer = None
+
+    events = _BUFFER[:]
+    _BUFFER.clear()
+    return events
+
+
+def _bulk_write_login_events(events):
+    """Write the login events in bulk
+
+    The events of users that have been deleted since they logged in are
+    dropped. If a user is deleted while the events are being written, the
+    events are written one at a time instead, so only that user's events
+    are dropped.
+
+    Returns:
+        int: The number of events that were written
+    """
+    user_ids = set(UserProfile.objects.filter(
+        id__in={event.user_id for event in events}).values_list("id", flat=True))
+    events = [event for event in events if event.user_id in user_ids]
+    try:
+        with transaction.atomic():
+            LoginEvent.objects.bulk_create(
+                events, batch_size=settings.LOGIN_EVENT_BATCH_SIZE)
+        return len(events)
+    except IntegrityError:
+        pass
+
+    written = 0
+    for event in events:
+        try:
+            with transaction.atomic():
+                event.save(force_insert=True)
+            written += 1
+        except IntegrityError:
+            logger.warning(
+                "Dropped a login event for user %s, who no longer exists", event.user_id)
+    return written
+
+
+def _write_login_events(events, close_connection=False):
+    """Write the login events
+
+    Returns:
+        int: The number of events that were written
+    """
+    written = 0
+    try:
+        if events:
+            written = _bulk_write_login_events(events)
+    except DatabaseError:
+        logger.exception("Couldn't write %d login events", len(events))
+    finally:
+        if close_connection:
+            # Each thread has its own connection, which would otherwise be left open
+            connection.close()
+    return written
+
+
+def _write_in_background(events):
+    threading.Thread(
+        target=_write_login_events, args=(events, True), daemon=True).start()
+
+
+def record_login(user_id):
+    """Record a login
+
+    Add a login event to the buffer, writing the buffer in the background if
+    it's full.
+
+    Args:
+        user_id (int): The ID of the user that logged in
+    """
+    global _flush_timer
+    event = LoginEvent(user_id=user_id, logged_in_at=timezone.now())
+
+    with _BUFFER_LOCK:
+        _BUFFER.append(event)
+        if len(_BUFFER) >= settings.LOGIN_EVENT_BATCH_SIZE:
+            events = _take_buffer()
+        else:
+            events = None
+            if _flush_timer is None:
+                _flush_timer = threading.Timer(
+                    settings.LOGIN_EVENT_FLUSH_INTERVAL, _flush_on_timer)
+                _flush_timer.daemon = True
+                _flush_timer.start()
+
+    if events:
+        _write_in_background(events)
+
+
+def _flush_on_timer():
+    with _BUFFER_LOCK:
+        events = _take_buffer()
+    _write_login_events(events, close_connection=True)
+
+
+def flush_login_events():
+    """Flush the login events
+
+    Write all of the buffered login events now, on the current thread.
+
+    Returns:
+        int: The number of events that were written
+    """
+    with _BUFFER_LOCK:
+        events = _take_buffer()
+    return _write_login_events(events)
+
+
+atexit.register(flush_login_events)
+
+
+def get_login_streak(user):
+    """Get the login streak
+
+    Count the number of days in a row that the user has logged in, with a
+    single query on the user's login events. The streak isn't broken until
+    the end of today, so it counts back from yesterday if the user hasn't
+    logged in yet today.
+
+    Args:
+        user (UserProfile): The user
+
+    Returns:
+        dict: The number of days in the streak, and whether the user has
+        logged in today
+    """
+    days = LoginEvent.objects.filter(user=user).annotate(
+        day=TruncDate("logged_in_at")
+    ).order_by("-day").values_list("day", flat=True).distinct()
+
+    today = timezone.localdate()
+    streak = 0
+    logged_in_today = False
+    expected_day = None
+    for day in days.iterator():
+        if expected_day is None:
+            if day < today - timedelta(days=1):
+                break
+            logged_in_today = day == today
+            expected_day = day
+        if day != expected_day:
+            break
+
+        streak += 1
+        expected_day = day - timedelta(days=1)
+
+    return {"streak": streak, "logged_in_today": logged_in_today}
@@ -45,3 +45,18 @@ class UserProfile(AbstractUser):
         on_delete=models.CASCADE,
         default=2
     )
+
+
+class LoginEvent(models.Model):
+    """
+    A record of each time that the user logged in, used to work out their
+    daily login streak, see `accounts.login_history`. The events are written
+    in batches, so the most recent logins may not have been saved yet.
+    """
+
+    user = models.ForeignKey(
+        UserProfile, related_name="login_events", on_delete=models.CASCADE)
+    logged_in_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "logged_in_at"])]
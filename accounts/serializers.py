@@ -23,7 +23,6 @@ from django.contrib.auth import authenticate
 from django.contrib.auth import password_validation
 from django.contrib.auth.models import BaseUserManager
 from rest_framework import serializers
-from rest_framework.authtoken.models import Token
 from rest_framework import exceptions
 from rest_framework.validators import UniqueValidator
 from accounts.models import UserProfile
@@ -69,10 +68,38 @@ class AuthorisedUserSerializer(serializers.ModelSerializer):
     def get_auth_token(self, obj):
         """Get auth token
 
-        Get the user's authentication token.
+        Get the user's authentication token. Login and registration both
+        attach the token to the user, so it isn't looked up again here.
         """
-        token = Token.objects.get(user=obj)
-        return token.key
+        return obj.auth_token.key
+
+
+class LanguageField(serializers.PrimaryKeyRelatedField):
+    """Language Field
+
+    A primary key field for the languages. The languages are all loaded by the
+    first of the fields to be validated, and shared with the other language
+    fields on the same serializer, so that validating all of the user's
+    languages only takes a single query.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("queryset", Language.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if not hasattr(self.parent, "_languages"):
+            self.parent._languages = self.get_queryset().in_bulk()
+
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            language = self.parent._languages.get(int(data))
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if language is None:
+            self.fail("does_not_exist", pk_value=data)
+        return language
 
 
 class RegisterUserSerializer(serializers.ModelSerializer):
@@ -86,14 +113,9 @@ class RegisterUserSerializer(serializers.ModelSerializer):
     )
     password = serializers.CharField(write_only=True)
     date_joined = serializers.DateTimeField(read_only=True)
-    first_language = serializers.PrimaryKeyRelatedField(
-        queryset=Language.objects.all())
-    language_being_learned = serializers.PrimaryKeyRelatedField(
-        queryset=Language.objects.all()
-    )
-    language_preference = serializers.PrimaryKeyRelatedField(
-        queryset=Language.objects.all()
-    )
+    first_language = LanguageField()
+    language_being_learned = LanguageField()
+    language_preference = LanguageField()
 
     class Meta:
         model = UserProfile
@@ -104,13 +126,9 @@ class RegisterUserSerializer(serializers.ModelSerializer):
     def validate_email(self, value):
         """Validate email
 
-        Validate the user's email address to ensure that the email address
-        doesn't already exist in the database. An error will be raise if the
-        email exists within the database
+        Normalize the user's email address. The `UniqueValidator` has already
+        checked that the email address doesn't exist in the database.
         """
-        user = UserProfile.objects.filter(email=value)
-        if user:
-            raise serializers.ValidationError('Email is already taken')
         return BaseUserManager.normalize_email(value)
     
     def validate_password(self, value):
@@ -0,0 +1,30 @@
+"""Accounts Signals
+
+The user's tokens are removed from the authentication cache when they log
+out, when their profile is saved, such as when their password is changed or
+they're deactivated, and when their token is deleted, see
+`accounts.authentication`.
+"""
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from accounts.authentication import invalidate_user_tokens
+from accounts.models import UserProfile
+
+
+@receiver(user_logged_out)
+def invalidate_logged_out_user_tokens(sender, user, **kwargs):
+    if user is not None:
+        invalidate_user_tokens(user.id)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_saved_user_tokens(sender, instance, **kwargs):
+    invalidate_user_tokens(instance.id)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_user_tokens(instance.user_id)
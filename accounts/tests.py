@@ -5,11 +5,16 @@ This should test for all of the functionality across the accounts app. Any and
 all initial data required to be in place for these tests should be loaded from
 the `fixtures`
 """
+from datetime import timedelta
+from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework.authtoken.models import Token
-from accounts.models import UserProfile
+from accounts.authentication import CachedTokenAuthentication, clear_token_cache
+from accounts.login_history import flush_login_events, record_login
+from accounts.models import LoginEvent, UserProfile
 from languages.models import Language
 
 
@@ -39,6 +44,12 @@ class AccountsViewTests(APITestCase):
             "language_being_learned": 2,
             "language_preference": 1
         }
+
+    def tearDown(self):
+        """
+        Write the login events from the test, so they aren't left in the buffer
+        """
+        flush_login_events()
     
     def test_registration(self):
         """Registration test
@@ -354,4 +365,210 @@ class AccountsViewTests(APITestCase):
         self.assertEqual(
             response.data[0],
             "Invalid email/password. Please try again!"
-        )
\ No newline at end of file
+        )
+
+    def test_that_registration_and_login_take_a_fixed_number_of_queries(self):
+        """Registration and login are kept to a minimum of queries
+
+        Registration checks that the username and email are unique, checks
+        all of the languages at once and creates the user and their token.
+        Login fetches the user and their token, which isn't looked up again
+        when the user is serialized
+        """
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                reverse("user-register"), self.user_details_as_dict, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data["auth_token"],
+            Token.objects.get(user__email=self.email).key)
+
+        with self.assertNumQueries(2):
+            response = self.client.post(reverse("user-login"), {
+                "username": self.username, "password": self.password
+            }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["auth_token"],
+            Token.objects.get(user__email=self.email).key)
+
+    def test_that_a_user_without_a_token_is_given_one_on_login(self):
+        """Users that were created without a token, such as superusers, get a
+        token the first time that they log in
+        """
+        UserProfile.objects.create_user(
+            email=self.email, username=self.username, password=self.password)
+
+        response = self.client.post(reverse("user-login"), {
+            "username": self.username, "password": self.password
+        }, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(Token.objects.filter(user__email=self.email).exists())
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+    """
+    The test cases for the cached token authentication
+    """
+    fixtures = ['fixtures.json']
+
+    def setUp(self):
+        """
+        Start each test with an empty cache and a token for the user
+        """
+        clear_token_cache()
+        self.user = UserProfile.objects.get(email="aaronsnig@gmail.com")
+        self.token, _ = Token.objects.get_or_create(user=self.user)
+        self.authentication = CachedTokenAuthentication()
+
+    def test_that_a_cached_token_doesnt_need_any_queries(self):
+        """The token, the user and their languages are fetched in one query,
+        and not fetched again while the token is cached
+        """
+        with self.assertNumQueries(1):
+            self.authentication.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(0):
+            user, token = self.authentication.authenticate_credentials(self.token.key)
+            self.assertEqual(user.language_being_learned.short_code, "pt")
+            self.assertEqual(user.first_language.short_code, "en")
+        self.assertEqual(token.key, self.token.key)
+
+    def test_that_each_request_gets_its_own_copy_of_the_user(self):
+        """Changes to the user in one request aren't seen by the next one
+        """
+        user, _ = self.authentication.authenticate_credentials(self.token.key)
+        user.first_name = "Changed"
+
+        user, _ = self.authentication.authenticate_credentials(self.token.key)
+        self.assertNotEqual(user.first_name, "Changed")
+
+    def test_that_changing_the_password_removes_the_token_from_the_cache(self):
+        """The token is looked up again once the user has been saved
+        """
+        self.authentication.authenticate_credentials(self.token.key)
+        self.user.set_password("anewpassword")
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    def test_that_logging_out_removes_the_token_from_the_cache(self):
+        """The token is looked up again once the user has logged out
+        """
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        response = self.client.post(reverse("user-logout"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(1):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    @override_settings(TOKEN_CACHE_SIZE=1)
+    def test_that_the_least_recently_used_token_is_removed(self):
+        """The cache doesn't grow beyond its size
+        """
+        other_user = UserProfile.objects.create_user(
+            email="other@example.com", username="other", password="testpassword")
+        other_token = Token.objects.create(user=other_user)
+
+        self.authentication.authenticate_credentials(self.token.key)
+        self.authentication.authenticate_credentials(other_token.key)
+
+        with self.assertNumQueries(1):
+            self.authentication.authenticate_credentials(self.token.key)
+
+    @override_settings(TOKEN_CACHE_TTL=0)
+    def test_that_expired_tokens_are_looked_up_again(self):
+        """Tokens are only cached for the TTL
+        """
+        self.authentication.authenticate_credentials(self.token.key)
+
+        with self.assertNumQueries(1):
+            self.authentication.authenticate_credentials(self.token.key)
+
+
+class LoginHistoryTests(APITestCase):
+    """
+    The test cases for the login history and streaks
+    """
+    fixtures = ['fixtures.json']
+
+    def setUp(self):
+        """
+        Give the user a password that they can log in with
+        """
+        self.user = UserProfile.objects.get(email="aaronsnig@gmail.com")
+        self.user.set_password("testpassword")
+        self.user.save()
+
+    def tearDown(self):
+        """
+        Write the login events from the test, so they aren't left in the buffer
+        """
+        flush_login_events()
+
+    def _log_in_on(self, *days_ago):
+        """
+        A helper method used to add login events to the user's history
+        """
+        now = timezone.now()
+        LoginEvent.objects.bulk_create([
+            LoginEvent(user=self.user, logged_in_at=now - timedelta(days=days))
+            for days in days_ago
+        ])
+
+    def test_that_logins_are_buffered_and_written_in_a_batch(self):
+        """Logging in doesn't write the event, which is written along with the
+        other buffered events when the buffer is flushed
+        """
+        for _ in range(3):
+            response = self.client.post(reverse("user-login"), {
+                "username": "aaron", "password": "testpassword"
+            }, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(LoginEvent.objects.exists())
+
+        with self.assertNumQueries(4):
+            self.assertEqual(flush_login_events(), 3)
+        self.assertEqual(LoginEvent.objects.filter(user=self.user).count(), 3)
+
+    def test_that_the_login_events_of_deleted_users_are_dropped(self):
+        """The events of a user that was deleted after logging in are dropped,
+        without losing the other users' events
+        """
+        other_user = UserProfile.objects.create_user(
+            email="other@example.com", username="other", password="password")
+        record_login(self.user.id)
+        record_login(other_user.id)
+        other_user.delete()
+
+        self.assertEqual(flush_login_events(), 1)
+        self.assertEqual(
+            list(LoginEvent.objects.values_list("user_id", flat=True)), [self.user.id])
+
+    def test_that_the_streak_counts_the_days_in_a_row(self):
+        """The streak is worked out with a single query, and ends at the first
+        day that the user didn't log in
+        """
+        self._log_in_on(0, 0, 1, 2, 4)
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("user-streak"))
+
+        self.assertEqual(response.data, {"streak": 3, "logged_in_today": True})
+
+    def test_that_the_streak_continues_until_the_end_of_today(self):
+        """A user that logged in yesterday still has their streak
+        """
+        self._log_in_on(1, 2)
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(reverse("user-streak"))
+        self.assertEqual(response.data, {"streak": 2, "logged_in_today": False})
+
+        LoginEvent.objects.all().delete()
+        self._log_in_on(2, 3)
+        response = self.client.get(reverse("user-streak"))
+        self.assertEqual(response.data, {"streak": 0, "logged_in_today": False})
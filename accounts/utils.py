@@ -22,7 +22,8 @@ def get_and_authenticate_user(username, password):
     
     Returns:
         UserProfile: An authenticated user instance is returned if the
-        authentication process is successful
+        authentication process is successful, with their token, which is
+        created if they don't have one yet
     
     Raises:
         ValidationError: If the username and password cannot be matched
@@ -41,6 +42,10 @@ def get_and_authenticate_user(username, password):
     if user is None:
         raise serializers.ValidationError(
             "Invalid email/password. Please try again!")
+
+    # Attach the token to the user, so that it doesn't need to be looked up
+    # again when the user is serialized
+    user.auth_token, _ = Token.objects.get_or_create(user=user)
     return user
 
 
@@ -87,5 +92,6 @@ def create_user_account(
         first_language=first_language,
         language_being_learned=language_being_learned,
         language_preference=language_preference)
-    token = Token.objects.create(user=user)
+    # Creating the token also attaches it to the user
+    Token.objects.create(user=user)
     return user
\ No newline at end of file
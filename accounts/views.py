@@ -8,6 +8,7 @@ from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from accounts.models import UserProfile
 from . import serializers
+from .login_history import get_login_streak, record_login
 from .utils import get_and_authenticate_user, create_user_account
 
 
@@ -33,6 +34,9 @@ class AuthViewSet(viewsets.GenericViewSet):
         user's token to the client. The request data will be serialized as per
         the requirements of the `UserLoginSerializer`.
 
+        The login is added to the user's login history, which is written in
+        batches so that it doesn't slow the login down.
+
         Returns:
             AuthorizedUserSerializer: A JSON-ified UserProfile object which
             also includes the token for that user
@@ -40,6 +44,7 @@ class AuthViewSet(viewsets.GenericViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = get_and_authenticate_user(**serializer.validated_data)
+        record_login(user.id)
         data = serializers.AuthorisedUserSerializer(user).data
         return Response(data=data, status=status.HTTP_200_OK)
     
@@ -48,6 +53,7 @@ class AuthViewSet(viewsets.GenericViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = create_user_account(**serializer.validated_data)
+        record_login(user.id)
         data = serializers.AuthorisedUserSerializer(user).data
         return Response(data=data, status=status.HTTP_201_CREATED)
     
@@ -58,6 +64,20 @@ class AuthViewSet(viewsets.GenericViewSet):
         data = {'success': 'Successfully logged out'}
         return Response(data=data, status=status.HTTP_200_OK)
     
+    @action(methods=['GET'], detail=False, permission_classes=[IsAuthenticated])
+    def streak(self, request):
+        """Streak
+
+        Get the number of days in a row that the user has logged in, worked
+        out from their login history, see `accounts.login_history`.
+
+        Returns:
+            dict: The number of days in the streak, and whether the user has
+            logged in today
+        """
+        data = get_login_streak(request.user)
+        return Response(data=data, status=status.HTTP_200_OK)
+
     def get_serializer_class(self):
         """Get Serializer Class
 
@@ -21,6 +21,7 @@ class Book(models.Model):
     language = models.ForeignKey(Language, on_delete=models.CASCADE)
     small_thumbnail = models.URLField(blank=True, null=True)
     thumbnail = models.URLField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.title
\ No newline at end of file
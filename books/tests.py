@@ -8,6 +8,8 @@ from the Google Books API, however I should still be able to test:
     - An error is thrown if the request isn't authenticated
     - The Google Books will not be called if the data already exists within
         Decyphr
+    - A book that hasn't changed since the client last retrieved it isn't
+        sent again
 """
 from django.urls import reverse
 from rest_framework import status
@@ -65,3 +67,24 @@ class BooksTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(1, response.data["language"])
+
+    def test_an_unchanged_book_is_not_sent_again(self):
+        """A client that sends back the ETag of a book that hasn't changed
+        receives a 304, and a new ETag once the book has been updated
+        """
+        language = Language.objects.get(name="Brazilian Portuguese")
+        book = Book.objects.create(
+            title="O Alquimista", author="Paulo Coelho", language=language)
+        url = reverse("books-detail", kwargs={"pk": book.id})
+        self.client.force_authenticate(user=UserProfile.objects.first())
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        book.description = "Um pastor parte em busca de um tesouro"
+        book.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
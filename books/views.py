@@ -9,6 +9,9 @@ and if it's not, the book will be searched for in Google Books and if found
 there, they will be added to the database and for easier access when a client
 tries to access this data at a later point.
 """
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
@@ -36,6 +39,12 @@ class BookViewSet(viewsets.ModelViewSet):
         
         Retrieve a single book instance based on it's ID.
 
+        The response includes an `ETag` that is based on when the book was last
+        updated. Clients that send it back will receive a `304 Not Modified` if
+        the book hasn't changed since, without the book being serialized
+        again. `Last-Modified` isn't sent, as it only has whole seconds and
+        would miss the updates made within the same second.
+
         Args:
             self (BookViewSet): The current BookViewSet instance
             request (Request): The current request being handled
@@ -74,9 +83,16 @@ class BookViewSet(viewsets.ModelViewSet):
         Raises:
             HTTP 401 Unauthorized status if the user is not authorized
         """
-        book = Book.objects.get(id=pk)
-        serializer = self.serializer_class(book)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        book = get_object_or_404(Book, id=pk)
+        etag = quote_etag(f"{book.id}-{book.updated_at.timestamp()}")
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            serializer = self.serializer_class(book)
+            response = Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        response["ETag"] = etag
+        return response
     
     def list(self, request):
         """Get a list of books
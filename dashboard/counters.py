@@ -0,0 +1,138 @@
+"""Dashboard Counters
+
+The helpers used to keep the `DashboardCounters` up to date.
+
+The counters are incremented and decremented in the database with `F`
+expressions as translations, library books, practice sessions and reading
+sessions are created and deleted, see `dashboard.signals`. Code that creates
+them with `bulk_create` or claims practice sessions with `QuerySet.update`
+doesn't send any signals, so it updates the counters itself.
+
+The counters are created from the actual counts the first time that the user
+opens their dashboard, and increments for users without counters are
+skipped, as they'll be counted then. The `reconcile_dashboard_counters`
+management command recounts them, in case they ever drift.
+"""
+from django.db import transaction
+from django.db.models import Count, F
+from decypher.db import upsert
+from accounts.models import UserProfile
+from dashboard.models import DashboardCounters
+from library.models import LibraryBook
+from practice.models import Session
+from reading_sessions.models import ReadingSession
+from translator.models import Translation
+
+
+FIELDS = ["translations", "library_items", "practice_sessions", "reading_sessions"]
+BATCH_SIZE = 1000
+
+
+def add_dashboard_counters(user_id, **increments):
+    """Add to the dashboard counters
+
+    Args:
+        user_id (int): The ID of the user
+        **increments: The amount to add to each of the counters, which can be
+        negative
+
+    Example:
+        The counters are named the same as on the `DashboardCounters` model::
+
+            add_dashboard_counters(user.id, library_items=-1)
+    """
+    updates = {
+        field: F(field) + value for field, value in increments.items() if value}
+    if updates:
+        DashboardCounters.objects.filter(user_id=user_id).update(**updates)
+
+
+def count_dashboard_counters(users):
+    """Count the dashboard counters
+
+    Count everything on the users' dashboards, with one grouped query for
+    each of the counters.
+
+    Args:
+        users (QuerySet): The users that should be counted
+
+    Returns:
+        dict: Maps the ID of each user to their `DashboardCounters`, which
+        aren't saved
+    """
+    counts = {
+        "translations": Translation.objects.filter(user__in=users).values("user_id"),
+        "library_items": LibraryBook.objects.filter(user__in=users).values("user_id"),
+        "practice_sessions": Session.objects.filter(
+            user__in=users, claimed_on__isnull=False).values("user_id"),
+        "reading_sessions": ReadingSession.objects.filter(
+            library_item__user__in=users).values(user_id=F("library_item__user_id")),
+    }
+
+    counters = {
+        user_id: DashboardCounters(user_id=user_id)
+        for user_id in users.values_list("id", flat=True)
+    }
+    for field, rows in counts.items():
+        for row in rows.annotate(count=Count("id")).order_by():
+            setattr(counters[row["user_id"]], field, row["count"])
+    return counters
+
+
+def get_dashboard_counters(user):
+    """Get the dashboard counters
+
+    Read the user's counters, counting them if they don't exist yet.
+
+    Args:
+        user (UserProfile): The user whose dashboard is being read
+
+    Returns:
+        DashboardCounters: The user's counters
+    """
+    counters = DashboardCounters.objects.filter(user=user).first()
+    if counters is not None:
+        return counters
+
+    counters = count_dashboard_counters(UserProfile.objects.filter(id=user.id))[user.id]
+    counters = upsert(DashboardCounters, {"user_id": user.id}, {
+        field: getattr(counters, field) for field in FIELDS}, {})
+    if counters is None:
+        # The counters were created by another request in the meantime
+        counters = DashboardCounters.objects.get(user=user)
+    return counters
+
+
+def reconcile_dashboard_counters(users):
+    """Reconcile the dashboard counters
+
+    Recount the users' counters and fix any that have drifted. The counters
+    are locked before they're recounted, so the increments made by other
+    requests in the meantime wait for the counts to be written rather than
+    being overwritten by them.
+
+    Args:
+        users (QuerySet): The users whose counters should be reconciled
+
+    Returns:
+        int: The number of counters that were fixed or created
+    """
+    with transaction.atomic():
+        existing = {
+            counters.user_id: counters
+            for counters in DashboardCounters.objects.select_for_update().filter(
+                user__in=users)
+        }
+        counted = count_dashboard_counters(users)
+        drifted = [
+            counters for user_id, counters in counted.items()
+            if user_id in existing and any(
+                getattr(counters, field) != getattr(existing[user_id], field)
+                for field in FIELDS)
+        ]
+        missing = [
+            counters for user_id, counters in counted.items() if user_id not in existing]
+
+        DashboardCounters.objects.bulk_update(drifted, FIELDS, batch_size=BATCH_SIZE)
+        DashboardCounters.objects.bulk_create(missing, batch_size=BATCH_SIZE)
+    return len(drifted) + len(missing)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from accounts.models import UserProfile
+from dashboard.rollups import build_daily_stats, build_hourly_stats
+
+
+class Command(BaseCommand):
+
+    help = "Rebuild the daily and hourly stats rollups from the history"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "users", nargs="*", type=int,
+            help="The IDs of the users to rebuild the rollups for, defaults to all")
+
+    def handle(self, *args, **kwargs):
+        users = UserProfile.objects.all()
+        if kwargs["users"]:
+            users = users.filter(id__in=kwargs["users"])
+
+        built = build_daily_stats(users)
+        self.stdout.write(f"Built {built} daily stats rollups")
+        built = build_hourly_stats(users)
+        self.stdout.write(f"Built {built} hourly stats rollups")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from accounts.models import UserProfile
+from dashboard.counters import reconcile_dashboard_counters
+
+
+class Command(BaseCommand):
+
+    help = "Recount the dashboard counters and fix any that have drifted"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "users", nargs="*", type=int,
+            help="The IDs of the users to reconcile the counters for, defaults to all")
+
+    def handle(self, *args, **kwargs):
+        users = UserProfile.objects.all()
+        if kwargs["users"]:
+            users = users.filter(id__in=kwargs["users"])
+
+        reconciled = reconcile_dashboard_counters(users)
+        self.stdout.write(f"Reconciled {reconciled} dashboard counters")
@@ -0,0 +1,34 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('seconds_read', models.IntegerField(default=0)),
+                ('pages', models.FloatField(default=0)),
+                ('translations', models.PositiveIntegerField(default=0)),
+                ('practice_sessions', models.PositiveIntegerField(default=0)),
+                ('practice_score_total', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailystats',
+            constraint=models.UniqueConstraint(fields=('user', 'day'), name='unique_daily_stats'),
+        ),
+    ]
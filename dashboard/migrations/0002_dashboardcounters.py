@@ -0,0 +1,26 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_auto_20200513_2000'),
+        ('dashboard', '0001_dailystats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounters',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='dashboard_counters', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('translations', models.IntegerField(default=0)),
+                ('library_items', models.IntegerField(default=0)),
+                ('practice_sessions', models.IntegerField(default=0)),
+                ('reading_sessions', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
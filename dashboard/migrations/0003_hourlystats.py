@@ -0,0 +1,35 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('dashboard', '0002_dashboardcounters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailystats',
+            name='reading_sessions',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='HourlyStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('reading_sessions', models.PositiveIntegerField(default=0)),
+                ('translations', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='hourlystats',
+            constraint=models.UniqueConstraint(fields=('user', 'hour'), name='unique_hourly_stats'),
+        ),
+    ]
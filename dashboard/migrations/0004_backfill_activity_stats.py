@@ -0,0 +1,73 @@
+"""
+Fill in the number of reading sessions on the existing daily rollups, and
+build the hourly rollups from the reading sessions and translations that
+were created before the hourly rollups were introduced. Only the days that
+already have a rollup are filled in, the `build_daily_stats` management
+command rebuilds the rest.
+"""
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+
+BATCH_SIZE = 1000
+
+
+def backfill_activity_stats(apps, schema_editor):
+    DailyStats = apps.get_model('dashboard', 'DailyStats')
+    HourlyStats = apps.get_model('dashboard', 'HourlyStats')
+    ReadingSession = apps.get_model('reading_sessions', 'ReadingSession')
+    Translation = apps.get_model('translator', 'Translation')
+
+    daily_sessions = {
+        (total['library_item__user_id'], total['day']): total['sessions']
+        for total in ReadingSession.objects.annotate(
+            day=TruncDate('created_on')
+        ).values('library_item__user_id', 'day').annotate(
+            sessions=Count('id')).order_by()
+    }
+    rollups = []
+    for rollup in DailyStats.objects.iterator():
+        sessions = daily_sessions.get((rollup.user_id, rollup.day), 0)
+        if rollup.reading_sessions != sessions:
+            rollup.reading_sessions = sessions
+            rollups.append(rollup)
+    DailyStats.objects.bulk_update(rollups, ['reading_sessions'], batch_size=BATCH_SIZE)
+
+    hourly_rollups = {}
+
+    def get_rollup(user_id, hour):
+        if (user_id, hour) not in hourly_rollups:
+            hourly_rollups[(user_id, hour)] = HourlyStats(user_id=user_id, hour=hour)
+        return hourly_rollups[(user_id, hour)]
+
+    reading_totals = ReadingSession.objects.annotate(
+        hour=TruncHour('created_on', tzinfo=timezone.utc)
+    ).values('library_item__user_id', 'hour').annotate(sessions=Count('id')).order_by()
+    for total in reading_totals:
+        get_rollup(
+            total['library_item__user_id'], total['hour']
+        ).reading_sessions = total['sessions']
+
+    translation_totals = Translation.objects.annotate(
+        hour=TruncHour('created_on', tzinfo=timezone.utc)
+    ).values('user_id', 'hour').annotate(translations=Count('id')).order_by()
+    for total in translation_totals:
+        get_rollup(total['user_id'], total['hour']).translations = total['translations']
+
+    HourlyStats.objects.all().delete()
+    HourlyStats.objects.bulk_create(hourly_rollups.values(), batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_hourlystats'),
+        ('reading_sessions', '0007_reading_events'),
+        ('translator', '0003_translation_normalized_answer'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_activity_stats, migrations.RunPython.noop),
+    ]
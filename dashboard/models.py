@@ -1,3 +1,72 @@
 from django.db import models
+from accounts.models import UserProfile
 
-# Create your models here.
+
+class DailyStats(models.Model):
+    """Daily Stats Model
+
+    The totals of a user's reading and studying for a single day, so that the
+    statistics for any range of dates can be read from one row per day rather
+    than from every session and translation, see `dashboard.rollups`.
+
+    The reading totals are counted on the day that the reading session was
+    started, and the practice totals on the day that the practice session was
+    started. `practice_score_total` is the sum of the scores of the finished
+    practice sessions, so the average score is
+    `practice_score_total / practice_sessions`.
+
+    `reading_sessions` and `translations` are also kept in `HourlyStats`, so
+    that the activity charts can be drawn for the last few days too.
+    """
+
+    user = models.ForeignKey(UserProfile, on_delete=models.CASCADE)
+    day = models.DateField()
+    seconds_read = models.IntegerField(default=0)
+    pages = models.FloatField(default=0)
+    reading_sessions = models.PositiveIntegerField(default=0)
+    translations = models.PositiveIntegerField(default=0)
+    practice_sessions = models.PositiveIntegerField(default=0)
+    practice_score_total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "day"], name="unique_daily_stats")
+        ]
+
+
+class HourlyStats(models.Model):
+    """Hourly Stats Model
+
+    The number of reading sessions that a user started and translations that
+    they made within a single hour, see `dashboard.timeseries`. The `hour` is
+    the start of the hour in UTC.
+    """
+
+    user = models.ForeignKey(UserProfile, on_delete=models.CASCADE)
+    hour = models.DateTimeField()
+    reading_sessions = models.PositiveIntegerField(default=0)
+    translations = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "hour"], name="unique_hourly_stats")
+        ]
+
+
+class DashboardCounters(models.Model):
+    """Dashboard Counters Model
+
+    The number of translations, library books, practice sessions and reading
+    sessions that the user has, so that the dashboard can be read from a
+    single row rather than counted each time, see `dashboard.counters`. Only
+    the practice sessions that the user has started are counted, not the
+    ones waiting in their pool.
+    """
+
+    user = models.OneToOneField(
+        UserProfile, on_delete=models.CASCADE, primary_key=True,
+        related_name="dashboard_counters")
+    translations = models.IntegerField(default=0)
+    library_items = models.IntegerField(default=0)
+    practice_sessions = models.IntegerField(default=0)
+    reading_sessions = models.IntegerField(default=0)
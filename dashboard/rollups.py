@@ -0,0 +1,272 @@
+"""Dashboard Rollups
+
+The helpers used to keep the `DailyStats` rollups up to date.
+
+The rollups are updated incrementally as the user reads, translates and
+practices, so that the statistics for a range of dates only need to read one
+row for each day. The reading and translation totals are incremented in the
+database with `F` expressions, so updates from different requests don't
+overwrite each other. The score of a practice session can change each time
+it's finished, so the practice totals for the day are recounted instead,
+which only reads that day's sessions.
+
+The number of reading sessions and translations are also rolled up by the
+hour in `HourlyStats`, for the activity charts, see `dashboard.timeseries`.
+
+The `build_daily_stats` management command rebuilds the rollups from the
+history, for when they're first introduced or if they ever drift.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+from decypher.db import upsert, upsert_increment
+from dashboard.models import DailyStats, HourlyStats
+from practice.models import Session
+from reading_sessions.models import ReadingSession
+from translator.models import Translation
+
+
+BATCH_SIZE = 1000
+
+
+def get_day(moment):
+    """Get the day
+
+    Args:
+        moment (datetime): A timezone aware date and time
+
+    Returns:
+        date: The day in the server's timezone
+    """
+    return timezone.localtime(moment).date()
+
+
+def get_hour(moment):
+    """Get the hour
+
+    Args:
+        moment (datetime): A timezone aware date and time
+
+    Returns:
+        datetime: The start of the hour in UTC
+    """
+    return moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def add_daily_stats(user_id, day, **increments):
+    """Add to the daily stats
+
+    Add the increments to the user's rollup for the day, creating the rollup
+    if it doesn't exist yet.
+
+    Args:
+        user_id (int): The ID of the user
+        day (date): The day that the increments belong to
+        **increments: The amount to add to each of the fields
+
+    Example:
+        The fields are named the same as on the `DailyStats` model::
+
+            add_daily_stats(user.id, get_day(session.created_on), pages=2)
+    """
+    increments = {field: value for field, value in increments.items() if value}
+    if increments:
+        upsert_increment(DailyStats, {"user_id": user_id, "day": day}, **increments)
+
+
+def add_activity_stats(user_id, moment, **increments):
+    """Add to the activity stats
+
+    Add the increments to both the user's hourly and daily rollups.
+
+    Args:
+        user_id (int): The ID of the user
+        moment (datetime): When the activity happened
+        **increments: The amount to add to each of the fields, which must be
+        on both `HourlyStats` and `DailyStats`
+    """
+    increments = {field: value for field, value in increments.items() if value}
+    if increments:
+        upsert_increment(
+            HourlyStats, {"user_id": user_id, "hour": get_hour(moment)}, **increments)
+        upsert_increment(
+            DailyStats, {"user_id": user_id, "day": get_day(moment)}, **increments)
+
+
+def _subtract_rollups(rollups, key, totals):
+    """Subtract from rollups
+
+    Lock the rollups and subtract the totals from them, writing them back
+    with a single bulk update.
+    """
+    rollups = list(rollups.select_for_update())
+    fields = set()
+    for rollup in rollups:
+        for field, value in totals[getattr(rollup, key)].items():
+            setattr(rollup, field, max(getattr(rollup, field) - value, 0))
+            fields.add(field)
+    if fields:
+        type(rollups[0]).objects.bulk_update(rollups, fields, batch_size=BATCH_SIZE)
+
+
+def remove_activity_stats(user_id, reading_sessions, translations):
+    """Remove from the activity stats
+
+    Subtract the reading sessions and translations from the user's hourly and
+    daily rollups, with a fixed number of queries however many of them there
+    are. This must be called before they're deleted.
+
+    Args:
+        user_id (int): The ID of the user
+        reading_sessions (QuerySet): The reading sessions being deleted
+        translations (QuerySet): The translations being deleted
+    """
+    hourly = defaultdict(dict)
+    daily = defaultdict(dict)
+
+    for total in reading_sessions.annotate(
+        hour=TruncHour("created_on", tzinfo=timezone.utc)
+    ).values("hour").annotate(sessions=Count("id")).order_by():
+        hourly[total["hour"]]["reading_sessions"] = total["sessions"]
+    for total in reading_sessions.annotate(day=TruncDate("created_on")).values(
+        "day"
+    ).annotate(sessions=Count("id"), pages=Sum("pages"), duration=Sum("duration")).order_by():
+        daily[total["day"]].update({
+            "reading_sessions": total["sessions"],
+            "pages": total["pages"] or 0,
+            "seconds_read": (
+                int(total["duration"].total_seconds()) if total["duration"] else 0),
+        })
+
+    for total in translations.annotate(
+        hour=TruncHour("created_on", tzinfo=timezone.utc)
+    ).values("hour").annotate(translations=Count("id")).order_by():
+        hourly[total["hour"]]["translations"] = total["translations"]
+    for total in translations.annotate(day=TruncDate("created_on")).values(
+        "day"
+    ).annotate(translations=Count("id")).order_by():
+        daily[total["day"]]["translations"] = total["translations"]
+
+    with transaction.atomic():
+        if hourly:
+            _subtract_rollups(
+                HourlyStats.objects.filter(user_id=user_id, hour__in=list(hourly)),
+                "hour", hourly)
+        if daily:
+            _subtract_rollups(
+                DailyStats.objects.filter(user_id=user_id, day__in=list(daily)),
+                "day", daily)
+
+
+def refresh_practice_stats(user_id, day):
+    """Refresh the practice stats
+
+    Recount the finished practice sessions that the user started on the day.
+
+    Args:
+        user_id (int): The ID of the user
+        day (date): The day that should be recounted
+    """
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    totals = Session.objects.filter(
+        user_id=user_id, claimed_on__gte=start,
+        claimed_on__lt=start + timedelta(days=1), score__isnull=False,
+    ).aggregate(sessions=Count("id"), score=Sum("score"))
+
+    values = {
+        "practice_sessions": totals["sessions"],
+        "practice_score_total": totals["score"] or 0,
+    }
+    upsert(DailyStats, {"user_id": user_id, "day": day}, values, values)
+
+
+def build_daily_stats(users):
+    """Build the daily stats
+
+    Replace the users' rollups with new ones built from their reading
+    sessions, translations and practice sessions.
+
+    Args:
+        users (QuerySet): The users that the rollups should be built for
+
+    Returns:
+        int: The number of rollups that were built
+    """
+    rollups = {}
+
+    def get_rollup(user_id, day):
+        if (user_id, day) not in rollups:
+            rollups[(user_id, day)] = DailyStats(user_id=user_id, day=day)
+        return rollups[(user_id, day)]
+
+    reading_totals = ReadingSession.objects.filter(library_item__user__in=users).annotate(
+        day=TruncDate("created_on")
+    ).values("library_item__user_id", "day").annotate(
+        sessions=Count("id"), pages=Sum("pages"), duration=Sum("duration")).order_by()
+    for total in reading_totals:
+        rollup = get_rollup(total["library_item__user_id"], total["day"])
+        rollup.reading_sessions = total["sessions"]
+        rollup.pages = total["pages"] or 0
+        rollup.seconds_read = int(total["duration"].total_seconds()) if total["duration"] else 0
+
+    translation_totals = Translation.objects.filter(user__in=users).annotate(
+        day=TruncDate("created_on")
+    ).values("user_id", "day").annotate(translations=Count("id")).order_by()
+    for total in translation_totals:
+        get_rollup(total["user_id"], total["day"]).translations = total["translations"]
+
+    practice_totals = Session.objects.filter(
+        user__in=users, claimed_on__isnull=False, score__isnull=False
+    ).annotate(day=TruncDate("claimed_on")).values("user_id", "day").annotate(
+        sessions=Count("id"), score=Sum("score")).order_by()
+    for total in practice_totals:
+        rollup = get_rollup(total["user_id"], total["day"])
+        rollup.practice_sessions = total["sessions"]
+        rollup.practice_score_total = total["score"]
+
+    with transaction.atomic():
+        DailyStats.objects.filter(user__in=users).delete()
+        DailyStats.objects.bulk_create(rollups.values(), batch_size=BATCH_SIZE)
+    return len(rollups)
+
+
+def build_hourly_stats(users):
+    """Build the hourly stats
+
+    Replace the users' hourly rollups with new ones built from their reading
+    sessions and translations.
+
+    Args:
+        users (QuerySet): The users that the rollups should be built for
+
+    Returns:
+        int: The number of rollups that were built
+    """
+    rollups = {}
+
+    def get_rollup(user_id, hour):
+        if (user_id, hour) not in rollups:
+            rollups[(user_id, hour)] = HourlyStats(user_id=user_id, hour=hour)
+        return rollups[(user_id, hour)]
+
+    reading_totals = ReadingSession.objects.filter(library_item__user__in=users).annotate(
+        hour=TruncHour("created_on", tzinfo=timezone.utc)
+    ).values("library_item__user_id", "hour").annotate(sessions=Count("id")).order_by()
+    for total in reading_totals:
+        get_rollup(
+            total["library_item__user_id"], total["hour"]
+        ).reading_sessions = total["sessions"]
+
+    translation_totals = Translation.objects.filter(user__in=users).annotate(
+        hour=TruncHour("created_on", tzinfo=timezone.utc)
+    ).values("user_id", "hour").annotate(translations=Count("id")).order_by()
+    for total in translation_totals:
+        get_rollup(total["user_id"], total["hour"]).translations = total["translations"]
+
+    with transaction.atomic():
+        HourlyStats.objects.filter(user__in=users).delete()
+        HourlyStats.objects.bulk_create(rollups.values(), batch_size=BATCH_SIZE)
+    return len(rollups)
@@ -1,3 +1,5 @@
+from datetime import timedelta
+from django.utils import timezone
 from rest_framework import serializers
 from translator.serializers import TranslationSerializer
 from library.serializers import LibrarySerializer
@@ -8,4 +10,79 @@ class DashboardSerializer(serializers.Serializer):
     translations_count = serializers.IntegerField()
     library_item_count = serializers.IntegerField()
     practice_sessions_count = serializers.IntegerField()
-    reading_sessions_count = serializers.IntegerField()                                                                                                                                   
\ No newline at end of file
+    reading_sessions_count = serializers.IntegerField()
+
+
+class StatsQuerySerializer(serializers.Serializer):
+    """
+    The serializer used to deserialise the range of dates for the stats.
+    Both of the dates are included in the range, which defaults to the last
+    30 days
+    """
+
+    DEFAULT_DAYS = 30
+    MAX_DAYS = 366
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, data):
+        data.setdefault("end", timezone.localdate())
+        data.setdefault("start", data["end"] - timedelta(days=self.DEFAULT_DAYS - 1))
+        if data["start"] > data["end"]:
+            raise serializers.ValidationError("The start must be before the end")
+        if (data["end"] - data["start"]).days >= self.MAX_DAYS:
+            raise serializers.ValidationError(
+                f"The range can't be longer than {self.MAX_DAYS} days")
+        return data
+
+
+class StatsTotalsSerializer(serializers.Serializer):
+
+    minutes_read = serializers.FloatField()
+    pages = serializers.FloatField()
+    translations = serializers.IntegerField()
+    practice_sessions = serializers.IntegerField()
+    average_score = serializers.FloatField(allow_null=True)
+
+
+class DailyStatsSerializer(StatsTotalsSerializer):
+
+    day = serializers.DateField()
+
+
+class StatsSerializer(serializers.Serializer):
+
+    start = serializers.DateField()
+    end = serializers.DateField()
+    totals = StatsTotalsSerializer()
+    days = DailyStatsSerializer(many=True)
+
+
+class TimeseriesQuerySerializer(serializers.Serializer):
+    """
+    The serializer used to deserialise the range of the activity chart and
+    the maximum number of points in it
+    """
+
+    DAYS = [7, 30, 365]
+    DEFAULT_POINTS = 60
+    MAX_POINTS = 400
+
+    days = serializers.ChoiceField(choices=DAYS, default=30)
+    points = serializers.IntegerField(
+        min_value=1, max_value=MAX_POINTS, default=DEFAULT_POINTS)
+
+
+class TimeseriesBucketSerializer(serializers.Serializer):
+
+    start = serializers.DateTimeField()
+    reading_sessions = serializers.IntegerField()
+    translations = serializers.IntegerField()
+
+
+class TimeseriesSerializer(serializers.Serializer):
+
+    days = serializers.IntegerField()
+    bucket_seconds = serializers.IntegerField()
+    buckets = TimeseriesBucketSerializer(many=True)
@@ -0,0 +1,87 @@
+"""Dashboard Signals
+
+Every new translation and reading session is added to the user's rollups for
+the hour and the day that it was created on.
+
+The dashboard counters are incremented when translations, library books,
+practice sessions and reading sessions are created, and decremented when
+they're deleted. Only `post_save` sends the `created` argument, so it's used
+to tell the saves and deletes apart.
+
+The counter handlers are skipped when library books are removed in bulk, as
+the counters and rollups are updated for the whole batch at once then.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from decypher.signals import skippable
+from dashboard.counters import add_dashboard_counters
+from dashboard.rollups import add_activity_stats
+from library.models import LibraryBook
+from practice.models import Session
+from reading_sessions.models import ReadingSession
+from reading_sessions.utils import get_reading_session_user_id
+from translator.models import Translation
+
+
+def get_change(kwargs):
+    """Get the change
+
+    Returns:
+        int: 1 if the instance was created, -1 if it was deleted, or 0 if it
+        was updated
+    """
+    if "created" not in kwargs:
+        return -1
+    return 1 if kwargs["created"] else 0
+
+
+@receiver(post_save, sender=Translation)
+def count_translation(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        add_activity_stats(instance.user_id, instance.created_on, translations=1)
+
+
+@receiver(post_save, sender=Translation)
+@receiver(post_delete, sender=Translation)
+@skippable
+def count_dashboard_translation(sender, instance, raw=False, **kwargs):
+    if not raw:
+        add_dashboard_counters(instance.user_id, translations=get_change(kwargs))
+
+
+@receiver(post_save, sender=LibraryBook)
+@receiver(post_delete, sender=LibraryBook)
+@skippable
+def count_dashboard_library_book(sender, instance, raw=False, **kwargs):
+    if not raw:
+        add_dashboard_counters(instance.user_id, library_items=get_change(kwargs))
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+@skippable
+def count_dashboard_practice_session(sender, instance, raw=False, **kwargs):
+    # Pooled sessions are counted when they're claimed, see `claim_session`
+    if not raw and instance.claimed_on is not None:
+        add_dashboard_counters(instance.user_id, practice_sessions=get_change(kwargs))
+
+
+@receiver(post_save, sender=ReadingSession)
+def count_reading_session(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        add_activity_stats(
+            get_reading_session_user_id(instance), instance.created_on,
+            reading_sessions=1)
+
+
+@receiver(post_save, sender=ReadingSession)
+@receiver(post_delete, sender=ReadingSession)
+@skippable
+def count_dashboard_reading_session(sender, instance, raw=False, **kwargs):
+    change = get_change(kwargs)
+    if raw or not change:
+        return
+
+    user_id = get_reading_session_user_id(instance)
+    if user_id is not None:
+        add_dashboard_counters(user_id, reading_sessions=change)
@@ -1,3 +1,282 @@
-from django.test import TestCase
+"""
+The test cases for the dashboard API. This test suite should test for the
+following test cases:
 
-# Create your tests here.
+    - The daily stats rollups are updated as the user reads, translates and
+        practices, and the stats are served from them for a range of dates
+    - The rollups can be rebuilt from the history, with the same totals
+    - The range of dates for the stats must be valid
+    - The dashboard is read from the counters with a single query, and the
+        counters follow the user's translations, books and sessions
+    - Pooled practice sessions are only counted once they're claimed
+    - The counters can be reconciled if they drift
+    - The activity charts are read from the hourly or daily rollups with a
+        single query, with the gaps filled and the buckets downsampled
+    - The range and the number of points for the charts must be valid
+"""
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import UserProfile
+from books.models import Book
+from languages.models import Language
+from library.models import LibraryBook
+from reading_sessions.models import ReadingSession
+from translator.models import Translation
+from dashboard.models import DailyStats, DashboardCounters, HourlyStats
+from practice.utils import refill_session_pool
+
+
+class StatsTests(APITestCase):
+    """
+    The test cases for the daily stats
+    """
+    fixtures = ['fixtures.json']
+
+    def setUp(self):
+        """
+        Create a book in the user's library
+        """
+        self.user = UserProfile.objects.get(email="aaronsnig@gmail.com")
+        self.portuguese = Language.objects.get(name="Brazilian Portuguese")
+        self.english = Language.objects.get(name="English")
+        book = Book.objects.create(
+            title="Harry Potter", author="JK Rowling", language=self.portuguese)
+        self.library_item = LibraryBook.objects.create(user=self.user, book=book)
+        self.client.force_authenticate(user=self.user)
+
+    def _study(self):
+        """
+        A helper method used to read, translate and practice through the API
+        """
+        reading_session = self.client.post(reverse("reading-sessions-list"), {
+            "library_item": self.library_item.id, "duration": "00:00:00", "pages": 0,
+        }, format="json").data
+        self.client.patch(
+            reverse("reading-sessions-detail", kwargs={"pk": reading_session["id"]}),
+            {"pages": "4", "duration": "00:10:00", "status": "F"}, format="json")
+
+        for number in range(2):
+            Translation.objects.create(
+                user=self.user, source_text=f"texto {number}",
+                translated_text=f"text {number}", audio_file_path="",
+                source_language=self.portuguese, target_language=self.english,
+                session_id=reading_session["id"])
+
+        session = self.client.post(reverse("session")).data
+        question = session["question_set"][0]
+        self.client.put(
+            reverse("answer-question", kwargs={"pk": question["id"]}),
+            {"guess": question["correct_answer"]}, format="json")
+        self.client.put(
+            reverse("session-update", kwargs={"pk": session["id"]}),
+            {"duration": "00:01:00"}, format="json")
+
+    def test_that_the_stats_are_served_from_the_rollups(self):
+        """
+        Today's activity is rolled up, and the days without any activity are
+        filled with zeros
+        """
+        self._study()
+        today = timezone.localdate()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("stats"), {
+                "start": today - timedelta(days=2), "end": today})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["days"]), 3)
+        self.assertEqual(response.data["days"][0]["pages"], 0)
+        self.assertEqual(dict(response.data["totals"]), {
+            "minutes_read": 10.0,
+            "pages": 4.0,
+            "translations": 2,
+            "practice_sessions": 1,
+            "average_score": 50.0,
+        })
+
+    def test_that_the_rollups_can_be_rebuilt_from_the_history(self):
+        """
+        Rebuilding the rollups gives the same totals as the incremental
+        updates
+        """
+        self._study()
+        fields = [
+            "day", "seconds_read", "pages", "reading_sessions", "translations",
+            "practice_sessions", "practice_score_total"
+        ]
+        hourly_fields = ["hour", "reading_sessions", "translations"]
+        incremental = list(DailyStats.objects.values(*fields))
+        hourly = list(HourlyStats.objects.values(*hourly_fields))
+
+        DailyStats.objects.all().delete()
+        HourlyStats.objects.all().delete()
+        call_command("build_daily_stats", stdout=StringIO())
+
+        self.assertEqual(list(DailyStats.objects.values(*fields)), incremental)
+        self.assertEqual(list(HourlyStats.objects.values(*hourly_fields)), hourly)
+
+    def test_that_the_activity_for_the_last_week_is_bucketed_by_the_hour(self):
+        """
+        Every hour of the week is included, with today's activity in the
+        last bucket
+        """
+        self._study()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("timeseries"), {"days": 7, "points": 168})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["bucket_seconds"], 3600)
+        self.assertEqual(len(response.data["buckets"]), 168)
+        self.assertEqual(response.data["buckets"][0]["translations"], 0)
+        self.assertEqual(response.data["buckets"][-1]["translations"], 2)
+        self.assertEqual(response.data["buckets"][-1]["reading_sessions"], 1)
+
+    def test_that_the_activity_for_the_year_is_downsampled(self):
+        """
+        The daily buckets are added up into weeks to fit within the points,
+        without losing any of the activity, and the newest week is complete
+        """
+        self._study()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("timeseries"), {"days": 365, "points": 60})
+
+        self.assertEqual(response.data["bucket_seconds"], 7 * 24 * 60 * 60)
+        self.assertEqual(len(response.data["buckets"]), 53)
+        self.assertEqual(
+            sum(bucket["translations"] for bucket in response.data["buckets"]), 2)
+
+        # The padding goes at the start, so the last week ends with today
+        newest = response.data["buckets"][-1]
+        self.assertEqual(newest["translations"], 2)
+        self.assertEqual(
+            timezone.localtime(parse_datetime(str(newest["start"]))).date(),
+            timezone.localdate() - timedelta(days=6))
+
+    def test_that_the_range_of_the_activity_charts_must_be_valid(self):
+        """
+        Only the supported ranges can be charted, with a limited number of
+        points
+        """
+        response = self.client.get(reverse("timeseries"), {"days": 90})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(reverse("timeseries"), {"points": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_that_the_range_of_dates_must_be_valid(self):
+        """
+        The start can't be after the end, and the range can't be longer
+        than a year
+        """
+        today = timezone.localdate()
+
+        response = self.client.get(reverse("stats"), {
+            "start": today, "end": today - timedelta(days=1)})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(reverse("stats"), {
+            "start": today - timedelta(days=400), "end": today})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class DashboardTests(APITestCase):
+    """
+    The test cases for the dashboard counters
+    """
+    fixtures = ['fixtures.json']
+
+    def setUp(self):
+        """
+        Create a book with a reading session in the user's library and open
+        the dashboard, so that the counters are created
+        """
+        self.user = UserProfile.objects.get(email="aaronsnig@gmail.com")
+        self.portuguese = Language.objects.get(name="Brazilian Portuguese")
+        self.english = Language.objects.get(name="English")
+        self.book = Book.objects.create(
+            title="Harry Potter", author="JK Rowling", language=self.portuguese)
+        self.library_item = LibraryBook.objects.create(user=self.user, book=self.book)
+        self.reading_session = ReadingSession.objects.create(
+            library_item=self.library_item, duration=timedelta(minutes=5), pages=1)
+        self.client.force_authenticate(user=self.user)
+        self.client.get(reverse("dashboard"))
+
+    def _translate(self, count):
+        """
+        A helper method used to create translations for the user
+        """
+        return [
+            Translation.objects.create(
+                user=self.user, source_text=f"texto {number}",
+                translated_text=f"text {number}", audio_file_path="",
+                source_language=self.portuguese, target_language=self.english,
+                session=self.reading_session)
+            for number in range(count)
+        ]
+
+    def test_that_the_dashboard_is_read_from_the_counters(self):
+        """
+        Creating and deleting translations, books and sessions updates the
+        counters, and the dashboard reads them with one query
+        """
+        translations = self._translate(3)
+        translations[0].delete()
+        self.client.post(reverse("reading-sessions-list"), {
+            "library_item": self.library_item.id, "duration": "00:00:00", "pages": 0,
+        }, format="json")
+        self.client.post(reverse("session"))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("dashboard"))
+
+        self.assertEqual(response.data, {
+            "translations_count": 2,
+            "library_item_count": 1,
+            "practice_sessions_count": 1,
+            "reading_sessions_count": 2,
+        })
+
+        self.client.delete(
+            reverse("reading-list-bulk"), {"books": [self.book.id]}, format="json")
+        response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.data["library_item_count"], 0)
+        self.assertEqual(response.data["reading_sessions_count"], 0)
+
+    def test_that_pooled_sessions_are_counted_once_claimed(self):
+        """
+        The sessions waiting in the pool aren't on the dashboard until the
+        user starts one of them
+        """
+        self._translate(10)
+        refill_session_pool(self.user, size=2, count=5)
+        self.assertEqual(self.user.dashboard_counters.practice_sessions, 0)
+
+        self.client.post(reverse("session"))
+        self.user.dashboard_counters.refresh_from_db()
+        self.assertEqual(self.user.dashboard_counters.practice_sessions, 1)
+
+    def test_that_the_counters_can_be_reconciled(self):
+        """
+        Reconciling the counters recounts the ones that have drifted
+        """
+        self._translate(2)
+        DashboardCounters.objects.filter(user=self.user).update(
+            translations=7, library_items=0)
+
+        output = StringIO()
+        call_command("reconcile_dashboard_counters", stdout=output)
+
+        counters = DashboardCounters.objects.get(user=self.user)
+        self.assertEqual(counters.translations, 2)
+        self.assertEqual(counters.library_items, 1)
+        self.assertIn("Reconciled", output.getvalue())
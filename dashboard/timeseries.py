@@ -0,0 +1,127 @@
+"""Dashboard Time Series
+
+The helpers used to build the activity charts for the dashboard.
+
+The charts are read from the `HourlyStats` and `DailyStats` rollups rather
+than from the translations and reading sessions themselves, so drawing a
+chart only reads one row for each hour or day with any activity, no matter
+how long the user's history is. The last week is read from the hourly
+rollups, and anything longer from the daily rollups.
+
+The rollups are only stored for the hours and days with activity, so the
+series is filled with zeros, and then downsampled by adding up neighbouring
+buckets so that the chart has at most the requested number of points. The
+series is padded at the start when it's downsampled, so the newest bucket
+always covers a full bucket's worth of time.
+"""
+from datetime import datetime, time, timedelta
+import numpy
+from django.utils import timezone
+from dashboard.models import DailyStats, HourlyStats
+from dashboard.rollups import get_hour
+
+
+FIELDS = ["reading_sessions", "translations"]
+HOURLY_DAYS = 7
+
+
+def get_buckets(user, days):
+    """Get the buckets
+
+    Read the user's rollups for the last number of days into an array, with
+    a row for each hour or day in the range, including the ones without any
+    activity.
+
+    Args:
+        user (UserProfile): The user whose activity is being charted
+        days (int): The number of days, up to and including today
+
+    Returns:
+        tuple: The start of the first bucket, the length of each bucket, and
+        the array of counts, with a column for each of the `FIELDS`
+    """
+    if days <= HOURLY_DAYS:
+        step = timedelta(hours=1)
+        end = get_hour(timezone.now())
+        start = end - step * (days * 24 - 1)
+        rollups = HourlyStats.objects.filter(
+            user=user, hour__range=(start, end)).values_list("hour", *FIELDS)
+    else:
+        step = timedelta(days=1)
+        end = timezone.localdate()
+        start = end - step * (days - 1)
+        rollups = DailyStats.objects.filter(
+            user=user, day__range=(start, end)).values_list("day", *FIELDS)
+
+    buckets = numpy.zeros(((end - start) // step + 1, len(FIELDS)), dtype=numpy.int64)
+    for bucket, *counts in rollups:
+        buckets[(bucket - start) // step] = counts
+
+    if step == timedelta(days=1):
+        start = timezone.make_aware(datetime.combine(start, time.min))
+    return start, step, buckets
+
+
+def downsample(buckets, points):
+    """Downsample
+
+    Add up neighbouring buckets so that there are at most the given number
+    of them. The first bucket is padded with zeros if the buckets don't
+    divide evenly, so that the last bucket is complete.
+
+    Args:
+        buckets (numpy.ndarray): The counts for each bucket
+        points (int): The maximum number of buckets
+
+    Returns:
+        tuple: The number of the original buckets that were added up into each
+        of the new ones, the number of empty buckets that were added to the
+        start, and the new buckets
+    """
+    factor = -(-len(buckets) // points)
+    if factor == 1:
+        return factor, 0, buckets
+
+    padding = -len(buckets) % factor
+    padded = numpy.pad(buckets, ((padding, 0), (0, 0)))
+    return factor, padding, padded.reshape(-1, factor, buckets.shape[1]).sum(axis=1)
+
+
+def get_timeseries(user, days, points):
+    """Get the time series
+
+    Args:
+        user (UserProfile): The user whose activity is being charted
+        days (int): The number of days, up to and including today
+        points (int): The maximum number of points in the chart
+
+    Returns:
+        dict: The length of each bucket in seconds, and the start of and the
+        counts for each of the buckets
+
+    Example:
+        The time series will look like::
+
+            {
+                "bucket_seconds": 86400,
+                "buckets": [
+                    {
+                        "start": datetime(2020, 6, 1, tzinfo=utc),
+                        "reading_sessions": 1,
+                        "translations": 12
+                    }
+                ]
+            }
+    """
+    start, step, buckets = get_buckets(user, days)
+    factor, padding, buckets = downsample(buckets, points)
+    start -= step * padding
+    step *= factor
+
+    return {
+        "bucket_seconds": int(step.total_seconds()),
+        "buckets": [
+            {"start": start + step * index, **dict(zip(FIELDS, counts.tolist()))}
+            for index, counts in enumerate(buckets)
+        ],
+    }
@@ -4,6 +4,7 @@ from dashboard import views
 
 urlpatterns = [
     path("", views.Dashboard.as_view(), name="dashboard"),
+    path("timeseries/", views.TimeseriesView.as_view(), name="timeseries"),
 ]
 
 urlpatterns = format_suffix_patterns(urlpatterns)
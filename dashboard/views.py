@@ -1,35 +1,155 @@
+from datetime import timedelta
 from django.db.models import Count
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from .serializers import DashboardSerializer
-from translator.models import Translation
-from practice.models import Session
-from reading_sessions.models import ReadingSession
-from library.models import LibraryBook
+from .counters import get_dashboard_counters
+from .models import DailyStats
+from .serializers import (
+    DashboardSerializer, StatsQuerySerializer, StatsSerializer,
+    TimeseriesQuerySerializer, TimeseriesSerializer)
+from .timeseries import get_timeseries
 
 
 class Dashboard(APIView):
+    """Dashboard
+
+    Returns the number of translations, library books, practice sessions and
+    reading sessions that the user has. The numbers are read from the user's
+    counters with a single query, see `dashboard.counters`.
+    """
 
     permission_classes = (IsAuthenticated,)
     serializer_class = DashboardSerializer
 
     def get(self, request):
-        user = request.user
-        translations = Translation.objects.filter(user=user)
-        library_items = LibraryBook.objects.filter(user=user)
-        practice_sessions_count = Session.objects.filter(
-            user=user).count()
-        reading_session_count = ReadingSession.objects.filter(
-            library_item__user=user).count()
+        counters = get_dashboard_counters(request.user)
+
+        data = {
+            "library_item_count": counters.library_items,
+            "translations_count": counters.translations,
+            "practice_sessions_count": counters.practice_sessions,
+            "reading_sessions_count": counters.reading_sessions
+        }
+
+        serializer = self.serializer_class(data)
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+
+def summarize_stats(rollups, **fields):
+    """Summarize stats
+
+    Add up a set of daily stats rollups.
+
+    Args:
+        rollups (list): The `DailyStats` rollups
+        **fields: Any extra fields that should be included, such as the day
+
+    Returns:
+        dict: The totals, with the time read in minutes and the average score
+        of the practice sessions
+    """
+    practice_sessions = sum(rollup.practice_sessions for rollup in rollups)
+    practice_score_total = sum(rollup.practice_score_total for rollup in rollups)
+    return {
+        "minutes_read": round(sum(rollup.seconds_read for rollup in rollups) / 60, 1),
+        "pages": sum(rollup.pages for rollup in rollups),
+        "translations": sum(rollup.translations for rollup in rollups),
+        "practice_sessions": practice_sessions,
+        "average_score": (
+            round(practice_score_total / practice_sessions, 1)
+            if practice_sessions else None),
+        **fields,
+    }
+
+
+class StatsView(APIView):
+    """StatsView
+
+    Returns the user's reading and studying statistics for each day within a
+    range of dates, read from the daily rollups, see `dashboard.rollups`.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    serializer_class = StatsSerializer
+
+    def get(self, request):
+        """Get the stats
+
+        Example:
+            This endpoint will be available at::
+
+                /stats/?start=2020-06-01&end=2020-06-30
+
+            Both dates are optional, and default to the last 30 days. Days
+            without any activity are included with zeros.
+
+        Raises:
+            HTTP 400 Bad Request if the range is invalid, or longer than a year
+        """
+        query = StatsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(data=query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        start, end = query.validated_data["start"], query.validated_data["end"]
+        rollups = {
+            rollup.day: rollup
+            for rollup in DailyStats.objects.filter(
+                user=request.user, day__range=(start, end))
+        }
+        days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+        data = {
+            "start": start,
+            "end": end,
+            "totals": summarize_stats(list(rollups.values())),
+            "days": [
+                summarize_stats([rollups[day]] if day in rollups else [], day=day)
+                for day in days
+            ],
+        }
+
+        serializer = self.serializer_class(data)
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+
+class TimeseriesView(APIView):
+    """TimeseriesView
+
+    Returns the number of reading sessions and translations that the user
+    started within each hour or day, for the activity charts on the
+    dashboard, read from the rollups, see `dashboard.timeseries`.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    serializer_class = TimeseriesSerializer
+
+    def get(self, request):
+        """Get the time series
+
+        Example:
+            This endpoint will be available at::
+
+                /dashboard/timeseries/?days=7&points=28
+
+            `days` can be 7, 30 or 365 and defaults to 30, and `points` is the
+            maximum number of buckets, which defaults to 60. The last 7 days
+            are bucketed by the hour and anything longer by the day, and
+            neighbouring buckets are added together to fit within `points`,
+            so `bucket_seconds` is the length of each of the buckets.
+
+        Raises:
+            HTTP 400 Bad Request if the number of days or points is invalid
+        """
+        query = TimeseriesQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(data=query.errors, status=status.HTTP_400_BAD_REQUEST)
 
+        days = query.validated_data["days"]
         data = {
-            "library_item_count": library_items.count(),
-            "translations_count": translations.count(),
-            "practice_sessions_count": practice_sessions_count,
-            "reading_sessions_count": reading_session_count
+            "days": days,
+            **get_timeseries(request.user, days, query.validated_data["points"]),
         }
 
         serializer = self.serializer_class(data)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
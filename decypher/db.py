@@ -0,0 +1,64 @@
+"""Decypher Database Helpers
+
+The helpers used to update a row that's created on first use, such as the
+rollups, the dashboard counters and the library versions, without reading it
+first.
+
+The row is updated with a single query, and is only created if the update
+didn't find it. If another request creates the row in the meantime, the
+unique constraint on the lookups rejects the second insert and the update is
+tried again instead.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+
+def upsert(model, lookups, values, updates):
+    """Upsert a row
+
+    Update the row found with the `lookups`, creating it with the `values` if
+    it doesn't exist yet.
+
+    Args:
+        model (Model): The model of the row, which must have a unique
+        constraint on the lookups
+        lookups (dict): The fields that identify the row
+        values (dict): The values of the other fields if the row is created
+        updates (dict): The values or expressions to update the row with, or
+        an empty dict if an existing row should be left as it is
+
+    Returns:
+        Model: The row if it was created, or None if it already existed
+    """
+    rows = model.objects.filter(**lookups)
+    if updates and rows.update(**updates):
+        return None
+
+    try:
+        with transaction.atomic():
+            return model.objects.create(**lookups, **values)
+    except IntegrityError:
+        # The row was created by another request in the meantime
+        if updates:
+            rows.update(**updates)
+        return None
+
+
+def upsert_increment(model, lookups, **deltas):
+    """Upsert an increment
+
+    Add the deltas to the fields of the row found with the `lookups`, with
+    `F` expressions so that increments from other requests aren't
+    overwritten, creating the row with the deltas if it doesn't exist yet.
+
+    Args:
+        model (Model): The model of the row
+        lookups (dict): The fields that identify the row
+        **deltas: The amount to add to each of the fields
+
+    Example:
+        The fields are named the same as on the model::
+
+            upsert_increment(DailyStats, {"user_id": user.id, "day": day}, pages=2)
+    """
+    upsert(model, lookups, deltas, {field: F(field) + value for field, value in deltas.items()})
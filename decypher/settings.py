@@ -157,6 +157,24 @@ EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS")
 # Translate Service Endpoint
 FULL_TRANSLATION = "https://decyphr.uc.r.appspot.com/api/v1/full-translation/"
 
+# Lemmatizer form tables, see `lemmatizer.form_tables`
+LEMMATIZER_TABLE_DIR = os.getenv(
+    "LEMMATIZER_TABLE_DIR", os.path.join(BASE_DIR, "lemmatizer_tables"))
+
+# Replace the words in practice answers with their lemmas before grading,
+# see `practice.normalization`
+PRACTICE_LEMMATIZE_ANSWERS = os.getenv("PRACTICE_LEMMATIZE_ANSWERS") == "True"
+
+# The number of tokens to keep in each process's authentication cache, and
+# how many seconds to keep them for, see `accounts.authentication`
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 1024))
+TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", 60))
+
+# The login events are written once this many have been buffered, or this
+# many seconds after the first of them, see `accounts.login_history`
+LOGIN_EVENT_BATCH_SIZE = int(os.getenv("LOGIN_EVENT_BATCH_SIZE", 100))
+LOGIN_EVENT_FLUSH_INTERVAL = int(os.getenv("LOGIN_EVENT_FLUSH_INTERVAL", 30))
+
 # GOOGLE BOOKS API
 GOOGLE_BOOKS_API = os.getenv("GOOGLE_BOOKS_API")
 GOOGLE_BOOKS_ENDPOINT = "https://www.googleapis.com/books/v1/volumes?"
@@ -165,7 +183,7 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 10,
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "accounts.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
 }
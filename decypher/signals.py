@@ -0,0 +1,49 @@
+"""Decypher Signals
+
+The helpers used to skip the signal handlers that keep the derived counters
+up to date, for code that deletes a whole batch of rows and updates the
+counters once for the batch itself.
+
+The handlers are skipped for the current thread only, rather than being
+disconnected, so requests that are handled by other threads at the same time
+still update the counters.
+"""
+import functools
+import threading
+from contextlib import contextmanager
+
+
+_STATE = threading.local()
+
+
+@contextmanager
+def skip_signal_handlers():
+    """Skip the signal handlers
+
+    Skip the handlers that have been marked with `skippable` until the end of
+    the block, on the current thread.
+
+    Example:
+        The handlers are skipped for every row that's deleted::
+
+            with skip_signal_handlers():
+                library_books.delete()
+    """
+    skipped = getattr(_STATE, "skipped", False)
+    _STATE.skipped = True
+    try:
+        yield
+    finally:
+        _STATE.skipped = skipped
+
+
+def skippable(handler):
+    """Skippable
+
+    Mark a signal handler as one that is skipped inside `skip_signal_handlers`.
+    """
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        if not getattr(_STATE, "skipped", False):
+            handler(*args, **kwargs)
+    return wrapper
@@ -22,6 +22,8 @@ from translator.views import TranslationViewSet
 from books.views import BookViewSet
 from library.views import LibraryViewSet
 from reading_sessions.views import ReadingSessionViewSet
+from lemmatizer.views import ConjugationTableView
+from dashboard.views import StatsView
 
 router = DefaultRouter()
 router.register(r"users", AuthViewSet, basename="user")
@@ -36,6 +38,13 @@ urlpatterns = [
     path("languages/", include("languages.urls")),
     path("practice-sessions/", include("practice.urls")),
     path("dashboard/", include("dashboard.urls")),
+    path("stats/", StatsView.as_view(), name="stats"),
+    path("lemmatizer/", include("lemmatizer.urls")),
+    path(
+        "verbs/<int:pk>/conjugations/",
+        ConjugationTableView.as_view(),
+        name="verb-conjugations",
+    ),
 ]
 
 urlpatterns += router.urls
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('languages', '0002_language_short_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='language',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
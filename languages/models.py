@@ -7,6 +7,7 @@ class Language(models.Model):
     code = models.CharField(max_length=8, blank=False, null=False)
     short_code = models.CharField(max_length=2, blank=False, null=False)
     description = models.TextField(blank=False, null=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return "{} - {}".format(self.name, self.code)
@@ -1,3 +1,6 @@
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from languages.models import Language
@@ -6,6 +9,31 @@ from languages.serializers import LanguageSerializer
 
 class LanguageView(APIView):
     def get(self, request):
-        languages = Language.objects.all()
-        serializer = LanguageSerializer(languages, many=True)
-        return Response(serializer.data)
+        """Get the languages
+
+        The languages rarely change, so the response includes an `ETag` and a
+        `Last-Modified` header based on the number of languages and when they
+        were last updated. Clients that send either of them back will receive
+        a `304 Not Modified` if nothing has changed, without the languages
+        being fetched.
+        """
+        summary = Language.objects.aggregate(
+            count=Count("id"), updated_at=Max("updated_at"))
+        headers = {}
+        last_modified = None
+        if summary["updated_at"] is not None:
+            last_modified = int(summary["updated_at"].timestamp())
+            headers["Last-Modified"] = http_date(last_modified)
+            headers["ETag"] = quote_etag(
+                f"{summary['count']}-{summary['updated_at'].timestamp()}")
+
+        response = get_conditional_response(
+            request, etag=headers.get("ETag"), last_modified=last_modified)
+        if response is None:
+            languages = Language.objects.all()
+            serializer = LanguageSerializer(languages, many=True)
+            response = Response(serializer.data)
+
+        for header, value in headers.items():
+            response[header] = value
+        return response
@@ -1,7 +1,8 @@
 from django.contrib import admin
-from lemmatizer.models import Verb, Tense, Mood, Form
+from lemmatizer.models import Verb, Tense, Mood, Form, ConjugationTable
 
 admin.site.register(Verb)
 admin.site.register(Tense)
 admin.site.register(Mood)
-admin.site.register(Form)
\ No newline at end of file
+admin.site.register(Form)
+admin.site.register(ConjugationTable)
@@ -0,0 +1,51 @@
+"""Lemmatizer Conjugation Tables
+
+The helpers used to generate the conjugation tables for the verbs. A table is
+structured as mood -> tense -> forms, with the forms ordered by person, and is
+stored as a single JSON document for each verb in the `ConjugationTable`
+model.
+"""
+import hashlib
+import json
+from lemmatizer.models import ConjugationTable, Form
+
+
+def build_conjugation_table(verb):
+    """Build the conjugation table
+
+    Read the verb's forms from the database and arrange them by mood and
+    tense.
+
+    Args:
+        verb (Verb): The verb that the table should be built for
+
+    Returns:
+        dict: The conjugation table
+    """
+    forms = Form.objects.filter(verb=verb).order_by(
+        "tense__mood_id", "tense_id", "person"
+    ).values_list("tense__mood__name", "tense__name", "form")
+
+    moods = {}
+    for mood_name, tense_name, form in forms:
+        moods.setdefault(mood_name, {}).setdefault(tense_name, []).append(form)
+    return {"verb": verb.id, "name": verb.name, "moods": moods}
+
+
+def update_conjugation_table(verb):
+    """Update the conjugation table
+
+    Rebuild the verb's conjugation table and store it. This should be called
+    whenever the verb's forms have changed.
+
+    Args:
+        verb (Verb): The verb that the table should be built for
+
+    Returns:
+        ConjugationTable: The stored conjugation table
+    """
+    table = json.dumps(build_conjugation_table(verb), ensure_ascii=False)
+    etag = hashlib.sha1(table.encode("utf-8")).hexdigest()
+    conjugation_table, _ = ConjugationTable.objects.update_or_create(
+        verb=verb, defaults={"table": table, "etag": etag})
+    return conjugation_table
@@ -0,0 +1,240 @@
+"""Lemmatizer Form Tables
+
+The form tables are a compact, read-only, on-disk version of the form index
+for a single language. They are generated by the `export_form_tables`
+management command and opened with `mmap`, so every worker process on the
+server shares the same pages from the OS page cache rather than holding its
+own copy of the conjugations in memory.
+
+All integers are stored as little-endian unsigned 32 bit integers and the
+file is laid out as follows:
+
+    - **header**: the magic bytes, the format version and the number of
+      strings, keys, lemmas and hash table slots
+    - **string offsets**: `string_count + 1` offsets into the string pool,
+      string `i` is found between offsets `i` and `i + 1`
+    - **keys**: a `(string, lemma_start, lemma_count)` record for each of the
+      inflected words
+    - **lemmas**: the string indexes of the lemmas for each key
+    - **hash table**: an open addressing table of `key + 1` values, where `0`
+      is an empty slot. The slot is found using the CRC32 of the word
+    - **string pool**: the UTF-8 encoded strings, deduplicated
+
+Looking up a word only reads the handful of pages that it touches and the
+word is compared against the string pool in place, without copying it.
+
+Each process keeps the tables that it has opened, along with the inode and
+modification time of the file. The file is checked each time the table is
+fetched, and as new tables are moved into place with `os.replace`, a table
+that has been exported again is reopened, without restarting the workers.
+Missing tables aren't remembered, so a table that is exported for the first
+time is picked up straight away too.
+
+The same format is used for any table that maps words to lists of strings,
+so each language can have more than one table. The `forms` table maps the
+inflected words to their lemmas and the `deletes` table is the deletion
+dictionary used for the fuzzy lookups, see `lemmatizer.fuzzy`.
+"""
+import mmap
+import os
+import struct
+import zlib
+from django.conf import settings
+
+
+MAGIC = b"DCFT"
+VERSION = 1
+HEADER = struct.Struct("<4sIIIII")
+UINT = struct.Struct("<I")
+KEY = struct.Struct("<III")
+
+_FORM_TABLES = {}
+
+
+def _get_signature(stat):
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def get_form_table_path(language, name="forms"):
+    """Get the form table path
+
+    Args:
+        language (Language): The language of the form table
+        name (str): The name of the table, either `forms` or `deletes`
+
+    Returns:
+        str: The path to the form table for the language
+    """
+    return os.path.join(
+        settings.LEMMATIZER_TABLE_DIR, f"{name}-{language.short_code}.bin")
+
+
+def write_form_table(path, index):
+    """Write a form table
+
+    Write the form index out to a form table. The table is written to a
+    temporary file first and moved into place, so processes that already have
+    the old table open will continue to read from it.
+
+    Args:
+        path (str): The path that the form table will be written to
+        index (dict): Maps each word to a list of strings, such as the
+        inflected words to their lemmas
+    """
+    strings = []
+    string_ids = {}
+
+    def add_string(value):
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value.encode("utf-8"))
+        return string_ids[value]
+
+    keys = []
+    lemmas = []
+    for word in sorted(index):
+        word_lemmas = index[word]
+        keys.append((add_string(word), len(lemmas), len(word_lemmas)))
+        lemmas.extend(add_string(lemma) for lemma in word_lemmas)
+
+    slot_count = 1
+    while slot_count < len(keys) * 2:
+        slot_count *= 2
+    slots = [0] * slot_count
+    for key_id, (string_id, _, _) in enumerate(keys):
+        slot = zlib.crc32(strings[string_id]) & (slot_count - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = key_id + 1
+
+    offsets = [0]
+    for string in strings:
+        offsets.append(offsets[-1] + len(string))
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as table:
+        table.write(HEADER.pack(
+            MAGIC, VERSION, len(strings), len(keys), len(lemmas), slot_count))
+        table.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        for key in keys:
+            table.write(KEY.pack(*key))
+        table.write(struct.pack(f"<{len(lemmas)}I", *lemmas))
+        table.write(struct.pack(f"<{slot_count}I", *slots))
+        table.write(b"".join(strings))
+    os.replace(temporary_path, path)
+
+
+class FormTable:
+    """Form Table
+
+    A memory-mapped form table. Nothing is read from the table until a word is
+    looked up.
+
+    Args:
+        path (str): The path to the form table
+
+    Raises:
+        ValueError: If the file isn't a form table, or was written by an
+        incompatible version
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as table:
+            self.signature = _get_signature(os.fstat(table.fileno()))
+            self._buffer = mmap.mmap(table.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._buffer)
+
+        magic, version, string_count, key_count, lemma_count, slot_count = (
+            HEADER.unpack_from(self._buffer, 0))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} form table")
+
+        self._slot_mask = slot_count - 1
+        self._offsets = HEADER.size
+        self._keys = self._offsets + (string_count + 1) * UINT.size
+        self._lemmas = self._keys + key_count * KEY.size
+        self._slots = self._lemmas + lemma_count * UINT.size
+        self._pool = self._slots + slot_count * UINT.size
+
+    def _get_bounds(self, string_id):
+        start, end = struct.unpack_from(
+            "<II", self._buffer, self._offsets + string_id * UINT.size)
+        return self._pool + start, self._pool + end
+
+    def _get_string(self, string_id):
+        start, end = self._get_bounds(string_id)
+        return str(self._view[start:end], "utf-8")
+
+    def get(self, word):
+        """Get the values for a word
+
+        Args:
+            word (str): The lowercased word
+
+        Returns:
+            list: The values for the word, such as its lemmas, or an empty
+            list if the word isn't in the table
+        """
+        encoded_word = word.encode("utf-8")
+        slot = zlib.crc32(encoded_word) & self._slot_mask
+
+        while True:
+            (key,) = UINT.unpack_from(self._buffer, self._slots + slot * UINT.size)
+            if not key:
+                return []
+
+            string_id, lemma_start, lemma_count = KEY.unpack_from(
+                self._buffer, self._keys + (key - 1) * KEY.size)
+            start, end = self._get_bounds(string_id)
+            if self._view[start:end] == encoded_word:
+                lemma_ids = struct.unpack_from(
+                    f"<{lemma_count}I", self._buffer,
+                    self._lemmas + lemma_start * UINT.size)
+                return [self._get_string(lemma_id) for lemma_id in lemma_ids]
+
+            slot = (slot + 1) & self._slot_mask
+
+    def close(self):
+        self._view.release()
+        self._buffer.close()
+
+
+def get_form_table(language, name="forms"):
+    """Get the form table
+
+    Open the form table for the given language. Each table is only opened
+    once per process, unless the file has been replaced since it was opened.
+    The table that was replaced isn't closed, as other threads may still be
+    reading it, and is unmapped once nothing refers to it.
+
+    Args:
+        language (Language): The language of the form table
+        name (str): The name of the table, either `forms` or `deletes`
+
+    Returns:
+        FormTable: The form table for the language, or,
+        None: If the table hasn't been exported for the language
+    """
+    key = (language.id, name)
+    path = get_form_table_path(language, name)
+    try:
+        signature = _get_signature(os.stat(path))
+    except FileNotFoundError:
+        _FORM_TABLES.pop(key, None)
+        return None
+
+    form_table = _FORM_TABLES.get(key)
+    if form_table is None or form_table.signature != signature:
+        form_table = _FORM_TABLES[key] = FormTable(path)
+    return form_table
+
+
+def close_form_tables():
+    """Close the form tables
+
+    Close any form tables that have been opened by the current process, so
+    they will be reopened the next time they're needed.
+    """
+    for form_table in _FORM_TABLES.values():
+        form_table.close()
+    _FORM_TABLES.clear()
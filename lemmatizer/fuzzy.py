@@ -0,0 +1,115 @@
+"""Lemmatizer Fuzzy Lookups
+
+Learners often misspell the words that they're looking up, so the fuzzy
+lookups find the inflected words that are within a small edit distance of the
+word that the user typed.
+
+The lookups use a SymSpell style deletion dictionary. Every word that can be
+made by deleting up to `MAX_DISTANCE` characters from the start of an
+inflected word is mapped back to the inflected word. At lookup time, the same
+deletes are generated for the misspelled word and looked up in the
+dictionary, which gives a small set of candidates that only need their edit
+distance checked, rather than comparing the word against every form.
+
+The deletion dictionary is exported as the `deletes` form table, alongside the
+`forms` table, by the `export_form_tables` management command. Accents and
+casing are ignored when comparing the words.
+"""
+import Levenshtein
+from lemmatizer.form_tables import get_form_table
+from lemmatizer.normalization import normalize_word
+
+
+MAX_DISTANCE = 2
+
+# Only the start of each word is used for the deletes, which keeps the size of
+# the deletion dictionary down for longer words
+PREFIX_LENGTH = 7
+
+
+def get_deletes(word, max_distance=MAX_DISTANCE):
+    """Get deletes
+
+    Get every word that can be made by deleting up to `max_distance`
+    characters from the start of the word, including the start of the word
+    itself.
+
+    Args:
+        word (str): The normalized word
+        max_distance (int): The maximum number of characters to delete
+
+    Returns:
+        set: The deletes for the word
+    """
+    deletes = {word[:PREFIX_LENGTH]}
+    edits = set(deletes)
+    for _ in range(max_distance):
+        edits = {
+            edit[:position] + edit[position + 1:]
+            for edit in edits for position in range(len(edit))
+        }
+        deletes |= edits
+    return deletes
+
+
+def build_deletes_index(words):
+    """Build the deletes index
+
+    Build the deletion dictionary for the inflected words of a language.
+
+    Args:
+        words (iterable): The inflected words
+
+    Returns:
+        dict: Maps each delete to a sorted list of the inflected words that it
+        can be made from
+    """
+    index = {}
+    for word in words:
+        for delete in get_deletes(normalize_word(word)):
+            index.setdefault(delete, set()).add(word)
+    return {delete: sorted(delete_words) for delete, delete_words in index.items()}
+
+
+def get_similar_forms(word, language, max_distance=MAX_DISTANCE):
+    """Get similar forms
+
+    Find the inflected words that are within `max_distance` edits of the
+    word, along with their lemmas.
+
+    Args:
+        word (str): The word that the user typed
+        language (Language): The language that the word is written in
+        max_distance (int): The maximum edit distance, up to `MAX_DISTANCE`
+
+    Returns:
+        list: The matching forms, nearest first, or,
+        None: If the form tables haven't been exported for the language
+
+    Example:
+        The matches will look like::
+
+            [
+                {"form": "falo", "distance": 1, "lemmas": ["falar"]}
+            ]
+    """
+    deletes_table = get_form_table(language, "deletes")
+    forms_table = get_form_table(language, "forms")
+    if deletes_table is None or forms_table is None:
+        return None
+
+    normalized_word = normalize_word(word)
+    candidates = set()
+    for delete in get_deletes(normalized_word, max_distance):
+        candidates.update(deletes_table.get(delete))
+
+    matches = []
+    for candidate in candidates:
+        distance = Levenshtein.distance(normalized_word, normalize_word(candidate))
+        if distance <= max_distance:
+            matches.append({
+                "form": candidate,
+                "distance": distance,
+                "lemmas": forms_table.get(candidate),
+            })
+    return sorted(matches, key=lambda match: (match["distance"], match["form"]))
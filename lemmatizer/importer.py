@@ -0,0 +1,94 @@
+"""Lemmatizer Importer
+
+The helpers used to store the conjugations that are generated by `verbecc`.
+
+The forms for a verb are synchronised with the conjugations rather than being
+appended, so the importer can be run as many times as needed without
+duplicating the forms. Each form is identified by its verb, tense and person.
+
+The verb's conjugation table is regenerated whenever its forms change.
+"""
+from django.db import transaction
+from lemmatizer.conjugation_tables import update_conjugation_table
+from lemmatizer.models import ConjugationTable, Form, Mood, Tense
+from lemmatizer.normalization import normalize_form
+
+
+def _get_tense(mood_name, tense_name, language, tenses):
+    """Get the tense
+
+    Get or create the tense, caching it so each tense is only looked up once
+    for each run of the importer.
+    """
+    key = (mood_name, tense_name, language.id)
+    if key not in tenses:
+        mood, _ = Mood.objects.get_or_create(name=mood_name)
+        tenses[key], _ = Tense.objects.get_or_create(
+            name=tense_name, mood=mood, language=language)
+    return tenses[key]
+
+
+def import_conjugations(verb, conjugations, tenses=None):
+    """Import conjugations
+
+    Store the conjugations for a verb. Forms that have changed are updated,
+    new forms are created and forms that no longer exist are deleted. The
+    verb's conjugation table is regenerated if any of the forms changed, or
+    if the verb doesn't have a table yet.
+
+    Args:
+        verb (Verb): The verb that has been conjugated
+        conjugations (dict): The conjugations as they're returned from
+        `verbecc`'s `Conjugator.conjugate`
+        tenses (dict): An optional cache of the tenses, which can be shared
+        between calls
+
+    Returns:
+        bool: True if any of the forms for the verb were changed
+
+    Example:
+        This should be called with the output of `verbecc`::
+
+            cg = Conjugator(lang="pt")
+            import_conjugations(verb, cg.conjugate(verb.name))
+    """
+    tenses = {} if tenses is None else tenses
+    conjugated_forms = {}
+    for mood_name, mood in conjugations["moods"].items():
+        for tense_name, tense_forms in mood.items():
+            tense = _get_tense(mood_name, tense_name, verb.language, tenses)
+            # The persons are numbered without the "-" placeholders, which
+            # `verbecc` uses for the persons that a tense doesn't have
+            forms = [form for form in tense_forms if form != "-"]
+            for person, form in enumerate(forms):
+                conjugated_forms[(tense.id, person)] = form
+
+    with transaction.atomic():
+        existing_forms = {
+            (form.tense_id, form.person): form
+            for form in Form.objects.filter(verb=verb)
+        }
+
+        new_forms = []
+        changed_forms = []
+        for (tense_id, person), form in conjugated_forms.items():
+            existing_form = existing_forms.pop((tense_id, person), None)
+            if existing_form is None:
+                new_forms.append(Form(
+                    form=form, normalized_form=normalize_form(form), verb=verb,
+                    tense_id=tense_id, person=person))
+            elif existing_form.form != form:
+                existing_form.form = form
+                existing_form.normalized_form = normalize_form(form)
+                changed_forms.append(existing_form)
+
+        Form.objects.bulk_create(new_forms)
+        Form.objects.bulk_update(changed_forms, ["form", "normalized_form"])
+        Form.objects.filter(
+            id__in=[form.id for form in existing_forms.values()]).delete()
+
+        changed = bool(new_forms or changed_forms or existing_forms)
+        if changed or not ConjugationTable.objects.filter(verb=verb).exists():
+            update_conjugation_table(verb)
+
+    return changed
@@ -0,0 +1,35 @@
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from languages.models import Language
+from lemmatizer.form_tables import get_form_table_path, write_form_table
+from lemmatizer.fuzzy import build_deletes_index
+from lemmatizer.utils import build_form_index
+
+
+class Command(BaseCommand):
+
+    help = "Export the lemmatizer forms to memory-mapped form tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "languages", nargs="*",
+            help="The short codes of the languages to export, defaults to all")
+
+    def handle(self, *args, **kwargs):
+        os.makedirs(settings.LEMMATIZER_TABLE_DIR, exist_ok=True)
+        languages = Language.objects.filter(verb__isnull=False).distinct()
+        if kwargs["languages"]:
+            languages = languages.filter(short_code__in=kwargs["languages"])
+
+        for language in languages:
+            index = build_form_index(language)
+            path = get_form_table_path(language)
+            write_form_table(path, index)
+            self.stdout.write(f"Exported {len(index)} forms for {language.name} to {path}")
+
+            deletes_index = build_deletes_index(index)
+            path = get_form_table_path(language, "deletes")
+            write_form_table(path, deletes_index)
+            self.stdout.write(
+                f"Exported {len(deletes_index)} deletes for {language.name} to {path}")
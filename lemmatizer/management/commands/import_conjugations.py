@@ -1,7 +1,8 @@
 from verbecc import Conjugator
 from django.core.management.base import BaseCommand, CommandError
-from lemmatizer.models import Verb, Form, Tense, Mood
-from languages.models import Language
+from lemmatizer.models import Verb
+from lemmatizer.importer import import_conjugations
+from practice.drills import build_drill_pool
 
 
 class Command(BaseCommand):
@@ -12,25 +13,18 @@ class Command(BaseCommand):
     def get_verb_conjugations(self, cg, verb):
         return cg.conjugate(verb)
 
-    def get_verb_moods(self, verb):
-        return verb["moods"].items()
-    
-    def get_table(self, mood):
-        return mood.items()
-
     def handle(self, *args, **kwargs):
-        verbs = Verb.objects.all()[:5000]
+        verbs = Verb.objects.select_related("language")[:5000]
         cg = Conjugator(lang="pt")
+        tenses = {}
+        changed_languages = {}
         for verb in verbs:
-            verb_name = self.get_verb_conjugations(cg, verb.name)
-            print(verb_name)
-            for mood_name, mood in self.get_verb_moods(verb_name):
-                mood_instance = Mood.objects.get_or_create(name=mood_name)
-                for tense_name, tense in self.get_table(mood):
-                    tense_name = Tense.objects.get_or_create(
-                        name=tense_name, mood=mood_instance[0], language=Language.objects.get(id=1))
-                    for item in tense:
-                        if item == "-":
-                            continue
-                        new_form = Form(form=item, verb=verb, tense=tense_name[0])
-                        new_form.save()
\ No newline at end of file
+            conjugations = self.get_verb_conjugations(cg, verb.name)
+            if import_conjugations(verb, conjugations, tenses):
+                changed_languages[verb.language_id] = verb.language
+                self.stdout.write(f"Imported the conjugations for {verb.name}")
+
+        # The drill pools copy the forms, so they're rebuilt to match them
+        for language in changed_languages.values():
+            size = build_drill_pool(language)
+            self.stdout.write(f"Rebuilt the pool of {size} conjugations for {language.name}")
@@ -0,0 +1,24 @@
+# Generated by Django 3.0.7 on 2026-10-19 15:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lemmatizer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='form',
+            name='normalized_form',
+            field=models.CharField(db_index=True, default='', max_length=50),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='form',
+            name='person',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
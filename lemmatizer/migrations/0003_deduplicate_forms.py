@@ -0,0 +1,77 @@
+"""
+Remove the forms that were duplicated by running the importer more than once,
+and populate the `person` and `normalized_form` of the forms that remain.
+
+Each run of the importer appended the same conjugations for a tense again, so
+the forms for a verb and tense repeat with a fixed period. Only the first
+period is kept. Forms that legitimately repeat within a tense, such as the
+first and third person of the imperfect, are kept as they're part of the
+period.
+"""
+import unicodedata
+from itertools import groupby
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+# A copy of `lemmatizer.normalization` as it was when this migration was
+# written, so that later changes to it don't change what the migration does
+FUNCTION_WORDS = {
+    'eu', 'tu', 'ele', 'ela', 'você', 'nós', 'vós', 'eles', 'elas', 'vocês',
+    'que', 'se', 'quando', 'não', 'por', 'me', 'te', 'nos',
+}
+
+
+def normalize_form(form):
+    words = form.lower().split()
+    verb_words = [word for word in words if word not in FUNCTION_WORDS]
+    word = (verb_words[-1] if verb_words else words[-1]).casefold()
+    return ''.join(
+        character for character in unicodedata.normalize('NFKD', word)
+        if not unicodedata.combining(character))
+
+
+def _get_period(forms):
+    for period in range(1, len(forms) + 1):
+        if len(forms) % period == 0 and forms == forms[:period] * (len(forms) // period):
+            return period
+    return len(forms)
+
+
+def deduplicate_forms(apps, schema_editor):
+    Form = apps.get_model('lemmatizer', 'Form')
+
+    rows = Form.objects.order_by('verb_id', 'tense_id', 'id').values_list(
+        'id', 'verb_id', 'tense_id', 'form')
+
+    updates = []
+    duplicate_ids = []
+    for _, group in groupby(rows.iterator(), key=lambda row: (row[1], row[2])):
+        group = list(group)
+        period = _get_period([row[3] for row in group])
+
+        for person, (form_id, _, _, form) in enumerate(group[:period]):
+            updates.append(Form(
+                id=form_id, person=person, normalized_form=normalize_form(form)))
+        duplicate_ids.extend(row[0] for row in group[period:])
+
+        if len(updates) >= BATCH_SIZE:
+            Form.objects.bulk_update(updates, ['person', 'normalized_form'])
+            updates = []
+
+    Form.objects.bulk_update(
+        updates, ['person', 'normalized_form'], batch_size=BATCH_SIZE)
+    for start in range(0, len(duplicate_ids), BATCH_SIZE):
+        Form.objects.filter(id__in=duplicate_ids[start:start + BATCH_SIZE]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lemmatizer', '0002_form_normalized_form_person'),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_forms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.7 on 2026-10-19 15:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lemmatizer', '0003_deduplicate_forms'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='form',
+            constraint=models.UniqueConstraint(fields=('verb', 'tense', 'person'), name='unique_form_person'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.0.7 on 2026-10-19 15:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lemmatizer', '0004_form_unique_form_person'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConjugationTable',
+            fields=[
+                ('verb', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='conjugation_table', serialize=False, to='lemmatizer.Verb')),
+                ('table', models.TextField()),
+                ('etag', models.CharField(max_length=40)),
+                ('updated_on', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
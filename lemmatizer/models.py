@@ -1,5 +1,6 @@
 from django.db import models
 from languages.models import Language
+from lemmatizer.normalization import normalize_form
 
 
 class Verb(models.Model):
@@ -30,10 +31,51 @@ class Tense(models.Model):
 
 
 class Form(models.Model):
+    """Form Model
+
+    A single conjugation of a verb. The `person` is the position of the form
+    within the tense's conjugations, so each verb only has one form for each
+    person in a tense.
+
+    The `normalized_form` is the inflected word without its pronouns, accents
+    or casing, and is used to look up the verbs that a word belongs to.
+    """
 
     form = models.CharField(max_length=50)
+    normalized_form = models.CharField(max_length=50, db_index=True)
     verb = models.ForeignKey(Verb, on_delete=models.CASCADE)
     tense = models.ForeignKey(Tense, on_delete=models.CASCADE)
+    person = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["verb", "tense", "person"], name="unique_form_person")
+        ]
+
+    def __str__(self):
+        return self.form
+
+    def save(self, *args, **kwargs):
+        self.normalized_form = normalize_form(self.form)
+        super().save(*args, **kwargs)
+
+
+class ConjugationTable(models.Model):
+    """Conjugation Table Model
+
+    The full conjugation table for a verb, serialized as JSON. The table is
+    generated whenever the verb's forms are imported, so it can be returned
+    with a single lookup rather than joining the forms, tenses and moods on
+    every request. The `etag` is a hash of the table.
+    """
+
+    verb = models.OneToOneField(
+        Verb, on_delete=models.CASCADE, primary_key=True,
+        related_name="conjugation_table")
+    table = models.TextField()
+    etag = models.CharField(max_length=40)
+    updated_on = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return self.form
\ No newline at end of file
+        return self.verb.name
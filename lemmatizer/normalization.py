@@ -0,0 +1,96 @@
+"""Lemmatizer Normalization
+
+The helpers used to reduce the conjugations and the words that users read and
+type to a common form, so that they can be compared with each other.
+
+The conjugations that are imported from `verbecc` are stored as full phrases,
+such as `eu falo`, `que eu fale` or `fala tu`, so the pronouns and particles
+that `verbecc` adds need to be removed before a form can be matched against a
+single word.
+"""
+import unicodedata
+
+
+# The pronouns and particles that `verbecc` adds to the Portuguese
+# conjugations, e.g. `que eu fale`, `não fales tu` or `por falar eu`
+FUNCTION_WORDS = {
+    "eu", "tu", "ele", "ela", "você", "nós", "vós", "eles", "elas", "vocês",
+    "que", "se", "quando", "não", "por", "me", "te", "nos",
+}
+
+
+def get_inflected_word(form):
+    """Get the inflected word
+
+    Strip the pronouns and particles from a conjugated form so that only the
+    inflected verb remains. Compound tenses, such as `eu tenho falado`, will
+    return the participle as that is the word that belongs to the verb.
+
+    Args:
+        form (str): The form as it is stored in the `Form` model
+
+    Returns:
+        str: The lowercased inflected word
+
+    Example:
+        The pronouns are removed from either side of the verb::
+
+            get_inflected_word("que eu fale")  # "fale"
+            get_inflected_word("fala tu")  # "fala"
+    """
+    words = form.lower().split()
+    verb_words = [word for word in words if word not in FUNCTION_WORDS]
+    return verb_words[-1] if verb_words else words[-1]
+
+
+def fold_accents(text):
+    """Fold accents
+
+    Remove the accents from the text, e.g. `está` becomes `esta`.
+
+    Args:
+        text (str): The text that the accents should be removed from
+
+    Returns:
+        str: The text without any accents
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(
+        character for character in decomposed
+        if not unicodedata.combining(character))
+
+
+def normalize_word(word):
+    """Normalize a word
+
+    Casefold the word and remove its accents, so that words that only differ
+    by their accents or casing are treated as the same word.
+
+    Args:
+        word (str): The word that should be normalized
+
+    Returns:
+        str: The normalized word
+
+    Example:
+        Both of these will return `esta`::
+
+            normalize_word("Está")
+            normalize_word("esta")
+    """
+    return fold_accents(word.casefold())
+
+
+def normalize_form(form):
+    """Normalize a form
+
+    Get the normalized inflected word for a form, this is the value that is
+    stored in `Form.normalized_form`.
+
+    Args:
+        form (str): The form as it is stored in the `Form` model
+
+    Returns:
+        str: The normalized inflected word
+    """
+    return normalize_word(get_inflected_word(form))
@@ -0,0 +1,46 @@
+from rest_framework import serializers
+from lemmatizer.fuzzy import MAX_DISTANCE
+
+
+class LemmatizeSerializer(serializers.Serializer):
+    """
+    A very simple Serializer that exists for the sole purpose of
+    deserialising the JSON that contains the text that the user
+    wants to have lemmatized
+    """
+
+    text = serializers.CharField(required=True, trim_whitespace=False)
+
+
+class LemmaAnnotationSerializer(serializers.Serializer):
+    """
+    The serializer used to render the lemmas that were found for each
+    of the tokens within the text
+    """
+
+    token = serializers.CharField()
+    start = serializers.IntegerField()
+    end = serializers.IntegerField()
+    lemmas = serializers.ListField(child=serializers.CharField())
+
+
+class LookupSerializer(serializers.Serializer):
+    """
+    The serializer used to deserialise the query parameters for looking up
+    a single word. When `fuzzy` is set, misspelled words will also be matched
+    """
+
+    word = serializers.CharField(required=True, max_length=50)
+    fuzzy = serializers.BooleanField(required=False, default=False)
+    max_distance = serializers.IntegerField(
+        required=False, default=MAX_DISTANCE, min_value=0, max_value=MAX_DISTANCE)
+
+
+class FormMatchSerializer(serializers.Serializer):
+    """
+    The serializer used to render the forms that matched a word
+    """
+
+    form = serializers.CharField()
+    distance = serializers.IntegerField()
+    lemmas = serializers.ListField(child=serializers.CharField())
@@ -1,3 +1,272 @@
-from django.test import TestCase
+"""
+The test cases for the lemmatizer. This test suite should test for the
+following test cases:
 
-# Create your tests here.
+    - A user cannot lemmatize text if they are not logged in
+    - The pronouns added by `verbecc` are removed from the forms
+    - Each of the verbs within a block of text is matched to its lemma, along
+        with the position of the word within the text
+    - The forms can be exported to a form table and looked up from there,
+        and tables that are exported again are reopened
+    - Importing the conjugations more than once doesn't duplicate the forms
+    - The conjugation table for a verb is returned with an ETag, and is
+        regenerated when the verb is imported again
+    - Misspelled words can be matched to the nearest forms
+"""
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import UserProfile
+from languages.models import Language
+from lemmatizer.models import Verb, Mood, Tense, Form
+from lemmatizer.form_tables import close_form_tables, get_form_table
+from lemmatizer.importer import import_conjugations
+from lemmatizer.normalization import get_inflected_word, normalize_form
+
+
+class LemmatizerTests(APITestCase):
+    """
+    The test cases for the lemmatizer API endpoint
+    """
+    fixtures = ['fixtures.json']
+
+    def setUp(self):
+        """
+        Create a small set of conjugations for the language that the user is
+        learning
+        """
+        close_form_tables()
+        self.addCleanup(close_form_tables)
+
+        self.user = UserProfile.objects.get(email="aaronsnig@gmail.com")
+        self.language = language = Language.objects.get(
+            name="Brazilian Portuguese")
+        mood = Mood.objects.create(name="indicativo")
+        tense = Tense.objects.create(
+            name="presente", language=language, mood=mood)
+
+        conjugations = {
+            "falar": ["eu falo", "tu falas", "ele fala"],
+            "ser": ["eu sou", "tu és", "ele é"],
+        }
+        for name, forms in conjugations.items():
+            verb = Verb.objects.create(name=name, language=language)
+            for person, form in enumerate(forms):
+                Form.objects.create(
+                    form=form, verb=verb, tense=tense, person=person)
+
+    def test_that_a_non_logged_in_user_cant_lemmatize_text(self):
+        """
+        A client that isn't authenticated will receive a 401
+        """
+        url = reverse("lemmatize")
+        response = self.client.post(url, {"text": "Eu falo"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_that_pronouns_are_removed_from_forms(self):
+        """
+        Only the inflected verb remains once the pronouns are removed
+        """
+        self.assertEqual(get_inflected_word("eu falo"), "falo")
+        self.assertEqual(get_inflected_word("que eu fale"), "fale")
+        self.assertEqual(get_inflected_word("não fales tu"), "fales")
+        self.assertEqual(normalize_form("ele está"), "esta")
+
+    def test_that_the_verbs_in_the_text_are_lemmatized(self):
+        """
+        Every occurrence of a verb is annotated with its lemma and offsets,
+        and words that aren't verbs are left out
+        """
+        url = reverse("lemmatize")
+        text = "Ele fala e eu falo, mas ela é? Fala!"
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(url, {"text": text}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        annotations = response.data["annotations"]
+        self.assertEqual(
+            [annotation["token"] for annotation in annotations],
+            ["fala", "falo", "é", "Fala"]
+        )
+        for annotation in annotations:
+            self.assertEqual(
+                text[annotation["start"]:annotation["end"]], annotation["token"])
+        self.assertEqual(annotations[2]["lemmas"], ["ser"])
+        self.assertNotIn("e", [annotation["token"] for annotation in annotations])
+        self.assertEqual(annotations[3]["lemmas"], ["falar"])
+
+    def test_that_the_text_is_resolved_with_a_single_query(self):
+        """
+        The number of queries doesn't grow with the length of the text
+        """
+        url = reverse("lemmatize")
+        text = " ".join(["Eu falo e tu falas"] * 200)
+
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(2):
+            response = self.client.post(url, {"text": text}, format="json")
+        self.assertEqual(len(response.data["annotations"]), 400)
+
+    def test_that_the_forms_can_be_exported_to_a_form_table(self):
+        """
+        The exported form table contains every inflected word and its lemmas
+        """
+        with tempfile.TemporaryDirectory() as table_dir:
+            with override_settings(LEMMATIZER_TABLE_DIR=table_dir):
+                call_command("export_form_tables", "pt", stdout=StringIO())
+                form_table = get_form_table(self.language)
+
+                self.assertEqual(form_table.get("falas"), ["falar"])
+                self.assertEqual(form_table.get("é"), ["ser"])
+                self.assertEqual(form_table.get("falamos"), [])
+                close_form_tables()
+
+    def test_that_a_form_table_is_reopened_when_it_is_exported_again(self):
+        """
+        A table that is exported for the first time, or exported again after
+        new forms are imported, is picked up without restarting the process
+        """
+        with tempfile.TemporaryDirectory() as table_dir:
+            with override_settings(LEMMATIZER_TABLE_DIR=table_dir):
+                self.assertIsNone(get_form_table(self.language))
+
+                call_command("export_form_tables", "pt", stdout=StringIO())
+                self.assertEqual(get_form_table(self.language).get("falamos"), [])
+
+                import_conjugations(Verb.objects.get(name="falar"), {
+                    "moods": {"indicativo": {"presente": ["eu falo", "nós falamos"]}}
+                })
+                call_command("export_form_tables", "pt", stdout=StringIO())
+                self.assertEqual(get_form_table(self.language).get("falamos"), ["falar"])
+                close_form_tables()
+
+    def test_that_the_form_table_is_used_when_it_exists(self):
+        """
+        Once a form table has been exported, the forms are no longer read
+        from the database
+        """
+        url = reverse("lemmatize")
+
+        with tempfile.TemporaryDirectory() as table_dir:
+            with override_settings(LEMMATIZER_TABLE_DIR=table_dir):
+                call_command("export_form_tables", stdout=StringIO())
+                Form.objects.all().delete()
+
+                self.client.force_authenticate(user=self.user)
+                with self.assertNumQueries(1):
+                    response = self.client.post(
+                        url, {"text": "Tu és e tu falas"}, format="json")
+                close_form_tables()
+
+        self.assertEqual(
+            [annotation["lemmas"] for annotation in response.data["annotations"]],
+            [["ser"], ["falar"]]
+        )
+
+    def test_that_importing_conjugations_twice_doesnt_duplicate_forms(self):
+        """
+        The forms are synchronised with the conjugations, so rerunning the
+        importer only changes the forms that are different
+        """
+        verb = Verb.objects.get(name="falar")
+        conjugations = {
+            "moods": {
+                "indicativo": {
+                    "presente": ["eu falo", "tu falas", "ele fala", "nós falamos"]
+                },
+                "imperativo": {"afirmativo": ["-", "fala tu"]},
+            }
+        }
+
+        self.assertTrue(import_conjugations(verb, conjugations))
+        self.assertFalse(import_conjugations(verb, conjugations))
+
+        forms = Form.objects.filter(verb=verb)
+        self.assertEqual(forms.count(), 5)
+        self.assertEqual(
+            forms.get(tense__name="afirmativo").normalized_form, "fala")
+        self.assertEqual(forms.get(form="nós falamos").person, 3)
+        self.assertEqual(forms.get(tense__name="afirmativo").person, 0)
+
+    def test_that_the_conjugation_table_is_returned_with_an_etag(self):
+        """
+        The conjugation table is structured by mood and tense, and a client
+        that already has the table receives a 304
+        """
+        verb = Verb.objects.get(name="falar")
+        url = reverse("verb-conjugations", kwargs={"pk": verb.id})
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["moods"],
+            {"indicativo": {"presente": ["eu falo", "tu falas", "ele fala"]}}
+        )
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_that_the_conjugation_table_is_regenerated_on_import(self):
+        """
+        Importing new conjugations for a verb changes its table and ETag
+        """
+        verb = Verb.objects.get(name="falar")
+        url = reverse("verb-conjugations", kwargs={"pk": verb.id})
+
+        self.client.force_authenticate(user=self.user)
+        etag = self.client.get(url)["ETag"]
+
+        import_conjugations(verb, {
+            "moods": {"indicativo": {"presente": ["eu falo", "tu falas"]}}
+        })
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["moods"]["indicativo"]["presente"],
+            ["eu falo", "tu falas"]
+        )
+
+    def test_that_misspelled_words_are_matched_to_the_nearest_forms(self):
+        """
+        The fuzzy lookup returns the forms within two edits of the word,
+        ignoring accents, along with their lemmas
+        """
+        url = reverse("lemmatizer-lookup")
+
+        with tempfile.TemporaryDirectory() as table_dir:
+            with override_settings(LEMMATIZER_TABLE_DIR=table_dir):
+                call_command("export_form_tables", stdout=StringIO())
+
+                self.client.force_authenticate(user=self.user)
+                response = self.client.get(url, {"word": "fallas", "fuzzy": "true"})
+                close_form_tables()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(match["form"], match["distance"]) for match in response.data["matches"]],
+            [("falas", 1), ("fala", 2)]
+        )
+        self.assertEqual(response.data["matches"][0]["lemmas"], ["falar"])
+
+    def test_that_fuzzy_lookups_require_the_form_tables(self):
+        """
+        Fuzzy lookups are unavailable until the form tables are exported
+        """
+        url = reverse("lemmatizer-lookup")
+
+        with tempfile.TemporaryDirectory() as table_dir:
+            with override_settings(LEMMATIZER_TABLE_DIR=table_dir):
+                self.client.force_authenticate(user=self.user)
+                response = self.client.get(url, {"word": "fallas", "fuzzy": "true"})
+
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
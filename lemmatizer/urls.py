@@ -0,0 +1,10 @@
+from django.urls import path
+from rest_framework.urlpatterns import format_suffix_patterns
+from lemmatizer import views
+
+urlpatterns = [
+    path("lemmatize/", views.LemmatizeView.as_view(), name="lemmatize"),
+    path("lookup/", views.LookupView.as_view(), name="lemmatizer-lookup"),
+]
+
+urlpatterns = format_suffix_patterns(urlpatterns)
@@ -0,0 +1,151 @@
+"""Lemmatizer Utilities
+
+This module contains the helpers used to find the base verb (the lemma) for
+the words within a block of text.
+
+Rather than looking up each word individually, the text is tokenized and the
+tokens are deduplicated, so the whole text is resolved in a single pass, no
+matter how many times a word appears on the page.
+
+Where a form table has been exported for the language, the words are looked
+up in the memory-mapped table, see `lemmatizer.form_tables`. Otherwise they
+are resolved with a single query against the indexed `Form.normalized_form`
+column.
+"""
+import re
+from lemmatizer.models import Form
+from lemmatizer.form_tables import get_form_table
+from lemmatizer.normalization import get_inflected_word, normalize_word
+
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+(?:[-'][^\W\d_]+)*")
+
+
+def tokenize(text):
+    """Tokenize text
+
+    Split the text into the individual words, keeping track of where each of
+    the words can be found within the original text.
+
+    Args:
+        text (str): The text that is to be tokenized
+
+    Returns:
+        list: A list of `(token, start, end)` tuples, where `start` and `end`
+        are the character offsets of the token within the text
+
+    Example:
+        The offsets can be used to slice the token out of the text::
+
+            for token, start, end in tokenize(text):
+                assert text[start:end] == token
+    """
+    return [(match.group(), match.start(), match.end())
+            for match in WORD_PATTERN.finditer(text)]
+
+
+def build_form_index(language):
+    """Build the form index
+
+    Read all of the forms for the given language from the database and map
+    each inflected word to the verbs that it could belong to.
+
+    Args:
+        language (Language): The language that the index should be built for
+
+    Returns:
+        dict: Maps each inflected word to a sorted list of the lemmas
+    """
+    index = {}
+    forms = Form.objects.filter(verb__language=language).values_list(
+        "form", "verb__name")
+    for form, lemma in forms.iterator():
+        index.setdefault(get_inflected_word(form), set()).add(lemma)
+    return {word: sorted(lemmas) for word, lemmas in index.items()}
+
+
+def _get_lemmas_from_database(words, language):
+    """Get lemmas from the database
+
+    Find the lemmas for the words with a single query on the normalized form.
+    As the normalized form ignores accents, the matching forms are then
+    checked against the words themselves, so that words such as `e` and `é`
+    aren't confused with each other.
+
+    Args:
+        words (set): The lowercased words that should be looked up
+        language (Language): The language that the words are written in
+
+    Returns:
+        dict: Maps each word that was found to a sorted list of its lemmas
+    """
+    forms = Form.objects.filter(
+        verb__language=language,
+        normalized_form__in={normalize_word(word) for word in words}
+    ).values_list("form", "verb__name").distinct()
+
+    lemmas = {}
+    for form, lemma in forms:
+        word = get_inflected_word(form)
+        if word in words:
+            lemmas.setdefault(word, set()).add(lemma)
+    return {word: sorted(word_lemmas) for word, word_lemmas in lemmas.items()}
+
+
+def get_lemmas(words, language):
+    """Get lemmas
+
+    Find the lemmas for a collection of words, using the form table for the
+    language if one has been exported.
+
+    Args:
+        words (iterable): The lowercased words that should be looked up
+        language (Language): The language that the words are written in
+
+    Returns:
+        dict: Maps each word that was found to a list of its lemmas. Words
+        that aren't a form of any known verb are left out
+    """
+    words = set(words)
+    form_table = get_form_table(language)
+    if form_table is None:
+        return _get_lemmas_from_database(words, language)
+
+    lemmas = {}
+    for word in words:
+        match = form_table.get(word)
+        if match:
+            lemmas[word] = match
+    return lemmas
+
+
+def lemmatize_text(text, language):
+    """Lemmatize text
+
+    Find the lemma for each of the words within the text. The tokens are
+    deduplicated before they are looked up, so each distinct word is only
+    resolved once.
+
+    Args:
+        text (str): The text that is to be lemmatized
+        language (Language): The language that the text is written in
+
+    Returns:
+        list: A list of the annotations for each of the tokens that could be
+        matched to a verb, in the order that they appear in the text
+
+    Example:
+        The annotations will look like::
+
+            [
+                {"token": "Falo", "start": 0, "end": 4, "lemmas": ["falar"]}
+            ]
+    """
+    tokens = tokenize(text)
+    lemmas = get_lemmas({token.lower() for token, _, _ in tokens}, language)
+
+    return [
+        {"token": token, "start": start, "end": end, "lemmas": lemmas[token.lower()]}
+        for token, start, end in tokens
+        if token.lower() in lemmas
+    ]
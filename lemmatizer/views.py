@@ -1,3 +1,188 @@
-from django.shortcuts import render
+"""Lemmatizer views
 
-# Create your views here.
+The views that allow a client to find the base verb for the words within the
+text that the user is reading, to look up a single, possibly misspelled, word
+and to view the full conjugation table for a verb.
+"""
+import json
+from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from lemmatizer.conjugation_tables import update_conjugation_table
+from lemmatizer.fuzzy import get_similar_forms
+from lemmatizer.models import ConjugationTable, Verb
+from lemmatizer.serializers import (
+    LemmatizeSerializer, LemmaAnnotationSerializer, LookupSerializer,
+    FormMatchSerializer)
+from lemmatizer.utils import get_lemmas, lemmatize_text
+
+
+class LemmatizeView(APIView):
+    """LemmatizeView
+
+    Handles the lemmatization of a full block of text, such as a page of a
+    book, in a single request. The text is assumed to be written in the
+    language that the user is learning.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    serializer_class = LemmatizeSerializer
+
+    def post(self, request):
+        """Lemmatize text
+
+        Find the lemma for each of the words within the text that the client
+        has provided.
+
+        Example:
+            This endpoint will be available at::
+
+                /lemmatizer/lemmatize/
+
+            In order to call this from cURL, use the following::
+
+                curl -X POST -H 'Content-type: application/json' \\
+                     -H 'Authorization: Token <your_token>' \\
+                     -d '{"text": "Eu falo português"}' \\
+                    http://127.0.0.1:8000/lemmatizer/lemmatize/
+
+        Example response:
+            The response data should look like::
+
+                {
+                    "language": 1,
+                    "annotations": [
+                        {"token": "falo", "start": 3, "end": 7, "lemmas": ["falar"]}
+                    ]
+                }
+        """
+        serializer = self.serializer_class(data=request.data)
+
+        if serializer.is_valid():
+            language = request.user.language_being_learned
+            annotations = lemmatize_text(serializer.validated_data["text"], language)
+            data = {
+                "language": language.id,
+                "annotations": LemmaAnnotationSerializer(annotations, many=True).data,
+            }
+            return Response(data=data, status=status.HTTP_200_OK)
+
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class LookupView(APIView):
+    """LookupView
+
+    Finds the lemmas for a single word in the language that the user is
+    learning. In fuzzy mode, the forms that are within a couple of edits of
+    the word are returned too, so that misspelled words can still be found.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    serializer_class = LookupSerializer
+
+    def get(self, request):
+        """Look up a word
+
+        Example:
+            This endpoint will be available at::
+
+                /lemmatizer/lookup/?word=<word>&fuzzy=true
+
+        Example response:
+            The response data should look like::
+
+                {
+                    "word": "falu",
+                    "matches": [
+                        {"form": "falo", "distance": 1, "lemmas": ["falar"]},
+                        {"form": "falou", "distance": 1, "lemmas": ["falar"]}
+                    ]
+                }
+
+        Raises:
+            HTTP 503 Service Unavailable if fuzzy lookups haven't been exported
+            for the language
+        """
+        serializer = self.serializer_class(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        word = serializer.validated_data["word"]
+        language = request.user.language_being_learned
+
+        if serializer.validated_data["fuzzy"]:
+            matches = get_similar_forms(
+                word, language, serializer.validated_data["max_distance"])
+            if matches is None:
+                return Response(
+                    {"detail": f"Fuzzy lookups are not available for {language.name}"},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        else:
+            lemmas = get_lemmas({word.lower()}, language)
+            matches = [
+                {"form": form, "distance": 0, "lemmas": form_lemmas}
+                for form, form_lemmas in lemmas.items()
+            ]
+
+        data = {
+            "word": word,
+            "matches": FormMatchSerializer(matches, many=True).data,
+        }
+        return Response(data=data, status=status.HTTP_200_OK)
+
+
+class ConjugationTableView(APIView):
+    """ConjugationTableView
+
+    Returns the full conjugation table for a verb. The tables are generated
+    when the conjugations are imported, so this is a single lookup. Clients
+    can send the `ETag` back in the `If-None-Match` header to avoid
+    downloading a table that they already have.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, pk):
+        """Get the conjugation table
+
+        Example:
+            This endpoint will be available at::
+
+                /verbs/<pk>/conjugations/
+
+        Example response:
+            The response data should look like (shortened for brevity)::
+
+                {
+                    "verb": 1,
+                    "name": "falar",
+                    "moods": {
+                        "indicativo": {
+                            "presente": ["eu falo", "tu falas", "ele fala", ...],
+                            ...
+                        },
+                        ...
+                    }
+                }
+
+        Raises:
+            HTTP 404 Not Found if the verb doesn't exist
+        """
+        conjugation_table = ConjugationTable.objects.filter(verb_id=pk).first()
+
+        # Verbs imported before the tables existed get theirs on first request
+        if conjugation_table is None:
+            verb = get_object_or_404(Verb, id=pk)
+            conjugation_table = update_conjugation_table(verb)
+
+        etag = quote_etag(conjugation_table.etag)
+        if_none_match = parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        data = json.loads(conjugation_table.table)
+        return Response(data=data, status=status.HTTP_200_OK, headers={"ETag": etag})
@@ -13,3 +13,5 @@ how long they take to read it. This would be good to get an idea of how long a
 user takes to read any given book, but it would also be used to send users
 reminders that they need to get back to reading a specific book.
 """
+
+default_app_config = "library.apps.LibraryConfig"
@@ -0,0 +1,23 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0005_librarybook_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='librarybook',
+            name='last_activity',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='librarybook',
+            index=models.Index(fields=['user', 'last_activity'], name='library_lib_user_id_0107de_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+"""
+Set the last activity of the existing library books to the start of their
+latest reading session, or to when they were added if they haven't been read.
+"""
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def set_last_activity(apps, schema_editor):
+    LibraryBook = apps.get_model('library', 'LibraryBook')
+    ReadingSession = apps.get_model('reading_sessions', 'ReadingSession')
+
+    latest_session = ReadingSession.objects.filter(
+        library_item=OuterRef('pk')).order_by('-created_on').values('created_on')[:1]
+    LibraryBook.objects.update(
+        last_activity=Coalesce(Subquery(latest_session), 'created_on'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0006_librarybook_last_activity'),
+        ('reading_sessions', '0007_reading_events'),
+    ]
+
+    operations = [
+        migrations.RunPython(set_last_activity, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+"""
+Create the library versions for the users that already have books in their
+libraries, as the versions are only created when a book is saved.
+"""
+from django.db import migrations
+
+
+def create_library_versions(apps, schema_editor):
+    LibraryBook = apps.get_model('library', 'LibraryBook')
+    LibraryVersion = apps.get_model('library', 'LibraryVersion')
+
+    user_ids = LibraryBook.objects.values_list('user_id', flat=True).distinct()
+    LibraryVersion.objects.bulk_create(
+        [LibraryVersion(user_id=user_id, version=1) for user_id in user_ids],
+        batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0008_libraryversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_library_versions, migrations.RunPython.noop),
+    ]
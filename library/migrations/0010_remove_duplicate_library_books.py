@@ -0,0 +1,42 @@
+"""
+Remove the duplicate library books before the unique constraint is added. The
+first library book is kept for each book, and the reading sessions of the
+duplicates are moved over to it. The kept library book is given the furthest
+progress, the earliest finish and the latest activity of any of the
+duplicates, so nothing that the user has read is lost.
+"""
+from django.db import migrations
+from django.db.models import Count, Max, Min
+
+
+def remove_duplicate_library_books(apps, schema_editor):
+    LibraryBook = apps.get_model('library', 'LibraryBook')
+    ReadingSession = apps.get_model('reading_sessions', 'ReadingSession')
+
+    duplicates = LibraryBook.objects.values('user_id', 'book_id').annotate(
+        first_id=Min('id'), count=Count('id'), progress=Max('progress'),
+        finished_on=Min('finished_on'), last_activity=Max('last_activity'),
+    ).filter(count__gt=1)
+    for duplicate in duplicates:
+        LibraryBook.objects.filter(id=duplicate['first_id']).update(
+            progress=duplicate['progress'], finished_on=duplicate['finished_on'],
+            last_activity=duplicate['last_activity'])
+
+        library_books = LibraryBook.objects.filter(
+            user_id=duplicate['user_id'], book_id=duplicate['book_id']
+        ).exclude(id=duplicate['first_id'])
+        ReadingSession.objects.filter(library_item__in=library_books).update(
+            library_item_id=duplicate['first_id'])
+        library_books.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0009_create_library_versions'),
+        ('reading_sessions', '0007_reading_events'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_library_books, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0010_remove_duplicate_library_books'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='librarybook',
+            constraint=models.UniqueConstraint(fields=('user', 'book'), name='unique_library_book'),
+        ),
+    ]
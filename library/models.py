@@ -6,12 +6,17 @@ with a specific book. This will be the model that will be used to store the
 user's reading list and their progress with the book.
 """
 from django.db import models
+from django.utils import timezone
 from accounts.models import UserProfile
 from books.models import Book
 
 
 class LibraryBook(models.Model):
     """Library Book Model
+
+    The `last_activity` is the last time that the user added the book or
+    read it, and is used to order the user's library. Each book can only be
+    in the user's library once.
     """
 
     user = models.ForeignKey(UserProfile, on_delete=models.CASCADE)
@@ -19,6 +24,14 @@ class LibraryBook(models.Model):
     created_on = models.DateTimeField(auto_now_add=True)
     finished_on = models.DateTimeField(null=True, blank=True)
     progress = models.FloatField(null=True, blank=True)
+    last_activity = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "last_activity"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "book"], name="unique_library_book")
+        ]
 
     def __str__(self):
         return f"{self.user.username} is reading {self.book.title}"
@@ -26,3 +39,19 @@ class LibraryBook(models.Model):
     @property
     def is_finished(self):
         return bool(self.finished_on)
+
+
+class LibraryVersion(models.Model):
+    """Library Version Model
+
+    A counter that is incremented whenever anything in the user's library
+    changes, including their reading sessions. The version is used as the
+    `ETag` of the library, so clients can check whether their copy is still
+    up to date without the library being fetched, see `library.versions`.
+    """
+
+    user = models.OneToOneField(
+        UserProfile, on_delete=models.CASCADE, primary_key=True,
+        related_name="library_version")
+    version = models.PositiveIntegerField(default=0)
+    updated_on = models.DateTimeField(default=timezone.now)
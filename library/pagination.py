@@ -0,0 +1,10 @@
+from rest_framework.pagination import CursorPagination
+
+
+class LibraryCursorPagination(CursorPagination):
+    """
+    Paginates the user's library with a cursor, with the books that were
+    read most recently first
+    """
+
+    ordering = ("-last_activity", "-id")
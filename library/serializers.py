@@ -1,6 +1,8 @@
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.validators import UniqueTogetherValidator
 from library.models import LibraryBook
+from library.utils import lock_library
 from accounts.models import UserProfile
 from books.models import Book
 from books.serializers import BookSerializer
@@ -22,11 +24,18 @@ class LibrarySerializer(serializers.ModelSerializer):
     readingsession_count = serializers.SerializerMethodField()
 
     def get_readingsession_count(self, obj):
+        # The library list annotates the count, so that it isn't counted
+        # separately for each item
+        if hasattr(obj, "readingsession_count"):
+            return obj.readingsession_count
         return obj.readingsession_set.all().count()
 
     class Meta:
         model = LibraryBook
-        fields = ["id", "book", "readingsession_count", "finished_on", "is_finished"]
+        fields = [
+            "id", "book", "readingsession_count", "finished_on", "is_finished",
+            "last_activity"
+        ]
 
 
 class AddToLibrarySerializer(serializers.ModelSerializer):
@@ -46,6 +55,34 @@ class AddToLibrarySerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         self.is_valid(raise_exception=True)
-        library_book = super(AddToLibrarySerializer, self).create(validated_data)
-        library_book.save()
+        # The library is locked as for a batch of books, see
+        # `library.utils.add_library_books`
+        with transaction.atomic():
+            lock_library(validated_data["user"])
+            library_book = super(AddToLibrarySerializer, self).create(validated_data)
+            library_book.save()
         return library_book
+
+
+class BulkLibrarySerializer(serializers.Serializer):
+    """The Bulk Library Serializer
+
+    The serializer used to deserialise a batch of books that are to be added
+    to, or removed from, the user's library. All of the books are checked
+    with a single query.
+    """
+
+    MAX_BOOKS = 1000
+
+    books = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False,
+        max_length=MAX_BOOKS)
+
+    def validate_books(self, value):
+        book_ids = list(dict.fromkeys(value))
+        found = set(Book.objects.filter(id__in=book_ids).values_list("id", flat=True))
+        missing = [book_id for book_id in book_ids if book_id not in found]
+        if missing:
+            raise serializers.ValidationError(
+                f"Invalid pk {', '.join(map(str, missing))} - object does not exist.")
+        return book_ids
@@ -0,0 +1,36 @@
+"""Library Signals
+
+The version of the user's library is bumped whenever one of their library
+books or reading sessions is saved or deleted. The version is only created
+on a save, as the rows may be being deleted along with the user.
+
+Removing a batch of books skips these handlers and bumps the version once
+for the whole batch, see `library.utils.remove_library_books`.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from decypher.signals import skippable
+from library.models import LibraryBook
+from library.versions import bump_library_version
+from reading_sessions.models import ReadingSession
+from reading_sessions.utils import get_reading_session_user_id
+
+
+@receiver(post_save, sender=LibraryBook)
+@receiver(post_delete, sender=LibraryBook)
+@skippable
+def bump_library_book_version(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_library_version(instance.user_id, create="created" in kwargs)
+
+
+@receiver(post_save, sender=ReadingSession)
+@receiver(post_delete, sender=ReadingSession)
+@skippable
+def bump_reading_session_version(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    user_id = get_reading_session_user_id(instance)
+    if user_id is not None:
+        bump_library_version(user_id, create="created" in kwargs)
@@ -1,3 +1,253 @@
-from django.test import TestCase
+"""
+The test cases for the library API. This test suite should test for the
+following test cases:
 
-# Create your tests here.
+    - Listing the library takes the same number of queries no matter how many
+        books the user has
+    - The library is paginated, with the books that were read most recently
+        first
+    - A library that hasn't changed since the client last fetched it isn't
+        fetched or sent again
+    - Reading a book, or updating one of the books, changes the library's
+        ETag
+    - A batch of books is added with a fixed number of queries, skipping the
+        books that are already in the library, and only the books that were
+        inserted are counted
+    - A batch with a book that doesn't exist is rejected
+    - A batch of books can be removed from the library, along with their
+        reading sessions, with a fixed number of queries, and the counters,
+        rollups and practice sessions that depend on them are updated
+"""
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import UserProfile
+from books.models import Book
+from dashboard.counters import get_dashboard_counters
+from dashboard.models import DailyStats, DashboardCounters, HourlyStats
+from languages.models import Language
+from library.models import LibraryBook
+from practice.models import Question, Session
+from reading_sessions.models import ReadingSession
+from translator.models import Translation
+
+
+class LibraryTests(APITestCase):
+    """
+    The test cases for listing the user's library
+    """
+    fixtures = ['fixtures.json']
+
+    def setUp(self):
+        """
+        Get the user whose library is listed
+        """
+        self.user = UserProfile.objects.get(email="aaronsnig@gmail.com")
+        self.language = Language.objects.get(name="Brazilian Portuguese")
+        self.client.force_authenticate(user=self.user)
+
+    def _add_books(self, count):
+        """
+        A helper method used to add books with a reading session each to the
+        user's library
+        """
+        library_items = []
+        for number in range(count):
+            book = Book.objects.create(
+                title=f"Book {number}", author="Author", language=self.language)
+            library_item = LibraryBook.objects.create(user=self.user, book=book)
+            ReadingSession.objects.create(
+                library_item=library_item, duration=timedelta(minutes=5), pages=1)
+            library_items.append(library_item)
+        return library_items
+
+    def test_that_listing_the_library_takes_a_fixed_number_of_queries(self):
+        """
+        The books and the reading session counts are fetched with the
+        library items, after the library version has been checked
+        """
+        self._add_books(2)
+        with self.assertNumQueries(2):
+            self.client.get(reverse("reading-list-list"))
+
+        self._add_books(8)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("reading-list-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["readingsession_count"], 1)
+
+    def test_that_the_most_recently_read_books_are_listed_first(self):
+        """
+        Reading a book moves it to the start of the library
+        """
+        library_items = self._add_books(12)
+        session = library_items[0].readingsession_set.get()
+        self.client.patch(
+            reverse("reading-sessions-detail", kwargs={"pk": session.id}),
+            {"pages": "2"}, format="json")
+
+        response = self.client.get(reverse("reading-list-list"))
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertEqual(response.data["results"][0]["id"], library_items[0].id)
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_that_an_unchanged_library_is_not_fetched_again(self):
+        """
+        Sending back the ETag returns a 304 after only checking the version
+        """
+        self._add_books(2)
+        response = self.client.get(reverse("reading-list-list"))
+        self.assertNotIn("Last-Modified", response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("reading-list-list"), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_that_reading_a_book_changes_the_etag(self):
+        """
+        Updating a reading session bumps the version of the library
+        """
+        library_item = self._add_books(1)[0]
+        etag = self.client.get(reverse("reading-list-list"))["ETag"]
+
+        session = library_item.readingsession_set.get()
+        self.client.patch(
+            reverse("reading-sessions-detail", kwargs={"pk": session.id}),
+            {"pages": 3}, format="json")
+
+        response = self.client.get(
+            reverse("reading-list-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_that_updating_a_book_changes_the_etag(self):
+        """
+        The ETag covers the books in the library, which can be updated without
+        the library itself changing
+        """
+        library_item = self._add_books(1)[0]
+        etag = self.client.get(reverse("reading-list-list"))["ETag"]
+
+        book = library_item.book
+        book.title = "A New Title"
+        book.save()
+
+        response = self.client.get(
+            reverse("reading-list-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["book"]["title"], "A New Title")
+
+    def _create_books(self, count):
+        """
+        A helper method used to create books that aren't in the library
+        """
+        return [
+            Book.objects.create(
+                title=f"Shelf {number}", author="Author", language=self.language).id
+            for number in range(count)
+        ]
+
+    def test_that_a_batch_of_books_is_added_with_a_fixed_number_of_queries(self):
+        """
+        The books are checked and inserted in one go, and the books that are
+        already in the library aren't added again
+        """
+        library_item = self._add_books(1)[0]
+        book_ids = self._create_books(20)
+        get_dashboard_counters(self.user)
+
+        with self.assertNumQueries(9):
+            response = self.client.post(
+                reverse("reading-list-bulk"),
+                {"books": [library_item.book_id] + book_ids + book_ids[:2]},
+                format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 20)
+        self.assertEqual(LibraryBook.objects.filter(user=self.user).count(), 21)
+        self.assertEqual(
+            DashboardCounters.objects.get(user=self.user).library_items, 21)
+
+    def test_that_a_batch_with_a_missing_book_is_rejected(self):
+        """
+        None of the books are added if any of them don't exist
+        """
+        book_ids = self._create_books(2)
+        response = self.client.post(
+            reverse("reading-list-bulk"), {"books": book_ids + [9999]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("9999", str(response.data["books"]))
+        self.assertFalse(LibraryBook.objects.filter(user=self.user).exists())
+
+    def test_that_a_batch_of_books_can_be_removed(self):
+        """
+        Removing the books removes their library items
+        """
+        library_items = self._add_books(3)
+        response = self.client.delete(
+            reverse("reading-list-bulk"),
+            {"books": [item.book_id for item in library_items[:2]]}, format="json")
+
+        self.assertEqual(response.data, {"removed": 2})
+        self.assertEqual(
+            list(LibraryBook.objects.filter(user=self.user)), [library_items[2]])
+
+    def test_that_a_batch_of_books_is_removed_with_a_fixed_number_of_queries(self):
+        """
+        The reading sessions and translations are removed along with the
+        books, and the version, the counters, the rollups and the practice
+        sessions that asked about the translations are only updated once
+        """
+        get_dashboard_counters(self.user)
+        practice_sessions = []
+        for count in (2, 20):
+            library_items = self._add_books(count)
+            practice_session = Session.objects.create(
+                user=self.user, question_count=count, correct_count=count, score=100,
+                claimed_on=timezone.now())
+            practice_sessions.append(practice_session)
+            for library_item in library_items:
+                translation = Translation.objects.create(
+                    user=self.user, source_text="texto", translated_text="text",
+                    audio_file_path="", source_language=self.language,
+                    target_language=self.language,
+                    session=library_item.readingsession_set.get())
+                Question.objects.create(
+                    translation=translation, session=practice_session, correct=True)
+            etag = self.client.get(reverse("reading-list-list"))["ETag"]
+
+            with self.assertNumQueries(29):
+                response = self.client.delete(
+                    reverse("reading-list-bulk"),
+                    {"books": [item.book_id for item in library_items]}, format="json")
+
+            self.assertEqual(response.data, {"removed": count})
+            response = self.client.get(
+                reverse("reading-list-list"), HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertFalse(LibraryBook.objects.filter(user=self.user).exists())
+        self.assertFalse(Translation.objects.filter(user=self.user).exists())
+        counters = DashboardCounters.objects.get(user=self.user)
+        self.assertEqual(
+            (counters.library_items, counters.reading_sessions, counters.translations),
+            (0, 0, 0))
+        for practice_session in practice_sessions:
+            practice_session.refresh_from_db()
+            self.assertEqual(
+                (practice_session.question_count, practice_session.correct_count,
+                 practice_session.score),
+                (0, 0, None))
+        rollups = DailyStats.objects.get(user=self.user)
+        self.assertEqual(
+            (rollups.reading_sessions, rollups.translations, rollups.practice_sessions),
+            (0, 0, 0))
+        self.assertFalse(HourlyStats.objects.filter(user=self.user).exclude(
+            reading_sessions=0, translations=0).exists())
@@ -0,0 +1,118 @@
+"""Library Utilities
+
+The helpers used to add and remove books from a user's library in bulk, such
+as when a user imports one of their shelves from another site.
+"""
+from django.db import transaction
+from django.utils import timezone
+from decypher.signals import skip_signal_handlers
+from accounts.models import UserProfile
+from dashboard.counters import add_dashboard_counters
+from dashboard.rollups import get_day, refresh_practice_stats, remove_activity_stats
+from library.models import LibraryBook
+from library.versions import bump_library_version
+from practice.models import Session
+from practice.utils import recount_sessions
+from reading_sessions.models import ReadingSession
+from translator.models import Translation
+
+
+BATCH_SIZE = 500
+
+
+def lock_library(user):
+    """Lock the library
+
+    Lock the user's row until the end of the transaction, so that only one
+    request at a time can add books to their library.
+
+    Args:
+        user (UserProfile): The user whose library is locked
+    """
+    list(UserProfile.objects.select_for_update().filter(id=user.id).values_list("id"))
+
+
+def add_library_books(user, book_ids):
+    """Add library books
+
+    Add the books to the user's library with a single insert, skipping the
+    books that are already in the library.
+
+    The library is locked while the books are added, so no other request can
+    add any of the books between reading the books that are already in the
+    library and inserting the rest, and every book that isn't in the library
+    yet is inserted.
+
+    `bulk_create` doesn't send `post_save`, so the library version and the
+    dashboard counters are updated here instead.
+
+    Args:
+        user (UserProfile): The user whose library the books are added to
+        book_ids (list): The IDs of the books, which must exist
+
+    Returns:
+        list: The IDs of the books that were added to the library
+    """
+    with transaction.atomic():
+        lock_library(user)
+        existing = set(LibraryBook.objects.filter(
+            user=user, book_id__in=book_ids).values_list("book_id", flat=True))
+        new_book_ids = [
+            book_id for book_id in dict.fromkeys(book_ids) if book_id not in existing]
+        if not new_book_ids:
+            return []
+
+        now = timezone.now()
+        LibraryBook.objects.bulk_create(
+            [LibraryBook(user=user, book_id=book_id, last_activity=now)
+             for book_id in new_book_ids],
+            batch_size=BATCH_SIZE)
+        bump_library_version(user.id)
+        add_dashboard_counters(user.id, library_items=len(new_book_ids))
+    return new_book_ids
+
+
+def remove_library_books(user, book_ids):
+    """Remove library books
+
+    Remove the books from the user's library, along with their reading
+    sessions and translations.
+
+    The books are deleted with `QuerySet.delete`, which deletes the related
+    rows too, but the signal handlers that update the derived counters for
+    each row are skipped. The rollups, the practice sessions that asked about
+    the translations, the library version and the dashboard counters are
+    updated once for the whole batch instead, so the number of queries
+    doesn't depend on how many books are removed.
+
+    Args:
+        user (UserProfile): The user whose library the books are removed from
+        book_ids (list): The IDs of the books
+
+    Returns:
+        int: The number of books that were removed
+    """
+    library_books = LibraryBook.objects.filter(user=user, book_id__in=book_ids)
+    reading_sessions = ReadingSession.objects.filter(library_item__in=library_books)
+    translations = Translation.objects.filter(session__in=reading_sessions)
+
+    with transaction.atomic():
+        remove_activity_stats(user.id, reading_sessions, translations)
+        sessions = dict(Session.objects.filter(
+            question__translation__in=translations).values_list("id", "claimed_on"))
+
+        with skip_signal_handlers():
+            _, deleted = library_books.delete()
+        removed = deleted.get(LibraryBook._meta.label, 0)
+
+        if sessions:
+            recount_sessions(list(sessions))
+            for day in {get_day(claimed_on) for claimed_on in sessions.values() if claimed_on}:
+                refresh_practice_stats(user.id, day)
+        if removed:
+            bump_library_version(user.id, create=False)
+            add_dashboard_counters(
+                user.id, library_items=-removed,
+                reading_sessions=-deleted.get(ReadingSession._meta.label, 0),
+                translations=-deleted.get(Translation._meta.label, 0))
+    return removed
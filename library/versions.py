@@ -0,0 +1,99 @@
+"""Library Versions
+
+The helpers used to keep track of the version of each user's library.
+
+Clients poll the library to see if anything has changed, so rather than
+fetching and serializing the library on every poll, the version of the
+library is checked against the `ETag` that the client sent first. The version
+is incremented in the database with an `F` expression whenever a library book
+or a reading session is saved or deleted, see `library.signals`.
+
+Updates that are made with `QuerySet.update` or `bulk_update` don't send any
+signals, so the code that makes them needs to bump the version itself.
+
+The books themselves are shared between users, so rather than bumping the
+version of every library that a book is in when it changes, the time that
+the user's books were last updated is read along with the version and is
+included in the `ETag`.
+"""
+import hashlib
+from django.db.models import F, Max, OuterRef, Subquery
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from decypher.db import upsert
+from library.models import LibraryBook, LibraryVersion
+
+
+def bump_library_version(user_id, create=True):
+    """Bump the library version
+
+    Args:
+        user_id (int): The ID of the user whose library changed
+        create (bool): Whether the version should be created if it doesn't
+        exist yet. The version always exists once the user has added a book,
+        so this is turned off when books and sessions are deleted, as they
+        may be being deleted along with the user
+    """
+    now = timezone.now()
+    updates = {"version": F("version") + 1, "updated_on": now}
+    if not create:
+        LibraryVersion.objects.filter(user_id=user_id).update(**updates)
+        return
+    upsert(LibraryVersion, {"user_id": user_id}, {"version": 1, "updated_on": now}, updates)
+
+
+def get_library_version(user_id):
+    """Get the library version
+
+    Read the version of the user's library, along with the time that any of
+    the books in it were last updated, with a single query.
+
+    Args:
+        user_id (int): The ID of the user
+
+    Returns:
+        LibraryVersion: The version of the user's library, with the time in
+        `books_updated_at`, which won't be saved if the library has never
+        changed
+    """
+    books_updated_at = LibraryBook.objects.filter(
+        user_id=OuterRef("user_id")
+    ).order_by().values("user_id").annotate(
+        updated_at=Max("book__updated_at")).values("updated_at")
+    library_version = LibraryVersion.objects.filter(user_id=user_id).annotate(
+        books_updated_at=Subquery(books_updated_at)).first()
+
+    if library_version is None:
+        library_version = LibraryVersion(user_id=user_id, updated_on=None)
+        library_version.books_updated_at = None
+    return library_version
+
+
+def get_conditional_library_response(request):
+    """Get a conditional library response
+
+    Check whether the client's copy of the library is still up to date. The
+    `ETag` covers the full path of the request, so each page of the library
+    has its own `ETag`. Only the `ETag` is sent, as the books can be updated
+    without the library's `updated_on` changing.
+
+    Args:
+        request (Request): The request for the library
+
+    Returns:
+        tuple: The `304 Not Modified` response, or None if the library needs
+        to be sent, and the headers that should be sent with the library
+    """
+    library_version = get_library_version(request.user.id)
+    books_updated_at = library_version.books_updated_at
+    books_version = int(books_updated_at.timestamp() * 1000000) if books_updated_at else 0
+    path_hash = hashlib.sha1(request.get_full_path().encode("utf-8")).hexdigest()[:16]
+    etag = quote_etag(f"{library_version.version}-{books_version}-{path_hash}")
+    headers = {"ETag": etag}
+
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        for header, value in headers.items():
+            response[header] = value
+    return response, headers
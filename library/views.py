@@ -1,9 +1,15 @@
+from django.db.models import Count
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from library.models import LibraryBook
-from library.serializers import LibrarySerializer, AddToLibrarySerializer
+from library.pagination import LibraryCursorPagination
+from library.serializers import (
+    LibrarySerializer, AddToLibrarySerializer, BulkLibrarySerializer)
+from library.utils import add_library_books, remove_library_books
+from library.versions import get_conditional_library_response
 from books.models import Book
 from reading_sessions.models import ReadingSession
 
@@ -22,6 +28,7 @@ class LibraryViewSet(viewsets.ModelViewSet):
     - List all library items - GET
     - Create a library item - POST
     - Mark an item as finished - PATCH
+    - Add or remove a batch of books - POST/DELETE on `bulk/`
     """
 
     permission_classes = (IsAuthenticated,)
@@ -32,10 +39,16 @@ class LibraryViewSet(viewsets.ModelViewSet):
     def list(self, request):
         """List the user's library
 
-        Get a full list of the items that the user has in their library.
+        Get a page of the items that the user has in their library, with the
+        books that were read most recently first. The whole page is fetched
+        with a single query.
+
+        Clients can send the `ETag` back in the `If-None-Match` header, and will
+        receive a `304 Not Modified` if the library hasn't changed, without the
+        library being fetched.
 
         Returns:
-            LibrarySerializer (list): A list of library items
+            LibrarySerializer (list): A page of library items
         
         Examples:
             This endpoint will be available at::
@@ -51,30 +64,46 @@ class LibraryViewSet(viewsets.ModelViewSet):
         Example response:
             The response data should look like (longer strings have been truncated for brevity)::
 
-                [
-                    {
-                        "id": 1,
-                        "book": {
-                            "id": 7,
-                            "title": "Harry Potter and International Relations",
-                            "author": "['Daniel H. Nexon', 'Iver B. Neumann']",
-                            "publisher": "Rowman & Littlefield",
-                            "publish_date": "2020-07-30",
-                            "description": "Drawing on a range of historical...",
-                            "category": null,
-                            "small_thumbnail": "http://books.google.com/books/content...",
-                            "thumbnail": "http://books.google.com/books/content?...",
-                            "language": 2
-                        },
-                        "readingsession_count": 1,
-                        "finished_on": "2020-07-20T16:24:00Z",
-                        "is_finished": false
-                    }
-                ]
+                {
+                    "next": "http://127.0.0.1:8000/reading-list/?cursor=cD0yMDIw...",
+                    "previous": null,
+                    "results": [
+                        {
+                            "id": 1,
+                            "book": {
+                                "id": 7,
+                                "title": "Harry Potter and International Relations",
+                                "author": "['Daniel H. Nexon', 'Iver B. Neumann']",
+                                "publisher": "Rowman & Littlefield",
+                                "publish_date": "2020-07-30",
+                                "description": "Drawing on a range of historical...",
+                                "category": null,
+                                "small_thumbnail": "http://books.google.com/books/content...",
+                                "thumbnail": "http://books.google.com/books/content?...",
+                                "language": 2
+                            },
+                            "readingsession_count": 1,
+                            "finished_on": "2020-07-20T16:24:00Z",
+                            "is_finished": false,
+                            "last_activity": "2020-07-20T16:24:00Z"
+                        }
+                    ]
+                }
         """
-        library = self.queryset.filter(user=request.user)
-        serializer = self.serializer_class(library, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        not_modified, headers = get_conditional_library_response(request)
+        if not_modified is not None:
+            return not_modified
+
+        library = self.queryset.filter(user=request.user).select_related(
+            "book").annotate(readingsession_count=Count("readingsession"))
+
+        paginator = LibraryCursorPagination()
+        page = paginator.paginate_queryset(library, request, view=self)
+        serializer = self.serializer_class(page, many=True)
+        response = paginator.get_paginated_response(serializer.data)
+        for header, value in headers.items():
+            response[header] = value
+        return response
 
     def create(self, request):
         """Add item to library
@@ -105,3 +134,48 @@ class LibraryViewSet(viewsets.ModelViewSet):
             return Response(serializer.data)
         else:
             return Response(serializer.errors)
+
+    @action(methods=["POST", "DELETE"], detail=False)
+    def bulk(self, request):
+        """Add or remove books in bulk
+
+        Add a batch of books to the user's library with `POST`, or remove them
+        with `DELETE`. All of the books are checked with one query and added
+        with a single insert, so the number of queries doesn't depend on the
+        number of books. Books that are already in the library are skipped.
+
+        Args:
+            books (list): The IDs of the books
+
+        Examples:
+            The URL is as follows::
+                /reading-list/bulk/
+
+            And the body should be::
+                {
+                    "books": [1, 2, 3]
+                }
+
+            Adding the books will return the library items that were created,
+            in the same format as the library list. Removing them will return
+            the number of books that were removed::
+                {
+                    "removed": 3
+                }
+        """
+        serializer = BulkLibrarySerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        book_ids = serializer.validated_data["books"]
+
+        if request.method == "DELETE":
+            removed = remove_library_books(request.user, book_ids)
+            return Response(data={"removed": removed}, status=status.HTTP_200_OK)
+
+        new_book_ids = add_library_books(request.user, book_ids)
+        library = self.queryset.filter(
+            user=request.user, book_id__in=new_book_ids
+        ).select_related("book").annotate(
+            readingsession_count=Count("readingsession")).order_by("id")
+        serializer = self.serializer_class(library, many=True)
+        return Response(data=serializer.data, status=status.HTTP_201_CREATED)
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Session, Question
+from .models import DistractorIndex, Session, Question
 
 admin.site.register(Session)
-admin.site.register(Question)
\ No newline at end of file
+admin.site.register(Question)
+admin.site.register(DistractorIndex)
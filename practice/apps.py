@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class PracticeConfig(AppConfig):
     name = 'practice'
+
+    def ready(self):
+        from practice import signals  # noqa: F401
@@ -0,0 +1,158 @@
+"""Practice Distractors
+
+The helpers used to pick the wrong options for multiple choice questions.
+
+The wrong options (the distractors) are the user's own translations that are
+most similar to the correct answer, so they're plausible answers rather than
+random ones. Comparing every translation to every other translation is
+quadratic, so the nearest neighbours of each translation are found ahead of
+time by the `build_distractor_indexes` management command and stored in the
+user's `DistractorIndex`.
+
+The translations are compared using the TF-IDF of their character n-grams,
+which matches answers that share parts of their words, such as `speak` and
+`spoke`. The neighbours are stored as a sparse matrix with a row for each
+translation, where the non-zero columns of a row are its nearest neighbours
+and the values are their similarity.
+"""
+import io
+import json
+import random
+import numpy
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.neighbors import NearestNeighbors
+from practice.models import DistractorIndex
+from translator.models import Translation
+
+
+# The number of wrong options for each multiple choice question
+DISTRACTOR_COUNT = 3
+
+# The number of neighbours that are kept for each translation, so there are
+# still enough distractors after any duplicates of the answer are skipped
+NEIGHBOUR_COUNT = 8
+
+
+def build_distractor_index(user):
+    """Build the distractor index
+
+    Find the nearest neighbours of each of the user's translations and store
+    them in the user's distractor index, replacing the existing index.
+
+    Args:
+        user (UserProfile): The user that the index should be built for
+
+    Returns:
+        DistractorIndex: The new index, or,
+        None: If the user doesn't have enough translations to build an index
+    """
+    translations = list(
+        Translation.objects.filter(user=user).order_by("id").values_list(
+            "id", "translated_text", "normalized_answer"))
+    if len(translations) < 2:
+        DistractorIndex.objects.filter(user=user).delete()
+        return None
+
+    translation_ids = numpy.array([row[0] for row in translations], dtype=numpy.int64)
+    answers = [normalized or text.casefold() for _, text, normalized in translations]
+
+    vectors = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4)).fit_transform(answers)
+    neighbours = NearestNeighbors(
+        n_neighbors=min(NEIGHBOUR_COUNT + 1, len(answers)), metric="cosine")
+    distances, positions = neighbours.fit(vectors).kneighbors(vectors)
+
+    rows, columns, similarities = [], [], []
+    for row, (row_distances, row_positions) in enumerate(zip(distances, positions)):
+        for distance, position in zip(row_distances, row_positions):
+            if answers[position] != answers[row]:
+                rows.append(row)
+                columns.append(position)
+                similarities.append(max(1 - distance, numpy.finfo(numpy.float32).tiny))
+
+    matrix = sparse.csr_matrix(
+        (numpy.array(similarities, dtype=numpy.float32), (rows, columns)),
+        shape=(len(answers), len(answers)))
+    buffer = io.BytesIO()
+    sparse.save_npz(buffer, matrix)
+
+    index, _ = DistractorIndex.objects.update_or_create(
+        user=user, defaults={
+            "translation_ids": translation_ids.tobytes(),
+            "neighbours": buffer.getvalue(),
+        })
+    return index
+
+
+def get_distractor_ids(user, translation_ids):
+    """Get the distractor IDs
+
+    Look up the nearest neighbours of each translation in the user's
+    distractor index, with a single query. Translations that were created
+    after the index was built don't have any distractors.
+
+    Args:
+        user (UserProfile): The user that the translations belong to
+        translation_ids (list): The IDs of the translations
+
+    Returns:
+        dict: Maps each translation ID to a list of the IDs of its most
+        similar translations, most similar first
+    """
+    index = DistractorIndex.objects.filter(user=user).first()
+    if index is None:
+        return {}
+
+    indexed_ids = numpy.frombuffer(bytes(index.translation_ids), dtype=numpy.int64)
+    matrix = sparse.load_npz(io.BytesIO(bytes(index.neighbours))).tocsr()
+
+    distractor_ids = {}
+    for translation_id in translation_ids:
+        row = numpy.searchsorted(indexed_ids, translation_id)
+        if row == len(indexed_ids) or indexed_ids[row] != translation_id:
+            continue
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        order = numpy.argsort(-matrix.data[start:end], kind="stable")
+        distractor_ids[translation_id] = [
+            int(indexed_ids[column]) for column in matrix.indices[start:end][order]]
+    return distractor_ids
+
+
+def get_choices(user, translation_ids):
+    """Get the choices
+
+    Put together the options for a multiple choice question about each of
+    the translations, in a random order. Duplicate answers are only offered
+    once.
+
+    Args:
+        user (UserProfile): The user that the translations belong to
+        translation_ids (list): The IDs of the translations
+
+    Returns:
+        dict: Maps each translation ID to the JSON encoded list of its
+        choices. Translations without any distractors are left out
+    """
+    distractor_ids = get_distractor_ids(user, translation_ids)
+    if not distractor_ids:
+        return {}
+
+    answer_ids = set(distractor_ids)
+    for ids in distractor_ids.values():
+        answer_ids.update(ids)
+    answers = dict(Translation.objects.filter(id__in=answer_ids).values_list(
+        "id", "translated_text"))
+
+    choices = {}
+    for translation_id, ids in distractor_ids.items():
+        options = [answers[translation_id]]
+        for distractor_id in ids:
+            answer = answers.get(distractor_id)
+            if answer is not None and answer not in options:
+                options.append(answer)
+            if len(options) > DISTRACTOR_COUNT:
+                break
+        if len(options) > 1:
+            random.shuffle(options)
+            choices[translation_id] = json.dumps(options)
+    return choices
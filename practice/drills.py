@@ -0,0 +1,184 @@
+"""Practice Drills
+
+The helpers used to put together and grade the conjugation drills, which ask
+the user for the form of a verb for a given tense, mood and person.
+
+Rather than picking forms at random by joining the lemmatizer's forms to
+their verbs, tenses and moods on every request, each language has a pool of
+`DrillCandidate` rows that is rebuilt by the `build_drill_pools` management
+command. The candidates are numbered from 0 with no gaps, so random positions
+can be picked in Python and the candidates are then fetched with a single
+query on the `(language, position)` index.
+
+The size of each pool is read from the highest position on the same index,
+rather than being cached, so every process sees a rebuilt pool straight
+away.
+"""
+import random
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from lemmatizer.models import Form
+from lemmatizer.normalization import get_inflected_word
+from practice.models import DrillCandidate, DrillQuestion, Session
+from practice.utils import mark_questions
+
+
+DRILL_QUESTIONS = 20
+
+BATCH_SIZE = 1000
+
+BLANK = "___"
+
+
+def get_prompt(form):
+    """Get the prompt
+
+    Replace the inflected word within a form with a blank, keeping the
+    pronouns and particles around it.
+
+    Args:
+        form (str): The form as it is stored in the `Form` model
+
+    Returns:
+        str: The prompt for the form
+
+    Example:
+        The pronouns are kept on either side of the blank::
+
+            get_prompt("que eu fale")  # "que eu ___"
+            get_prompt("fala tu")  # "___ tu"
+    """
+    answer = get_inflected_word(form)
+    words = form.split()
+    for position in range(len(words) - 1, -1, -1):
+        if words[position].lower() == answer:
+            words[position] = BLANK
+            break
+    return " ".join(words)
+
+
+def build_drill_pool(language):
+    """Build the drill pool
+
+    Replace the language's drill candidates with one for each of its forms.
+
+    Args:
+        language (Language): The language that the pool should be built for
+
+    Returns:
+        int: The number of candidates in the pool
+    """
+    forms = Form.objects.filter(verb__language=language).order_by("id").values_list(
+        "id", "form", "person", "verb__name", "tense__name", "tense__mood__name")
+
+    with transaction.atomic():
+        DrillCandidate.objects.filter(language=language).delete()
+
+        candidates = []
+        size = 0
+        for form_id, form, person, verb, tense, mood in forms.iterator():
+            candidates.append(DrillCandidate(
+                language=language, position=size, form_id=form_id, form_text=form,
+                verb=verb, mood=mood, tense=tense, person=person, prompt=get_prompt(form),
+                answer=get_inflected_word(form)))
+            size += 1
+            if len(candidates) == BATCH_SIZE:
+                DrillCandidate.objects.bulk_create(candidates)
+                candidates = []
+        DrillCandidate.objects.bulk_create(candidates)
+
+    return size
+
+
+def get_pool_size(language_id):
+    """Get the pool size
+
+    As the positions don't have any gaps, the size of the pool is one more
+    than the highest position, which is read from the index without counting
+    the candidates.
+
+    Args:
+        language_id (int): The ID of the language
+
+    Returns:
+        int: The number of candidates in the language's drill pool
+    """
+    highest = DrillCandidate.objects.filter(language_id=language_id).aggregate(
+        highest=Max("position"))["highest"]
+    return 0 if highest is None else highest + 1
+
+
+def draw_drill_candidates(language_id, count=DRILL_QUESTIONS):
+    """Draw drill candidates
+
+    Pick up to `count` random candidates from the language's drill pool with
+    a single query.
+
+    Args:
+        language_id (int): The ID of the language
+        count (int): The number of candidates to pick
+
+    Returns:
+        list: The candidates, in a random order
+    """
+    size = get_pool_size(language_id)
+    positions = random.sample(range(size), min(count, size))
+    candidates = list(DrillCandidate.objects.filter(
+        language_id=language_id, position__in=positions))
+    random.shuffle(candidates)
+    return candidates
+
+
+def create_drill_session(user, count=DRILL_QUESTIONS):
+    """Create a drill session
+
+    Create a new conjugation session for the user, drilling the verbs of the
+    language that they're learning.
+
+    Args:
+        user (UserProfile): The user that the session is for
+        count (int): The number of questions to ask
+
+    Returns:
+        Session: The new session, or,
+        None: If there aren't any conjugations to drill for the language
+    """
+    candidates = draw_drill_candidates(user.language_being_learned_id, count)
+    if not candidates:
+        return None
+
+    with transaction.atomic():
+        session = Session.objects.create(
+            user=user, kind=Session.CONJUGATION, question_count=len(candidates),
+            claimed_on=timezone.now())
+        DrillQuestion.objects.bulk_create([
+            DrillQuestion(
+                session=session, form_id=candidate.form_id,
+                form_text=candidate.form_text, verb=candidate.verb,
+                mood=candidate.mood, tense=candidate.tense, person=candidate.person,
+                prompt=candidate.prompt, answer=candidate.answer)
+            for candidate in candidates
+        ])
+    return session
+
+
+def answer_drill_questions(questions, guesses):
+    """Answer drill questions
+
+    Grade the user's answers to a set of drill questions. Each answer is
+    compared directly against the expected form, ignoring its casing and any
+    surrounding whitespace.
+
+    Args:
+        questions (list): The drill questions
+        guesses (list): The user's answer to each of the questions
+
+    Returns:
+        list: The graded questions
+    """
+    mark_questions(questions, guesses, [
+        guess.strip().lower() == question.answer
+        for question, guess in zip(questions, guesses)
+    ])
+    return questions
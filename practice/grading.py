@@ -0,0 +1,51 @@
+"""Practice Grading
+
+The helpers used to grade the answers that users give to the practice
+questions.
+
+Answers are compared to the correct answers with RapidFuzz, whose C++
+implementation of the ratio is much faster than the pure Python one. Each
+answer is only compared to its own correct answer.
+"""
+from rapidfuzz import fuzz
+
+
+# The similarity, from 0 to 100, that an answer needs to be marked as correct
+CORRECT_RATIO = 85
+
+
+def grade_answers(guesses, correct_answers):
+    """Grade answers
+
+    Score each of the guesses against the correct answer at the same
+    position.
+
+    Args:
+        guesses (list): The answers that the user gave
+        correct_answers (list): The correct answers
+
+    Returns:
+        list: The similarity of each guess to its correct answer, from 0 to
+        100
+
+    Example:
+        A list of ratios is returned, in the same order as the guesses::
+
+            ratios = grade_answers(["ola"], ["olá"])
+    """
+    return [
+        int(round(fuzz.ratio(guess, correct_answer)))
+        for guess, correct_answer in zip(guesses, correct_answers)
+    ]
+
+
+def is_correct(ratio):
+    """Check if an answer is correct
+
+    Args:
+        ratio (int): The similarity of the answer to the correct answer
+
+    Returns:
+        bool: True if the answer is close enough to be marked as correct
+    """
+    return ratio >= CORRECT_RATIO
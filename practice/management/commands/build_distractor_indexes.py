@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from accounts.models import UserProfile
+from practice.distractors import build_distractor_index
+
+
+class Command(BaseCommand):
+
+    help = "Build the distractor index for the multiple choice questions of each user"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "users", nargs="*", type=int,
+            help="The IDs of the users to build the index for, defaults to all")
+
+    def handle(self, *args, **kwargs):
+        users = UserProfile.objects.filter(user__isnull=False).distinct()
+        if kwargs["users"]:
+            users = users.filter(id__in=kwargs["users"])
+
+        for user in users.iterator():
+            if build_distractor_index(user) is not None:
+                self.stdout.write(f"Built the distractor index for {user}")
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from languages.models import Language
+from practice.drills import build_drill_pool
+
+
+class Command(BaseCommand):
+
+    help = "Build the pool of conjugations that can be drilled for each language"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "languages", nargs="*",
+            help="The short codes of the languages to build, defaults to all")
+
+    def handle(self, *args, **kwargs):
+        languages = Language.objects.filter(verb__isnull=False).distinct()
+        if kwargs["languages"]:
+            languages = languages.filter(short_code__in=kwargs["languages"])
+
+        for language in languages:
+            size = build_drill_pool(language)
+            self.stdout.write(f"Built a pool of {size} conjugations for {language.name}")
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from practice.normalization import normalize_translation
+from translator.models import Translation
+
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+
+    help = "Store the normalized answer for each of the translations"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all", action="store_true",
+            help="Normalize every translation, rather than only the missing ones. "
+                 "Use this after changing PRACTICE_LEMMATIZE_ANSWERS")
+
+    def handle(self, *args, **kwargs):
+        translations = Translation.objects.only(
+            "id", "translated_text", "normalized_answer", "source_language")
+        if not kwargs["all"]:
+            translations = translations.filter(normalized_answer="")
+
+        batch = []
+        updated = 0
+        for translation in translations.iterator(chunk_size=BATCH_SIZE):
+            translation.normalized_answer = normalize_translation(translation)
+            batch.append(translation)
+            if len(batch) == BATCH_SIZE:
+                Translation.objects.bulk_update(batch, ["normalized_answer"])
+                updated += len(batch)
+                batch = []
+        Translation.objects.bulk_update(batch, ["normalized_answer"])
+        updated += len(batch)
+
+        self.stdout.write(f"Normalized the answers for {updated} translations")
@@ -0,0 +1,44 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from accounts.models import UserProfile
+from practice.models import Review, Session
+from practice.utils import POOL_SIZE, refill_session_pool
+from reading_sessions.models import ReadingSession
+
+
+class Command(BaseCommand):
+
+    help = "Prepare a pool of practice sessions for each of the active users"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "users", nargs="*", type=int,
+            help="The IDs of the users to refill the pools for, defaults to the active users")
+        parser.add_argument(
+            "--days", type=int, default=30,
+            help=(
+                "Users that have logged in, started a session, reviewed a translation "
+                "or read within this many days are active"))
+        parser.add_argument(
+            "--size", type=int, default=POOL_SIZE,
+            help="The number of sessions to keep ready for each user")
+
+    def handle(self, *args, **kwargs):
+        if kwargs["users"]:
+            users = UserProfile.objects.filter(id__in=kwargs["users"])
+        else:
+            active_since = timezone.now() - timedelta(days=kwargs["days"])
+            users = UserProfile.objects.filter(
+                Q(last_login__gte=active_since)
+                | Q(id__in=Session.objects.filter(
+                    claimed_on__gte=active_since).values("user_id"))
+                | Q(id__in=Review.objects.filter(
+                    last_reviewed_at__gte=active_since).values("user_id"))
+                | Q(id__in=ReadingSession.objects.filter(
+                    created_on__gte=active_since).values("library_item__user_id")))
+
+        for user in users.iterator():
+            sessions = refill_session_pool(user, kwargs["size"])
+            self.stdout.write(f"Prepared {len(sessions)} sessions for {user}")
@@ -0,0 +1,39 @@
+# Generated by Django 3.0.7 on 2026-10-19 15:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('translator', '0002_auto_20261019_1557'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('practice', '0006_auto_20200414_1325'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ease_factor', models.FloatField(default=2.5)),
+                ('interval', models.PositiveIntegerField(default=0)),
+                ('repetitions', models.PositiveIntegerField(default=0)),
+                ('due_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('translation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='translator.Translation')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', 'due_at'], name='practice_re_user_id_7546be_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('user', 'translation'), name='unique_review'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+"""
+Add the translations that existed before the reviews were introduced to the
+review schedule. They're due from when they were translated, so the oldest
+translations are practiced first.
+"""
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+
+def create_reviews(apps, schema_editor):
+    Translation = apps.get_model('translator', 'Translation')
+    Review = apps.get_model('practice', 'Review')
+
+    translations = Translation.objects.order_by('id').values_list(
+        'id', 'user_id', 'created_on')
+
+    reviews = []
+    for translation_id, user_id, created_on in translations.iterator():
+        reviews.append(Review(
+            translation_id=translation_id, user_id=user_id, due_at=created_on))
+        if len(reviews) == BATCH_SIZE:
+            Review.objects.bulk_create(reviews)
+            reviews = []
+    Review.objects.bulk_create(reviews)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practice', '0007_review'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_reviews, migrations.RunPython.noop),
+    ]
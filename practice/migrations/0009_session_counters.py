@@ -0,0 +1,27 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practice', '0008_create_reviews'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='correct_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='question_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['user', 'score'], name='practice_se_user_id_b3da07_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+"""
+Populate the question counters for the sessions that existed before the
+counters were introduced.
+"""
+from django.db import migrations
+from django.db.models import Count, Q
+
+
+BATCH_SIZE = 1000
+
+
+def count_session_questions(apps, schema_editor):
+    Session = apps.get_model('practice', 'Session')
+
+    sessions = Session.objects.annotate(
+        total=Count('question'),
+        correct=Count('question', filter=Q(question__correct=True)),
+    ).only('id')
+
+    updates = []
+    for session in sessions.iterator():
+        session.question_count = session.total
+        session.correct_count = session.correct
+        updates.append(session)
+        if len(updates) == BATCH_SIZE:
+            Session.objects.bulk_update(updates, ['question_count', 'correct_count'])
+            updates = []
+    Session.objects.bulk_update(updates, ['question_count', 'correct_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practice', '0009_session_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(count_session_questions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practice', '0010_count_session_questions'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['user', 'created_at'], name='practice_se_user_id_29bddb_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_auto_20200513_2000'),
+        ('practice', '0011_session_user_created_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DistractorIndex',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='distractor_index', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('translation_ids', models.BinaryField()),
+                ('neighbours', models.BinaryField()),
+                ('built_on', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='choices',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
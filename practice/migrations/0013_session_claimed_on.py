@@ -0,0 +1,22 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practice', '0012_distractorindex_question_choices'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='claimed_on',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['user', 'claimed_on'], name='practice_se_user_id_182b48_idx'),
+        ),
+    ]
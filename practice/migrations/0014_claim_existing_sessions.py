@@ -0,0 +1,22 @@
+"""
+Mark the sessions that existed before the session pools were introduced as
+claimed, as they have all been started.
+"""
+from django.db import migrations
+from django.db.models import F
+
+
+def claim_existing_sessions(apps, schema_editor):
+    Session = apps.get_model('practice', 'Session')
+    Session.objects.filter(claimed_on__isnull=True).update(claimed_on=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practice', '0013_session_claimed_on'),
+    ]
+
+    operations = [
+        migrations.RunPython(claim_existing_sessions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lemmatizer', '0005_conjugationtable'),
+        ('languages', '0002_language_short_code'),
+        ('practice', '0014_claim_existing_sessions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='kind',
+            field=models.CharField(choices=[('translation', 'Translation'), ('conjugation', 'Conjugation')], default='translation', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='DrillQuestion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('verb', models.CharField(max_length=50)),
+                ('mood', models.CharField(max_length=50)),
+                ('tense', models.CharField(max_length=50)),
+                ('person', models.PositiveSmallIntegerField()),
+                ('prompt', models.CharField(max_length=50)),
+                ('answer', models.CharField(max_length=50)),
+                ('answer_provided', models.CharField(blank=True, max_length=50, null=True)),
+                ('correct', models.BooleanField(blank=True, null=True)),
+                ('form', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='lemmatizer.Form')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='drill_questions', to='practice.Session')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='DrillCandidate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('verb', models.CharField(max_length=50)),
+                ('mood', models.CharField(max_length=50)),
+                ('tense', models.CharField(max_length=50)),
+                ('person', models.PositiveSmallIntegerField()),
+                ('prompt', models.CharField(max_length=50)),
+                ('answer', models.CharField(max_length=50)),
+                ('position', models.PositiveIntegerField()),
+                ('form', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='lemmatizer.Form')),
+                ('language', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='languages.Language')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='drillcandidate',
+            constraint=models.UniqueConstraint(fields=('language', 'position'), name='unique_drill_position'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+"""
+Keep the drill questions and candidates when the lemmatizer's forms are
+deleted by a new import, copying the text of each form onto the row, and let
+drill answers be as long as the answers to the other questions.
+"""
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def copy_form_text(apps, schema_editor):
+    Form = apps.get_model('lemmatizer', 'Form')
+    form_text = Subquery(Form.objects.filter(id=OuterRef('form_id')).values('form')[:1])
+    for model_name in ('DrillCandidate', 'DrillQuestion'):
+        model = apps.get_model('practice', model_name)
+        model.objects.update(form_text=form_text)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lemmatizer', '0005_conjugationtable'),
+        ('practice', '0015_conjugation_drills'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drillcandidate',
+            name='form_text',
+            field=models.CharField(default='', max_length=50),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='drillquestion',
+            name='form_text',
+            field=models.CharField(default='', max_length=50),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_form_text, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='drillcandidate',
+            name='form',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='lemmatizer.Form'),
+        ),
+        migrations.AlterField(
+            model_name='drillquestion',
+            name='form',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='lemmatizer.Form'),
+        ),
+        migrations.AlterField(
+            model_name='drillquestion',
+            name='answer_provided',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+    ]
@@ -1,21 +1,167 @@
 from django.db import models
+from django.utils import timezone
 from accounts.models import UserProfile
+from languages.models import Language
+from lemmatizer.models import Form
 from translator.models import Translation
 
 
-class Session(models.Model): 
+class Session(models.Model):
+    """Session Model
+
+    A practice session. The `question_count` and `correct_count` are kept up
+    to date as the questions are answered, so the `score` can be calculated
+    without counting the questions when the session is finished.
+
+    Sessions that are prepared ahead of time sit in the user's session pool
+    until they're started, and `claimed_on` stays empty until then, see
+    `practice.utils.claim_session`.
+
+    Translation sessions ask about the user's translations, with a `Question`
+    for each, and conjugation sessions drill the forms of verbs, with a
+    `DrillQuestion` for each.
+    """
+
+    TRANSLATION = "translation"
+    CONJUGATION = "conjugation"
+    KINDS = ((TRANSLATION, "Translation"), (CONJUGATION, "Conjugation"))
 
     user = models.ForeignKey(UserProfile, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=KINDS, default=TRANSLATION)
     created_at = models.DateTimeField(auto_now_add=True)
     duration = models.DurationField(null=True, blank=True)
     score = models.IntegerField(null=True, blank=True)
+    question_count = models.PositiveIntegerField(default=0)
+    correct_count = models.PositiveIntegerField(default=0)
+    claimed_on = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "score"]),
+            models.Index(fields=["user", "created_at"]),
+            models.Index(fields=["user", "claimed_on"]),
+        ]
 
 
 class Question(models.Model):
+    """Question Model
+
+    A question about one of the user's translations. Multiple choice
+    questions store their options as a JSON encoded list in `choices`, which
+    is left blank for free text questions.
+    """
 
     translation = models.ForeignKey(Translation, on_delete=models.CASCADE)
     session = models.ForeignKey(Session, on_delete=models.CASCADE)
     answer_provided = models.CharField(max_length=100, null=True, blank=True)
     correct = models.BooleanField(null=True, blank=True)
-    
-    
\ No newline at end of file
+    choices = models.TextField(blank=True, default="")
+
+
+class Review(models.Model):
+    """Review Model
+
+    The spaced repetition schedule for one of the user's translations, using
+    the SM-2 algorithm. A review is created for each new translation, and is
+    rescheduled each time the user answers a question about the translation.
+
+    The `interval` is the number of days until the translation is due again,
+    and the `ease_factor` controls how quickly the interval grows.
+    """
+
+    user = models.ForeignKey(UserProfile, on_delete=models.CASCADE)
+    translation = models.ForeignKey(Translation, on_delete=models.CASCADE)
+    ease_factor = models.FloatField(default=2.5)
+    interval = models.PositiveIntegerField(default=0)
+    repetitions = models.PositiveIntegerField(default=0)
+    due_at = models.DateTimeField(default=timezone.now)
+    last_reviewed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "translation"], name="unique_review")
+        ]
+        indexes = [models.Index(fields=["user", "due_at"])]
+
+
+class DistractorIndex(models.Model):
+    """Distractor Index Model
+
+    The nearest neighbours of each of the user's translations, used to pick
+    the wrong options for multiple choice questions, see
+    `practice.distractors`.
+
+    `translation_ids` holds the sorted IDs of the translations that were
+    indexed as 64 bit integers, and `neighbours` holds the sparse similarity
+    matrix in the `scipy.sparse.save_npz` format, with a row and a column for
+    each of those translations.
+    """
+
+    user = models.OneToOneField(
+        UserProfile, on_delete=models.CASCADE, primary_key=True,
+        related_name="distractor_index")
+    translation_ids = models.BinaryField()
+    neighbours = models.BinaryField()
+    built_on = models.DateTimeField(auto_now=True)
+
+
+class Conjugation(models.Model):
+    """Conjugation Model
+
+    The details of a form that are needed to ask for it in a conjugation
+    drill, copied from the lemmatizer so a drill can be put together without
+    joining the forms to their verbs, tenses and moods.
+
+    The `prompt` is the form with the inflected word replaced by a blank,
+    e.g. `que eu ___`, and the `answer` is the lowercased inflected word. The
+    `form_text` is the form as it was when it was copied, so the `form` is
+    only cleared, rather than the row being deleted, when the lemmatizer's
+    form is removed by a new import.
+    """
+
+    form = models.ForeignKey(
+        Form, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    form_text = models.CharField(max_length=50)
+    verb = models.CharField(max_length=50)
+    mood = models.CharField(max_length=50)
+    tense = models.CharField(max_length=50)
+    person = models.PositiveSmallIntegerField()
+    prompt = models.CharField(max_length=50)
+    answer = models.CharField(max_length=50)
+
+    class Meta:
+        abstract = True
+
+
+class DrillCandidate(Conjugation):
+    """Drill Candidate Model
+
+    A form in a language's pool of conjugations that can be drilled. The
+    pool is rebuilt by the `build_drill_pools` management command and after
+    the conjugations are imported, and the candidates are numbered from 0
+    with no gaps, so that the candidates for a drill can be picked at random
+    and fetched by their positions, see `practice.drills`.
+    """
+
+    language = models.ForeignKey(Language, on_delete=models.CASCADE)
+    position = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["language", "position"], name="unique_drill_position")
+        ]
+
+
+class DrillQuestion(Conjugation):
+    """Drill Question Model
+
+    A question in a conjugation session, asking for the form of a verb for
+    the given tense, mood and person.
+    """
+
+    session = models.ForeignKey(
+        Session, on_delete=models.CASCADE, related_name="drill_questions")
+    answer_provided = models.CharField(max_length=100, null=True, blank=True)
+    correct = models.BooleanField(null=True, blank=True)
@@ -0,0 +1,99 @@
+"""Practice Answer Normalization
+
+The helpers used to reduce the answers to the practice questions to a common
+form before they are graded, so that casing, accents, punctuation and
+articles don't count against the user.
+
+The correct answer is normalized once, when its translation is saved, and
+stored in `Translation.normalized_answer`, so only the user's guess needs to
+be normalized when a question is answered. Guesses are cached, as the same
+short answers are typed over and over again.
+
+The answers are written in the language that the user is learning, which is
+the translation's `source_language`, as the translator asks for the text to
+be translated into that language. Only the ID of the language is needed, the
+languages themselves are read once per process and cached.
+
+Where a form table has been exported for the language, each word can also be
+replaced by its lemma, so that `I spoke` and `I speak` are graded as the same
+answer. This is controlled by the `PRACTICE_LEMMATIZE_ANSWERS` setting.
+"""
+import re
+from functools import lru_cache
+from django.conf import settings
+from languages.models import Language
+from lemmatizer.form_tables import get_form_table
+from lemmatizer.normalization import fold_accents
+
+
+WORD_PATTERN = re.compile(r"\w+(?:[-']\w+)*")
+
+# The articles that are ignored when grading, by the language's short code
+STOPWORDS = {
+    "en": {"a", "an", "the"},
+    "pt": {"o", "a", "os", "as", "um", "uma", "uns", "umas"},
+    "es": {"el", "la", "los", "las", "un", "una", "unos", "unas"},
+    "de": {
+        "der", "die", "das", "den", "dem", "des",
+        "ein", "eine", "einen", "einem", "einer", "eines",
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def _get_language(language_id):
+    return Language.objects.only("id", "short_code").get(id=language_id)
+
+
+def _get_lemma(word, language):
+    form_table = get_form_table(language)
+    if form_table is None:
+        return word
+    lemmas = form_table.get(word)
+    return lemmas[0] if lemmas else word
+
+
+@lru_cache(maxsize=4096)
+def normalize_answer(text, language_id=None, lemmatize=False):
+    """Normalize an answer
+
+    Casefold the answer, strip its punctuation and articles, optionally
+    replace each word with its lemma and then remove the accents. If the
+    answer is made up of nothing but articles, they are kept.
+
+    Args:
+        text (str): The answer that should be normalized
+        language_id (int): The ID of the language that the answer is written in
+        lemmatize (bool): Whether the words should be replaced by their lemmas
+
+    Returns:
+        str: The normalized answer
+
+    Example:
+        Both of these will return `cafe`::
+
+            normalize_answer("O café!", portuguese.id)
+            normalize_answer("cafe", portuguese.id)
+    """
+    language = _get_language(language_id) if language_id else None
+    words = WORD_PATTERN.findall(text.casefold())
+    stopwords = STOPWORDS.get(language.short_code, set()) if language else set()
+    words = [word for word in words if word not in stopwords] or words
+    if lemmatize and language is not None:
+        words = [_get_lemma(word, language) for word in words]
+    return fold_accents(" ".join(words))
+
+
+def normalize_translation(translation):
+    """Normalize a translation
+
+    Args:
+        translation (Translation): The translation with the correct answer,
+        its language doesn't need to be loaded
+
+    Returns:
+        str: The normalized version of the translated text
+    """
+    return normalize_answer(
+        translation.translated_text, translation.source_language_id,
+        settings.PRACTICE_LEMMATIZE_ANSWERS)
@@ -0,0 +1,24 @@
+from rest_framework.pagination import CursorPagination
+
+
+class SessionCursorPagination(CursorPagination):
+    """
+    Paginates the practice session history with a cursor, so each page is
+    read from the `(user, ...)` indexes rather than counting and skipping over
+    all of the user's earlier sessions. The sessions are listed by when they
+    were started, as pooled sessions are created ahead of time
+    """
+
+    ordering = ("-claimed_on", "-id")
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = (ordering, "-id")
+
+
+class QuestionCursorPagination(CursorPagination):
+    """
+    Paginates the questions that the user has been asked, newest first
+    """
+
+    ordering = "-id"
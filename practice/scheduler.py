@@ -0,0 +1,75 @@
+"""Practice Scheduler
+
+The spaced repetition scheduler for the practice sessions, based on the SM-2
+algorithm.
+
+Each answer is given a quality from 0 to 5, based on how close the answer was
+to the correct answer. Answers with a quality of 3 or more are treated as
+correct, and the interval before the translation is asked again grows with
+each correct answer. Incorrect answers reset the interval, so the translation
+is asked again the next day.
+"""
+from datetime import timedelta
+from django.utils import timezone
+
+
+MINIMUM_EASE_FACTOR = 1.3
+
+
+def get_quality(ratio):
+    """Get the quality of an answer
+
+    Args:
+        ratio (int): The similarity of the answer to the correct answer, from
+        0 to 100
+
+    Returns:
+        int: The SM-2 quality of the answer, from 0 to 5
+    """
+    if ratio >= 100:
+        return 5
+    if ratio >= 85:
+        return 4
+    if ratio >= 60:
+        return 2
+    if ratio >= 30:
+        return 1
+    return 0
+
+
+def schedule_review(review, quality, now=None):
+    """Schedule a review
+
+    Update the review's schedule after the user has answered a question about
+    its translation. The review isn't saved.
+
+    Args:
+        review (Review): The review that should be rescheduled
+        quality (int): The SM-2 quality of the answer, from 0 to 5
+        now (datetime): The time that the question was answered, defaults to
+        the current time
+
+    Returns:
+        Review: The rescheduled review
+    """
+    now = now or timezone.now()
+
+    if quality < 3:
+        review.repetitions = 0
+        review.interval = 1
+    else:
+        if review.repetitions == 0:
+            review.interval = 1
+        elif review.repetitions == 1:
+            review.interval = 6
+        else:
+            review.interval = round(review.interval * review.ease_factor)
+        review.repetitions += 1
+
+    review.ease_factor = max(
+        MINIMUM_EASE_FACTOR,
+        review.ease_factor + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    )
+    review.due_at = now + timedelta(days=review.interval)
+    review.last_reviewed_at = now
+    return review
@@ -1,20 +1,43 @@
+import json
 from rest_framework import serializers
-from .models import Question, Session
+from .models import DrillQuestion, Question, Session
+from .drills import DRILL_QUESTIONS
+from .utils import REVIEW, SESSION_MODES
 from translator.serializers import TranslationSerializer
 
 
+class NewSessionSerializer(serializers.Serializer):
+    """
+    The serializer used to deserialise the options for a new session. By
+    default the session asks free text questions about the translations that
+    are due for review
+    """
+
+    mode = serializers.ChoiceField(
+        choices=SESSION_MODES, default=REVIEW, required=False)
+    multiple_choice = serializers.BooleanField(default=False, required=False)
+
+
 class QuestionSerializer(serializers.ModelSerializer):
 
     translation = TranslationSerializer(read_only=True)
     correct = serializers.BooleanField(read_only=True)
     correct_answer = serializers.SerializerMethodField(read_only=True)
 
+    choices = serializers.SerializerMethodField(read_only=True)
+
     def get_correct_answer(self, obj):
        return obj.translation.translated_text
 
+    def get_choices(self, obj):
+        return json.loads(obj.choices) if obj.choices else []
+
     class Meta:
         model = Question
-        fields = ["id", "answer_provided", "correct", "translation", "correct_answer"]
+        fields = [
+            "id", "answer_provided", "correct", "translation", "correct_answer",
+            "choices"
+        ]
 
 
 class SessionSerializer(serializers.ModelSerializer):
@@ -23,4 +46,100 @@ class SessionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Session
-        fields = ["id", "user", "duration", "score", "question_set"]
\ No newline at end of file
+        fields = [
+            "id", "user", "kind", "duration", "score", "question_count",
+            "correct_count", "question_set"
+        ]
+        read_only_fields = ["kind", "question_count", "correct_count"]
+
+
+class SessionSummarySerializer(serializers.ModelSerializer):
+    """
+    The serializer used to list the practice session history without the
+    questions that were asked in each session
+    """
+
+    class Meta:
+        model = Session
+        fields = [
+            "id", "user", "kind", "created_at", "claimed_on", "duration", "score",
+            "question_count", "correct_count"
+        ]
+        read_only_fields = fields
+
+
+class NewDrillSerializer(serializers.Serializer):
+    """
+    The serializer used to deserialise the options for a new conjugation
+    drill
+    """
+
+    count = serializers.IntegerField(
+        default=DRILL_QUESTIONS, required=False, min_value=1, max_value=50)
+
+
+class DrillQuestionSerializer(serializers.ModelSerializer):
+
+    correct = serializers.BooleanField(read_only=True)
+    correct_answer = serializers.CharField(source="answer", read_only=True)
+
+    class Meta:
+        model = DrillQuestion
+        fields = [
+            "id", "verb", "mood", "tense", "person", "prompt", "answer_provided",
+            "correct", "correct_answer"
+        ]
+
+
+class DrillSessionSerializer(serializers.ModelSerializer):
+
+    drill_questions = DrillQuestionSerializer(read_only=True, many=True)
+
+    class Meta:
+        model = Session
+        fields = [
+            "id", "user", "kind", "duration", "score", "question_count",
+            "correct_count", "drill_questions"
+        ]
+        read_only_fields = fields
+
+
+class SessionFilterSerializer(serializers.Serializer):
+    """
+    The serializer used to deserialise the query parameters that filter and
+    order the practice session history. The questions for each session are
+    only included when `detail` is set
+    """
+
+    ORDERING_CHOICES = (
+        "score", "-score", "created_at", "-created_at", "claimed_on", "-claimed_on")
+
+    min_score = serializers.IntegerField(required=False, min_value=0, max_value=100)
+    max_score = serializers.IntegerField(required=False, min_value=0, max_value=100)
+    ordering = serializers.ChoiceField(choices=ORDERING_CHOICES, required=False)
+    detail = serializers.BooleanField(default=False, required=False)
+
+
+class AnswerSerializer(serializers.Serializer):
+
+    question = serializers.IntegerField()
+    guess = serializers.CharField(max_length=100, allow_blank=True)
+
+
+class AnswersSerializer(serializers.Serializer):
+    """
+    The serializer used to deserialise all of the answers for a session. No
+    session has more questions than a drill can have, so longer lists of
+    answers are rejected before any of them are graded.
+    """
+
+    MAX_ANSWERS = 50
+
+    answers = AnswerSerializer(many=True, allow_empty=False)
+
+    def validate_answers(self, value):
+        # `ListSerializer` doesn't take a `max_length` in this version of DRF
+        if len(value) > self.MAX_ANSWERS:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {self.MAX_ANSWERS} elements.")
+        return value
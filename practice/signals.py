@@ -0,0 +1,23 @@
+"""Practice Signals
+
+Every new translation is added to the user's review schedule, so it's due to
+be practiced straight away, and its correct answer is normalized whenever it
+is saved, so that it doesn't need to be normalized each time it's graded.
+"""
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+from practice.models import Review
+from practice.normalization import normalize_translation
+from translator.models import Translation
+
+
+@receiver(post_save, sender=Translation)
+def create_review(sender, instance, created, **kwargs):
+    if created:
+        Review.objects.create(user_id=instance.user_id, translation=instance)
+
+
+@receiver(pre_save, sender=Translation)
+def normalize_translated_text(sender, instance, raw, **kwargs):
+    if not raw:
+        instance.normalized_answer = normalize_translation(instance)
@@ -1,3 +1,790 @@
-from django.test import TestCase
+"""
+The test cases for the practice API. This test suite should test for the
+following test cases:
 
-# Create your tests here.
+    - A user cannot start a practice session if they are not logged in
+    - A practice session asks questions about the user's own translations
+    - A user with fewer translations than the number of questions can still
+        practice, and a user with no translations receives an error
+    - Starting a session doesn't get more expensive as the user translates
+        more text
+    - Random samples are topped up with random translations when the
+        random points pick the same translation twice
+    - Sessions ask about the translations that are due for review first, and
+        answering a question reschedules its translation
+    - A user can only answer the questions from their own sessions, and
+        answers without a valid guess are rejected
+    - All of the answers for a session can be graded in a single request,
+        up to the most questions that a session can have
+    - A session's score is calculated from its stored counters, only the
+        session's user can finish it, and the session history can be filtered
+        and ordered by score
+    - The session history and questions only include the user's own, are
+        paginated and are listed with a fixed number of queries
+    - Answers are graded after their casing, accents, punctuation and
+        articles have been normalized, optionally down to their lemmas
+    - Multiple choice questions offer the user's most similar translations
+        as the wrong options, from a precomputed index
+    - Review sessions are claimed from a pool of sessions that were prepared
+        ahead of time for the recently active users, unless the due queue has
+        changed since, unclaimed sessions can't be answered or finished and
+        are left out of the history, which is ordered by when the sessions
+        were claimed
+    - Conjugation drills are drawn from a precomputed pool of forms for the
+        language that the user is learning, and graded against the forms
+    - Importing the conjugations doesn't delete the drill questions that
+        have already been asked
+"""
+import random
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import UserProfile
+from books.models import Book
+from languages.models import Language
+from library.models import LibraryBook
+from reading_sessions.models import ReadingSession
+from lemmatizer.form_tables import (
+    close_form_tables, get_form_table_path, write_form_table)
+from lemmatizer.importer import import_conjugations
+from lemmatizer.models import Form, Mood, Tense, Verb
+from translator.models import Translation
+from practice.distractors import build_distractor_index, get_distractor_ids
+from practice.drills import build_drill_pool, get_pool_size, get_prompt
+from practice.models import DistractorIndex, DrillQuestion, Question, Review, Session
+from practice.normalization import normalize_answer
+from practice.serializers import AnswersSerializer
+from practice.utils import claim_session, refill_session_pool, sample_translation_ids
+
+
+class PracticeTests(APITestCase):
+    """
+    The test cases for the practice sessions and questions
+    """
+    fixtures = ['fixtures.json']
+
+    def setUp(self):
+        """
+        Create a reading session that the translations can be tied to
+        """
+        self.user = UserProfile.objects.get(email="aaronsnig@gmail.com")
+        self.portuguese = Language.objects.get(name="Brazilian Portuguese")
+        self.english = Language.objects.get(name="English")
+
+        book = Book.objects.create(
+            title="Harry Potter", author="JK Rowling", language=self.portuguese)
+        library_item = LibraryBook.objects.create(user=self.user, book=book)
+        self.reading_session = ReadingSession.objects.create(
+            library_item=library_item, duration=timedelta(minutes=5), pages=2)
+
+    def _create_translations(self, count, user=None):
+        """
+        A helper method used to create translations for the tests
+        """
+        return [
+            Translation.objects.create(
+                user=user or self.user, source_text=f"texto {number}",
+                translated_text=f"text {number}", audio_file_path="",
+                source_language=self.portuguese, target_language=self.english,
+                session=self.reading_session)
+            for number in range(count)
+        ]
+
+    def test_that_a_non_logged_in_user_cant_start_a_session(self):
+        """
+        A client that isn't authenticated will receive a 401
+        """
+        url = reverse("session")
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_that_a_session_asks_about_the_users_translations(self):
+        """
+        A new session has five questions about five different translations
+        that belong to the user
+        """
+        other_user = UserProfile.objects.create_user(
+            username="other", email="other@example.com", password="password")
+        self._create_translations(20)
+        self._create_translations(20, user=other_user)
+        url = reverse("session")
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        questions = Question.objects.filter(session_id=response.data["id"])
+        self.assertEqual(questions.count(), 5)
+        self.assertEqual(
+            len({question.translation_id for question in questions}), 5)
+        self.assertFalse(questions.exclude(translation__user=self.user).exists())
+
+    def test_that_a_small_pool_of_translations_can_be_practiced(self):
+        """
+        A user with fewer than five translations gets a question for each
+        """
+        self._create_translations(3)
+        url = reverse("session")
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["question_set"]), 3)
+
+    def test_that_a_user_without_translations_cant_start_a_session(self):
+        """
+        A user with no translations receives an error and no session is made
+        """
+        url = reverse("session")
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Session.objects.exists())
+
+    def test_that_starting_a_session_doesnt_load_every_translation(self):
+        """
+        The number of queries needed to start a session doesn't depend on the
+        number of translations that the user has
+        """
+        url = reverse("session")
+        self._create_translations(500)
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNumQueries(8):
+            response = self.client.post(url)
+        self.assertEqual(len(response.data["question_set"]), 5)
+
+        # Two queries for the bounds and one for each random point, which
+        # depends on the points that are picked, so the seed is fixed
+        random.seed(0)
+        with self.assertNumQueries(13):
+            response = self.client.post(url, {"mode": "random"}, format="json")
+        self.assertEqual(len(response.data["question_set"]), 5)
+
+    def test_that_a_dense_sample_is_topped_up_with_random_translations(self):
+        """
+        Sampling nearly all of the translations still picks enough distinct
+        translations, and doesn't always leave out the same one
+        """
+        ids = [translation.id for translation in self._create_translations(6)]
+        translations = Translation.objects.filter(user=self.user)
+
+        left_out = set()
+        for seed in range(20):
+            random.seed(seed)
+            sample = sample_translation_ids(translations, 5)
+            self.assertEqual(len(set(sample)), 5)
+            left_out.update(set(ids) - set(sample))
+        self.assertGreater(len(left_out), 1)
+
+    def test_that_the_most_overdue_translations_are_asked_first(self):
+        """
+        A session asks about the translations that have been due the longest
+        """
+        translations = self._create_translations(8)
+        for days, translation in enumerate(translations[:5], start=1):
+            Review.objects.filter(translation=translation).update(
+                due_at=timezone.now() + timedelta(days=days))
+        url = reverse("session")
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(url)
+
+        self.assertEqual(
+            {question["translation"]["id"] for question in response.data["question_set"]},
+            {translation.id for translation in translations[5:]} | {
+                translation.id for translation in translations[:2]}
+        )
+
+    def test_that_answering_a_question_reschedules_the_translation(self):
+        """
+        A correct answer pushes the translation back, and an incorrect answer
+        makes it due again the next day. Changing an answer doesn't count as
+        another review
+        """
+        translation = self._create_translations(1)[0]
+        self.client.force_authenticate(user=self.user)
+
+        def answer(guess):
+            session = self.client.post(reverse("session")).data
+            url = reverse(
+                "answer-question", kwargs={"pk": session["question_set"][0]["id"]})
+            self.client.put(url, {"guess": guess}, format="json")
+            return url
+
+        url = answer("text 0")
+        self.client.put(url, {"guess": "text 0"}, format="json")
+        review = Review.objects.get(translation=translation)
+        self.assertEqual((review.repetitions, review.interval), (1, 1))
+
+        answer("text 0")
+        review.refresh_from_db()
+        self.assertEqual((review.repetitions, review.interval), (2, 6))
+        self.assertGreater(review.due_at, timezone.now() + timedelta(days=5))
+
+        answer("something else")
+        review.refresh_from_db()
+        self.assertEqual((review.repetitions, review.interval), (0, 1))
+        self.assertLess(review.ease_factor, 2.5)
+
+    def test_that_a_user_cant_answer_another_users_question(self):
+        """
+        Questions from other users' sessions, and unknown questions, return a
+        404 without grading anything
+        """
+        other_user = UserProfile.objects.create_user(
+            email="other@example.com", username="other", password="password")
+        self._create_translations(1, user=other_user)
+        self.client.force_authenticate(user=other_user)
+        question_id = self.client.post(reverse("session")).data["question_set"][0]["id"]
+
+        self.client.force_authenticate(user=self.user)
+        for pk in (question_id, 9999):
+            response = self.client.put(
+                reverse("answer-question", kwargs={"pk": pk}),
+                {"guess": "text 0"}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.assertIsNone(Question.objects.get(id=question_id).correct)
+        self.assertFalse(Review.objects.filter(user=self.user).exists())
+
+    def test_that_an_answer_without_a_guess_is_rejected(self):
+        """
+        Answering a question without a guess, or with one that's too long,
+        returns a 400 without grading the question
+        """
+        self._create_translations(1)
+        self.client.force_authenticate(user=self.user)
+        question_id = self.client.post(reverse("session")).data["question_set"][0]["id"]
+        url = reverse("answer-question", kwargs={"pk": question_id})
+
+        for data in ({}, {"guess": "a" * 101}):
+            response = self.client.put(url, data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("guess", response.data)
+
+        self.assertIsNone(Question.objects.get(id=question_id).correct)
+
+    def test_that_all_of_a_sessions_answers_can_be_graded_together(self):
+        """
+        The answers are graded, and the questions and reviews are written,
+        with a fixed number of queries
+        """
+        self._create_translations(5)
+        self.client.force_authenticate(user=self.user)
+        session = self.client.post(reverse("session")).data
+        url = reverse("session-answers", kwargs={"pk": session["id"]})
+
+        answers = [
+            {
+                "question": question["id"],
+                "guess": question["correct_answer"] if number % 2 else "wrong",
+            }
+            for number, question in enumerate(session["question_set"])
+        ]
+        with self.assertNumQueries(6):
+            response = self.client.post(url, {"answers": answers}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            Question.objects.filter(session_id=session["id"], correct=True).count(), 2)
+        self.assertEqual(
+            Review.objects.filter(user=self.user, repetitions=1).count(), 2)
+
+    def test_that_answers_must_belong_to_the_session(self):
+        """
+        Questions from another session can't be answered
+        """
+        self._create_translations(2)
+        self.client.force_authenticate(user=self.user)
+        first_session = self.client.post(reverse("session")).data
+        second_session = self.client.post(reverse("session")).data
+        url = reverse("session-answers", kwargs={"pk": second_session["id"]})
+
+        answers = [
+            {"question": first_session["question_set"][0]["id"], "guess": "text"}]
+        response = self.client.post(url, {"answers": answers}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_that_too_many_answers_are_rejected(self):
+        """
+        A request with more answers than any session can have is rejected
+        before the answers are graded
+        """
+        self._create_translations(1)
+        self.client.force_authenticate(user=self.user)
+        session = self.client.post(reverse("session")).data
+        url = reverse("session-answers", kwargs={"pk": session["id"]})
+
+        answers = [
+            {"question": session["question_set"][0]["id"], "guess": "text"}
+        ] * (AnswersSerializer.MAX_ANSWERS + 1)
+        response = self.client.post(url, {"answers": answers}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("answers", response.data)
+
+    def test_that_finishing_a_session_scores_it_from_its_counters(self):
+        """
+        Re-answering a question doesn't count it twice, and the score is
+        calculated with a single update
+        """
+        self._create_translations(4)
+        self.client.force_authenticate(user=self.user)
+        session = self.client.post(reverse("session")).data
+        self.assertEqual(session["question_count"], 4)
+
+        question = session["question_set"][0]
+        url = reverse("answer-question", kwargs={"pk": question["id"]})
+        self.client.put(url, {"guess": question["correct_answer"]}, format="json")
+        self.client.put(url, {"guess": question["correct_answer"]}, format="json")
+        self.assertEqual(Session.objects.get(id=session["id"]).correct_count, 1)
+
+        url = reverse("session-update", kwargs={"pk": session["id"]})
+        with self.assertNumQueries(6):
+            response = self.client.put(url, {"duration": "00:02:30"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["score"], 25)
+        self.assertEqual(response.data["duration"], "00:02:30")
+
+    def test_that_a_user_cant_finish_another_users_session(self):
+        """
+        Finishing another user's session returns a 404 without changing it
+        """
+        other_user = UserProfile.objects.create_user(
+            email="other@example.com", username="other", password="password")
+        session = Session.objects.create(user=other_user, claimed_on=timezone.now())
+        self.client.force_authenticate(user=self.user)
+
+        url = reverse("session-update", kwargs={"pk": session.id})
+        response = self.client.put(url, {"duration": "00:02:30"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        session.refresh_from_db()
+        self.assertIsNone(session.duration)
+
+    def test_that_sessions_can_be_filtered_and_ordered_by_score(self):
+        """
+        The session history can be limited to a range of scores
+        """
+        scores = [20, 90, 60]
+        for score in scores:
+            Session.objects.create(user=self.user, score=score, claimed_on=timezone.now())
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(
+            reverse("session"), {"min_score": 50, "ordering": "-score"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [session["score"] for session in response.data["results"]], [90, 60])
+
+    def test_that_the_session_history_only_includes_the_users_sessions(self):
+        """
+        Other users' sessions are left out, and the history is paginated
+        """
+        other_user = UserProfile.objects.create_user(
+            email="other@example.com", username="other", password="password")
+        Session.objects.create(user=other_user, claimed_on=timezone.now())
+        for _ in range(12):
+            Session.objects.create(user=self.user, claimed_on=timezone.now())
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(reverse("session"))
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertNotIn("question_set", response.data["results"][0])
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNone(response.data["next"])
+
+    def test_that_the_detailed_session_history_uses_a_fixed_number_of_queries(self):
+        """
+        The questions and translations for a whole page are prefetched
+        """
+        self._create_translations(5)
+        self.client.force_authenticate(user=self.user)
+        for _ in range(3):
+            self.client.post(reverse("session"))
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("session"), {"detail": "true"})
+
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(len(response.data["results"][0]["question_set"]), 5)
+
+    def test_that_only_the_users_questions_are_listed(self):
+        """
+        Questions from other users' sessions aren't listed
+        """
+        other_user = UserProfile.objects.create_user(
+            email="other@example.com", username="other", password="password")
+        self._create_translations(2)
+        self._create_translations(2, user=other_user)
+        self.client.force_authenticate(user=other_user)
+        self.client.post(reverse("session"))
+        self.client.force_authenticate(user=self.user)
+        self.client.post(reverse("session"))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("question"))
+
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(
+            {question["translation"]["user"] for question in response.data["results"]},
+            {self.user.id})
+
+    def test_that_answers_are_normalized_before_they_are_graded(self):
+        """
+        Casing, accents, punctuation and articles don't affect the grade, and
+        the articles are those of the language that the answer is written in
+        """
+        translation = self._create_translations(1)[0]
+        translation.translated_text = "O café, por favor!"
+        translation.save()
+        self.assertEqual(translation.normalized_answer, "cafe por favor")
+
+        self.client.force_authenticate(user=self.user)
+        session = self.client.post(reverse("session")).data
+        url = reverse("answer-question", kwargs={"pk": session["question_set"][0]["id"]})
+        response = self.client.put(url, {"guess": "cafe por favor"}, format="json")
+
+        self.assertTrue(response.data["correct"])
+
+    def test_that_missing_normalized_answers_can_be_backfilled(self):
+        """
+        Translations that were saved before answers were normalized are
+        normalized by the `normalize_answers` command
+        """
+        translation = self._create_translations(1)[0]
+        Translation.objects.filter(id=translation.id).update(
+            translated_text="Uma Maçã", normalized_answer="")
+
+        call_command("normalize_answers", stdout=StringIO())
+
+        translation.refresh_from_db()
+        self.assertEqual(translation.normalized_answer, "maca")
+
+    @override_settings(PRACTICE_LEMMATIZE_ANSWERS=True)
+    def test_that_answers_can_be_reduced_to_their_lemmas(self):
+        """
+        Each word of a translation's answer is replaced by its lemma when a
+        form table has been exported for the language that the answer is
+        written in, without loading the language
+        """
+        close_form_tables()
+        self.addCleanup(close_form_tables)
+        normalize_answer.cache_clear()
+        self.addCleanup(normalize_answer.cache_clear)
+        with tempfile.TemporaryDirectory() as table_dir:
+            with override_settings(LEMMATIZER_TABLE_DIR=table_dir):
+                write_form_table(
+                    get_form_table_path(self.portuguese),
+                    {"falou": ["falar"], "falo": ["falar"]})
+
+                translation = Translation.objects.get(id=self._create_translations(1)[0].id)
+                translation.translated_text = "Ele falou!"
+                translation.save()
+                self.assertEqual(translation.normalized_answer, "ele falar")
+                self.assertFalse(Translation.source_language.is_cached(translation))
+
+                self.client.force_authenticate(user=self.user)
+                session = self.client.post(reverse("session")).data
+                url = reverse(
+                    "answer-question", kwargs={"pk": session["question_set"][0]["id"]})
+                response = self.client.put(url, {"guess": "ele falo"}, format="json")
+                self.assertTrue(response.data["correct"])
+                close_form_tables()
+
+    def _create_answers(self, answers):
+        """
+        A helper method used to create translations with the given answers
+        """
+        translations = self._create_translations(len(answers))
+        for translation, answer in zip(translations, answers):
+            translation.translated_text = answer
+            translation.save()
+        return translations
+
+    def test_that_distractors_are_the_most_similar_translations(self):
+        """
+        The nearest neighbours are stored for each translation, skipping any
+        duplicates of the answer
+        """
+        speak, spoke, dog, _, _ = self._create_answers(
+            ["I speak", "I spoke", "the dog", "The dog!", "a cat"])
+
+        build_distractor_index(self.user)
+        distractor_ids = get_distractor_ids(self.user, [speak.id, dog.id])
+
+        self.assertEqual(distractor_ids[speak.id][0], spoke.id)
+        self.assertEqual(len(distractor_ids[speak.id]), 4)
+        self.assertEqual(len(distractor_ids[dog.id]), 3)
+
+    def test_that_a_multiple_choice_session_offers_choices(self):
+        """
+        Each question offers the correct answer and the distractors, and the
+        choices are picked with two extra queries
+        """
+        answers = ["I speak", "I spoke", "the dog", "a cat", "she speaks"]
+        self._create_answers(answers)
+        call_command("build_distractor_indexes", stdout=StringIO())
+        self.assertTrue(DistractorIndex.objects.filter(user=self.user).exists())
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNumQueries(9):
+            response = self.client.post(
+                reverse("session"), {"multiple_choice": True}, format="json")
+
+        for question in response.data["question_set"]:
+            self.assertEqual(len(question["choices"]), 4)
+            self.assertIn(question["correct_answer"], question["choices"])
+            self.assertTrue(set(question["choices"]) <= set(answers))
+
+    def test_that_new_translations_are_asked_as_free_text(self):
+        """
+        Translations that aren't in the index yet don't have any choices
+        """
+        self.client.force_authenticate(user=self.user)
+        self._create_answers(["I speak", "I spoke"])
+
+        response = self.client.post(
+            reverse("session"), {"multiple_choice": True}, format="json")
+
+        self.assertEqual(
+            [question["choices"] for question in response.data["question_set"]],
+            [[], []])
+
+    def test_that_a_pooled_session_is_claimed_when_a_session_is_started(self):
+        """
+        The pooled sessions don't repeat each other's questions, and starting
+        a session claims the oldest one without creating a new one
+        """
+        self._create_translations(10)
+        call_command("refill_session_pools", self.user.id, stdout=StringIO())
+        first, second = Session.objects.filter(user=self.user).order_by("id")
+        self.assertFalse(
+            set(first.question_set.values_list("translation_id", flat=True))
+            & set(second.question_set.values_list("translation_id", flat=True)))
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNumQueries(8):
+            response = self.client.post(reverse("session"))
+
+        self.assertEqual(response.data["id"], first.id)
+        self.assertEqual(len(response.data["question_set"]), 5)
+        self.assertEqual(Session.objects.filter(user=self.user).count(), 2)
+
+    def test_that_a_stale_pool_is_replaced_by_a_new_session(self):
+        """
+        A pooled session isn't claimed once the translations that are due
+        have changed since the pool was filled
+        """
+        translations = self._create_translations(10)
+        refill_session_pool(self.user)
+        Review.objects.filter(translation=translations[0]).update(
+            due_at=timezone.now() + timedelta(days=1))
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(reverse("session"))
+
+        self.assertEqual(
+            {question["translation"]["id"] for question in response.data["question_set"]},
+            set(Review.objects.order_by("due_at").values_list(
+                "translation_id", flat=True)[:5]))
+        self.assertFalse(
+            Session.objects.filter(user=self.user, claimed_on__isnull=True).exists())
+
+    def test_that_pools_are_refilled_for_users_that_were_active_recently(self):
+        """
+        Users that have logged in, practiced, reviewed or read recently have
+        their pools refilled, and other users don't
+        """
+        other_user = UserProfile.objects.create_user(
+            username="other", email="other@example.com", password="password")
+        self._create_translations(5)
+        self._create_translations(5, user=other_user)
+        UserProfile.objects.filter(id=self.user.id).update(last_login=timezone.now())
+        UserProfile.objects.filter(id=other_user.id).update(
+            last_login=timezone.now() - timedelta(days=60))
+
+        call_command("refill_session_pools", stdout=StringIO())
+
+        self.assertTrue(Session.objects.filter(user=self.user).exists())
+        self.assertFalse(Session.objects.filter(user=other_user).exists())
+
+    def test_that_unclaimed_sessions_are_left_out_of_the_history(self):
+        """
+        Pooled sessions aren't listed until they've been started, and a
+        claimed session can't be claimed again
+        """
+        self._create_translations(5)
+        pooled_session = refill_session_pool(self.user)[0]
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(reverse("session"))
+        self.assertEqual(response.data["results"], [])
+
+        url = reverse("session-update", kwargs={"pk": pooled_session.id})
+        response = self.client.put(url, {"duration": "00:02:30"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        url = reverse("answer-question", kwargs={"pk": pooled_session.question_set.first().id})
+        response = self.client.put(url, {"guess": "text 0"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.assertEqual(claim_session(self.user), pooled_session.id)
+        self.assertIsNone(claim_session(self.user))
+        response = self.client.get(reverse("session"))
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_that_the_history_is_ordered_by_when_sessions_were_started(self):
+        """
+        Claiming a pooled session keeps when it was prepared, and the history
+        lists the sessions by when they were claimed
+        """
+        self._create_translations(5)
+        pooled_session = refill_session_pool(self.user)[0]
+        started_session = Session.objects.create(
+            user=self.user, claimed_on=timezone.now() - timedelta(hours=1))
+
+        claim_session(self.user)
+        claimed_session = Session.objects.get(id=pooled_session.id)
+        self.assertEqual(claimed_session.created_at, pooled_session.created_at)
+        self.assertGreater(claimed_session.claimed_on, claimed_session.created_at)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("session"))
+        self.assertEqual(
+            [session["id"] for session in response.data["results"]],
+            [pooled_session.id, started_session.id])
+
+
+class DrillTests(APITestCase):
+    """
+    The test cases for the conjugation drills
+    """
+    fixtures = ['fixtures.json']
+
+    def setUp(self):
+        """
+        Create a small set of conjugations for the language that the user is
+        learning and build its drill pool
+        """
+        self.user = UserProfile.objects.get(email="aaronsnig@gmail.com")
+        language = Language.objects.get(name="Brazilian Portuguese")
+        mood = Mood.objects.create(name="indicativo")
+        tense = Tense.objects.create(name="presente", language=language, mood=mood)
+
+        conjugations = {
+            "falar": ["eu falo", "tu falas", "ele fala"],
+            "ser": ["eu sou", "tu és", "ele é"],
+        }
+        for name, forms in conjugations.items():
+            verb = Verb.objects.create(name=name, language=language)
+            for person, form in enumerate(forms):
+                Form.objects.create(form=form, verb=verb, tense=tense, person=person)
+
+        call_command("build_drill_pools", "pt", stdout=StringIO())
+
+    def test_that_the_inflected_word_is_blanked_out_of_the_prompt(self):
+        """
+        The pronouns and particles are kept around the blank
+        """
+        self.assertEqual(get_prompt("que eu fale"), "que eu ___")
+        self.assertEqual(get_prompt("fala tu"), "___ tu")
+
+    def test_that_a_drill_is_drawn_from_the_pool(self):
+        """
+        The candidates are drawn with a single query, without joining the
+        forms, and each question asks for a different form
+        """
+        self.client.force_authenticate(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse("drill"), {"count": 4}, format="json")
+        selects = [query["sql"] for query in queries if query["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 4)
+        self.assertNotIn("lemmatizer_form", " ".join(selects))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["kind"], "conjugation")
+        questions = response.data["drill_questions"]
+        self.assertEqual(len(questions), 4)
+        self.assertEqual(
+            len({(question["verb"], question["person"]) for question in questions}), 4)
+
+    def test_that_drill_answers_are_graded_against_the_form(self):
+        """
+        The casing of the answer is ignored, but the accents aren't
+        """
+        self.client.force_authenticate(user=self.user)
+        session = self.client.post(reverse("drill"), {"count": 6}, format="json").data
+        questions = {
+            question["correct_answer"]: question["id"]
+            for question in session["drill_questions"]
+        }
+        url = reverse("session-answers", kwargs={"pk": session["id"]})
+
+        answers = [
+            {"question": questions["falo"], "guess": " Falo "},
+            {"question": questions["és"], "guess": "es"},
+        ]
+        response = self.client.post(url, {"answers": answers}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {question["correct_answer"]: question["correct"] for question in response.data},
+            {"falo": True, "és": False})
+        self.assertEqual(Session.objects.get(id=session["id"]).correct_count, 1)
+
+    def test_that_drills_are_kept_when_the_conjugations_are_imported(self):
+        """
+        The drill pool is rebuilt after the conjugations are imported, and
+        the drill questions for forms that were removed keep their text
+        """
+        language = Language.objects.get(name="Brazilian Portuguese")
+        self.client.force_authenticate(user=self.user)
+        session = self.client.post(reverse("drill"), {"count": 6}, format="json").data
+        question = session["drill_questions"][0]
+        url = reverse("session-answers", kwargs={"pk": session["id"]})
+        answers = [{"question": question["id"], "guess": "a" * 100}]
+        response = self.client.post(url, {"answers": answers}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        import_conjugations(Verb.objects.get(name="falar"), {
+            "moods": {"indicativo": {"presente": ["eu falo"]}}
+        })
+        build_drill_pool(language)
+
+        self.assertEqual(get_pool_size(language.id), 4)
+        questions = DrillQuestion.objects.filter(session_id=session["id"])
+        self.assertEqual(questions.count(), 6)
+        self.assertEqual(questions.filter(form__isnull=True).count(), 2)
+        self.assertEqual(
+            set(questions.filter(form__isnull=True).values_list("form_text", flat=True)),
+            {"tu falas", "ele fala"})
+
+    def test_that_a_drill_needs_conjugations_for_the_language(self):
+        """
+        A user learning a language without a drill pool receives an error
+        """
+        self.user.language_being_learned = Language.objects.get(name="German")
+        self.user.save()
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(reverse("drill"))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -7,6 +7,8 @@ urlpatterns = [
     path("questions/<int:pk>/", views.PracticeQuestionView.as_view(), name="answer-question"),
     path("sessions/", views.PracticeSessionView.as_view(), name="session"),
     path("sessions/<int:pk>/", views.PracticeSessionView.as_view(), name="session-update"),
+    path("sessions/<int:pk>/answers/", views.PracticeAnswersView.as_view(), name="session-answers"),
+    path("drills/", views.PracticeDrillView.as_view(), name="drill"),
 ]
 
 urlpatterns = format_suffix_patterns(urlpatterns)
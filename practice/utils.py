@@ -0,0 +1,415 @@
+"""Practice Utilities
+
+The helpers used to put together the practice sessions for a user.
+
+By default, the questions for a session are the translations that are due
+for review next, see `practice.scheduler`. These are read from the user's
+review schedule with a single query on the `(user, due_at)` index.
+
+Sessions can also ask about random translations. Rather than loading every
+translation to pick a handful of them, random points within the range of the
+user's translation IDs are chosen and the next translation at or after each
+point is looked up.
+
+Either way, the cost of starting a session doesn't depend on how many
+translations the user has.
+
+To take the work of putting a session together off of the request path, the
+`refill_session_pools` management command keeps a small pool of review
+sessions ready for each active user. A pooled session hasn't been claimed
+yet, so its `claimed_on` is empty, and starting a session claims the oldest
+one with a single conditional update, as long as the pool still matches the
+due queue.
+"""
+import logging
+import random
+import threading
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import (
+    Case, Count, F, IntegerField, Max, Min, OuterRef, Q, Subquery, When)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from dashboard.counters import add_dashboard_counters
+from practice.distractors import get_choices
+from practice.grading import grade_answers, is_correct
+from practice.models import Question, Review, Session
+from practice.normalization import normalize_answer, normalize_translation
+from practice.scheduler import get_quality, schedule_review
+from translator.models import Translation
+
+
+logger = logging.getLogger(__name__)
+
+
+QUESTIONS_PER_SESSION = 5
+
+REVIEW = "review"
+RANDOM = "random"
+SESSION_MODES = (REVIEW, RANDOM)
+
+# The number of unclaimed sessions that are kept ready for each user
+POOL_SIZE = 2
+
+# The pool is refilled in the background once fewer than this many unclaimed
+# sessions are left
+POOL_REFILL_THRESHOLD = 1
+
+# The number of times a user will try to claim another pooled session if the
+# one they picked was claimed by another request first
+CLAIM_ATTEMPTS = 3
+
+
+def sample_translation_ids(translations, count):
+    """Sample translation IDs
+
+    Pick up to `count` random translations from the queryset. If there are
+    fewer translations than `count`, all of them are returned.
+
+    Args:
+        translations (QuerySet): The translations to sample from
+        count (int): The number of translations to pick
+
+    Returns:
+        list: The IDs of the sampled translations, in a random order
+    """
+    ordered_ids = translations.order_by("id").values_list("id", flat=True)
+
+    # Reading one more ID than is needed shows whether there are enough
+    # translations to sample from, without counting all of them
+    first_ids = list(ordered_ids[:count + 1])
+    if len(first_ids) <= count:
+        random.shuffle(first_ids)
+        return first_ids
+
+    bounds = translations.aggregate(min_id=Min("id"), max_id=Max("id"))
+    ids = set()
+    for _ in range(count * 2):
+        if len(ids) == count:
+            break
+        point = random.randint(bounds["min_id"], bounds["max_id"])
+        ids.add(ordered_ids.filter(id__gte=point).first())
+
+    # Dense pools can take a few attempts too many, so top up the sample with
+    # the translations that follow another random point, wrapping around to
+    # the start of the range if needed
+    if len(ids) < count:
+        point = random.randint(bounds["min_id"], bounds["max_id"])
+        unpicked_ids = ordered_ids.exclude(id__in=ids)
+        ids.update(unpicked_ids.filter(id__gte=point)[:count - len(ids)])
+        if len(ids) < count:
+            ids.update(unpicked_ids.filter(id__lt=point)[:count - len(ids)])
+
+    ids = list(ids)
+    random.shuffle(ids)
+    return ids
+
+
+def get_due_translation_ids(user, count):
+    """Get due translation IDs
+
+    Get the translations that are due for review next. If fewer than `count`
+    translations are due, the translations that will be due soonest are used
+    to fill the session.
+
+    Args:
+        user (UserProfile): The user whose translations are being reviewed
+        count (int): The number of translations to get
+
+    Returns:
+        list: The IDs of the translations, the most overdue first
+    """
+    return list(Review.objects.filter(user=user).order_by("due_at").values_list(
+        "translation_id", flat=True)[:count])
+
+
+def create_session(user, count=QUESTIONS_PER_SESSION, mode=REVIEW, multiple_choice=False):
+    """Create a practice session
+
+    Create a new practice session for the user, with a question for each of
+    the chosen translations.
+
+    Args:
+        user (UserProfile): The user that the session is for
+        count (int): The number of questions to ask
+        mode (str): Either `review`, to ask about the translations that are
+        due for review, or `random`, to ask about random translations
+        multiple_choice (bool): Whether the questions should have choices.
+        Translations that aren't in the user's distractor index yet are
+        asked as free text questions
+
+    Returns:
+        Session: The new session, or,
+        None: If the user doesn't have any translations to practice
+    """
+    if mode == RANDOM:
+        translation_ids = sample_translation_ids(
+            Translation.objects.filter(user=user), count)
+    else:
+        translation_ids = get_due_translation_ids(user, count)
+
+    if not translation_ids:
+        return None
+
+    choices = get_choices(user, translation_ids) if multiple_choice else {}
+
+    session = Session.objects.create(
+        user=user, question_count=len(translation_ids), claimed_on=timezone.now())
+    Question.objects.bulk_create([
+        Question(
+            translation_id=translation_id, session=session,
+            choices=choices.get(translation_id, ""))
+        for translation_id in translation_ids
+    ])
+    return session
+
+
+def refill_session_pool(user, size=POOL_SIZE, count=QUESTIONS_PER_SESSION):
+    """Refill a session pool
+
+    Replace the user's unclaimed sessions with new review sessions. Each of
+    the sessions asks about the next `count` translations in the due queue,
+    so none of the pooled sessions repeat each other's questions.
+
+    Args:
+        user (UserProfile): The user that the sessions are for
+        size (int): The number of sessions to keep ready
+        count (int): The number of questions in each session
+
+    Returns:
+        list: The new sessions
+    """
+    translation_ids = get_due_translation_ids(user, count * size)
+
+    with transaction.atomic():
+        Session.objects.filter(user=user, claimed_on__isnull=True).delete()
+
+        sessions = []
+        questions = []
+        for start in range(0, len(translation_ids), count):
+            session_ids = translation_ids[start:start + count]
+            session = Session.objects.create(user=user, question_count=len(session_ids))
+            sessions.append(session)
+            questions.extend(
+                Question(translation_id=translation_id, session=session)
+                for translation_id in session_ids)
+        Question.objects.bulk_create(questions)
+    return sessions
+
+
+def _refill_in_background(user):
+    """Refill in the background
+
+    Refill the user's session pool on a background thread once the current
+    transaction has been committed, so the request that emptied the pool
+    doesn't wait for it and the refill sees the claimed session.
+    """
+    def refill():
+        try:
+            refill_session_pool(user)
+        except DatabaseError:
+            logger.exception("Couldn't refill the session pool for user %s", user.id)
+        finally:
+            # Each thread has its own connection, which would otherwise be left open
+            connection.close()
+
+    transaction.on_commit(
+        lambda: threading.Thread(target=refill, daemon=True).start())
+
+
+def claim_session(user):
+    """Claim a session
+
+    Claim the oldest of the user's pooled sessions. The session is claimed
+    with an update that only succeeds if it's still unclaimed, so if two
+    requests pick the same session, only one of them will get it and the
+    other will try the next one. The update doesn't send `post_save`, so the
+    session is added to the dashboard counters here.
+
+    The pool is prepared ahead of time, so before a session is claimed its
+    questions are checked against the translations that are due now. If the
+    user has reviewed or added translations since the pool was filled, the
+    pool is stale, so it's emptied and None is returned for a new session to
+    be created instead. The pool is refilled in the background whenever it's
+    stale or falls below `POOL_REFILL_THRESHOLD` sessions.
+
+    The session keeps the `created_at` of when it was prepared, and
+    `claimed_on` records when it was started.
+
+    Args:
+        user (UserProfile): The user that is starting a session
+
+    Returns:
+        int: The ID of the claimed session, or,
+        None: If there aren't any pooled sessions left, or they're stale
+    """
+    unclaimed = Session.objects.filter(user=user, claimed_on__isnull=True)
+    due_ids = None
+    for _ in range(CLAIM_ATTEMPTS):
+        session_ids = list(unclaimed.order_by("id").values_list("id", flat=True))
+        if not session_ids:
+            return None
+
+        pooled_ids = set(Question.objects.filter(
+            session_id=session_ids[0]).values_list("translation_id", flat=True))
+        if due_ids is None:
+            due_ids = set(get_due_translation_ids(user, len(pooled_ids)))
+        if pooled_ids != due_ids:
+            unclaimed.delete()
+            _refill_in_background(user)
+            return None
+
+        if unclaimed.filter(id=session_ids[0]).update(claimed_on=timezone.now()):
+            add_dashboard_counters(user.id, practice_sessions=1)
+            if len(session_ids) - 1 < POOL_REFILL_THRESHOLD:
+                _refill_in_background(user)
+            return session_ids[0]
+    return None
+
+
+def mark_questions(questions, guesses, results):
+    """Mark questions
+
+    Store the user's answers and whether they were correct, and update the
+    number of correct answers for the questions' sessions. Questions can be
+    answered more than once, so only the change in the number of correct
+    answers is added to each session.
+
+    Args:
+        questions (list): The questions, either `Question` or `DrillQuestion`
+        instances, but not both
+        guesses (list): The user's answer to each of the questions
+        results (list): Whether each of the answers was correct
+    """
+    correct_counts = {}
+    for question, guess, correct in zip(questions, guesses, results):
+        change = int(correct) - int(bool(question.correct))
+        correct_counts[question.session_id] = (
+            correct_counts.get(question.session_id, 0) + change)
+        question.answer_provided = guess
+        question.correct = correct
+    if questions:
+        type(questions[0]).objects.bulk_update(questions, ["answer_provided", "correct"])
+
+    for session_id, change in correct_counts.items():
+        if change:
+            Session.objects.filter(id=session_id).update(
+                correct_count=F("correct_count") + change)
+
+
+def answer_questions(user, questions, guesses):
+    """Answer questions
+
+    Grade the user's answers to a set of questions, update the number of
+    correct answers for their sessions and reschedule the reviews of their
+    translations. All of the answers are graded together, and the questions,
+    sessions and reviews are each written with a single query.
+
+    Only the first answer to a question reschedules its translation, so
+    changing an answer doesn't count as another review.
+
+    Args:
+        user (UserProfile): The user that answered the questions
+        questions (list): The questions, with their translations loaded
+        guesses (list): The user's answer to each of the questions
+
+    Returns:
+        list: The graded questions
+    """
+    translations = [question.translation for question in questions]
+    ratios = grade_answers(
+        [
+            normalize_answer(
+                guess, translation.source_language_id,
+                settings.PRACTICE_LEMMATIZE_ANSWERS)
+            for guess, translation in zip(guesses, translations)
+        ],
+        [
+            translation.normalized_answer or normalize_translation(translation)
+            for translation in translations
+        ],
+    )
+
+    unanswered = [question.correct is None for question in questions]
+    mark_questions(questions, guesses, [is_correct(ratio) for ratio in ratios])
+
+    qualities = {
+        question.translation_id: get_quality(ratio)
+        for question, ratio, first_answer in zip(questions, ratios, unanswered)
+        if first_answer
+    }
+    reviews = {
+        review.translation_id: review
+        for review in Review.objects.filter(
+            user=user, translation_id__in=qualities.keys())
+    }
+
+    now = timezone.now()
+    new_reviews = []
+    for translation_id, quality in qualities.items():
+        review = reviews.get(translation_id)
+        if review is None:
+            review = Review(user=user, translation_id=translation_id)
+            new_reviews.append(review)
+        schedule_review(review, quality, now)
+
+    Review.objects.bulk_update(reviews.values(), [
+        "ease_factor", "interval", "repetitions", "due_at", "last_reviewed_at"])
+    Review.objects.bulk_create(new_reviews)
+
+    return questions
+
+
+def get_score():
+    """Get the score
+
+    Returns:
+        Case: The expression that calculates a session's score from its
+        counters, which is empty for sessions without any questions
+    """
+    return Case(
+        When(question_count=0, then=None),
+        default=F("correct_count") * 100 / F("question_count"),
+        output_field=IntegerField(),
+    )
+
+
+def recount_sessions(session_ids):
+    """Recount sessions
+
+    Recount the questions of the sessions after some of them have been
+    deleted, and recalculate the score of the sessions that were finished,
+    with two updates no matter how many sessions there are.
+
+    Args:
+        session_ids (list): The IDs of the sessions
+    """
+    counts = Question.objects.filter(session=OuterRef("pk")).order_by().values(
+        "session").annotate(
+            total=Count("id"), correct=Count("id", filter=Q(correct=True)))
+
+    sessions = Session.objects.filter(id__in=session_ids)
+    sessions.update(
+        question_count=Coalesce(Subquery(counts.values("total")), 0),
+        correct_count=Coalesce(Subquery(counts.values("correct")), 0))
+    sessions.filter(score__isnull=False).update(score=get_score())
+
+
+def finish_session(user, session_id, duration):
+    """Finish a session
+
+    Record how long the session took and calculate its score from the number
+    of correct answers, with a single update. Sessions without any questions
+    aren't given a score.
+
+    Args:
+        user (UserProfile): The user that the session belongs to
+        session_id (int): The ID of the session
+        duration (timedelta): How long the session took
+
+    Returns:
+        bool: True if the user's session was found and updated, pooled
+        sessions that haven't been started can't be finished
+    """
+    sessions = Session.objects.filter(id=session_id, user=user, claimed_on__isnull=False)
+    return bool(sessions.update(duration=duration, score=get_score()))
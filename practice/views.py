@@ -1,43 +1,73 @@
-import random
 from datetime import datetime
 from datetime import timedelta
-from fuzzywuzzy import fuzz
+from django.db.models import prefetch_related_objects
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from .models import Question, Session
-from .serializers import QuestionSerializer, SessionSerializer
-from translator.models import Translation
+from .pagination import QuestionCursorPagination, SessionCursorPagination
+from .drills import answer_drill_questions, create_drill_session
+from .serializers import (
+    AnswerSerializer, AnswersSerializer, DrillQuestionSerializer, DrillSessionSerializer,
+    NewDrillSerializer, NewSessionSerializer, QuestionSerializer,
+    SessionFilterSerializer, SessionSerializer, SessionSummarySerializer)
+from .utils import (
+    REVIEW, answer_questions, claim_session, create_session, finish_session)
+from dashboard.rollups import get_day, refresh_practice_stats
 from translator.serializers import TranslationSerializer
 
 
+def serialize_session(session):
+    """Serialize a session
+
+    Serialize a session along with its questions, which are fetched with
+    the query for the session's kind.
+
+    Args:
+        session (Session): The session that should be serialized
+
+    Returns:
+        Serializer: The serializer for the session
+    """
+    if session.kind == Session.CONJUGATION:
+        prefetch_related_objects([session], "drill_questions")
+        return DrillSessionSerializer(session)
+    prefetch_related_objects([session], "question_set__translation")
+    return SessionSerializer(session)
+
+
 class PracticeQuestionView(APIView):
 
     permission_classes = (IsAuthenticated,)
     serializer_class = QuestionSerializer
 
     def get(self, request, pk=None):
+        questions = Question.objects.filter(
+            session__user=request.user, session__claimed_on__isnull=False
+        ).select_related("translation")
         if pk:
-            question = Question.objects.get(id=pk)
+            question = get_object_or_404(questions, id=pk)
             serializer = self.serializer_class(question)
-        else:
-            questions = Question.objects.all()
-            serializer = self.serializer_class(questions, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+            return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        paginator = QuestionCursorPagination()
+        page = paginator.paginate_queryset(questions, request, view=self)
+        serializer = self.serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     def put(self, request, pk=None):
-        question = Question.objects.get(id=pk)
-        
-        users_guess = request.data["guess"]
-        correct_answer = question.translation.translated_text
-
-        ratio = fuzz.ratio(users_guess, correct_answer)
-        
-        question.answer_provided = users_guess
-        question.correct = True if ratio >= 85 else False
-        question.save()
-        
+        answer = AnswerSerializer(data={"question": pk, "guess": request.data.get("guess")})
+        if not answer.is_valid():
+            return Response(data=answer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        question = get_object_or_404(
+            Question.objects.select_related("translation"), id=pk,
+            session__user=request.user, session__claimed_on__isnull=False)
+        answer_questions(request.user, [question], [answer.validated_data["guess"]])
+
         serializer = self.serializer_class(question)
         return Response(data=serializer.data, status=status.HTTP_200_OK)
 
@@ -48,37 +78,201 @@ class PracticeSessionView(APIView):
     serializer_class = SessionSerializer
 
     def get(self, request, pk=None):
-        sessions = Session.objects.all()
-        serializer = self.serializer_class(sessions, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        """Get the session history
+
+        Lists the user's sessions, newest first, one page at a time. Only the
+        summary of each session is included unless `detail` is set, in which
+        case the questions and translations for the whole page are fetched
+        with two extra queries.
+
+        Example:
+            This endpoint will be available at::
+
+                /practice-sessions/sessions/?min_score=50&ordering=-score&detail=true
+
+            Sessions that haven't been finished don't have a score, so they
+            are left out when the history is filtered or ordered by score.
+
+        Raises:
+            HTTP 404 Not Found if the session doesn't belong to the user
+        """
+        sessions = Session.objects.filter(user=request.user, claimed_on__isnull=False)
+        if pk:
+            serializer = serialize_session(get_object_or_404(sessions, id=pk))
+            return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+        filters = SessionFilterSerializer(data=request.query_params)
+        if not filters.is_valid():
+            return Response(data=filters.errors, status=status.HTTP_400_BAD_REQUEST)
+        options = filters.validated_data
+
+        if "min_score" in options:
+            sessions = sessions.filter(score__gte=options["min_score"])
+        if "max_score" in options:
+            sessions = sessions.filter(score__lte=options["max_score"])
+        if options.get("ordering", "").endswith("score"):
+            sessions = sessions.filter(score__isnull=False)
+
+        serializer_class = SessionSummarySerializer
+        if options["detail"]:
+            sessions = sessions.prefetch_related("question_set__translation")
+            serializer_class = self.serializer_class
+
+        paginator = SessionCursorPagination(options.get("ordering"))
+        page = paginator.paginate_queryset(sessions, request, view=self)
+        serializer = serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     def post(self, request):
-        session = Session(user=request.user)
-        session.save()
-        translations = Translation.objects.filter(user=request.user)
-        random_translations = random.sample(list(translations), 5)
-        for translation in random_translations:
-            question = Question(translation=translation, session=session)
-            question.save()
-        
+        options = NewSessionSerializer(data=request.data)
+        if not options.is_valid():
+            return Response(data=options.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # Only plain review sessions are prepared ahead of time
+        session_id = None
+        if (options.validated_data["mode"] == REVIEW
+                and not options.validated_data["multiple_choice"]):
+            session_id = claim_session(request.user)
+
+        if session_id is None:
+            session = create_session(
+                request.user, mode=options.validated_data["mode"],
+                multiple_choice=options.validated_data["multiple_choice"])
+            if session is None:
+                return Response(
+                    data={"detail": "You don't have any translations to practice yet"},
+                    status=status.HTTP_400_BAD_REQUEST)
+            session_id = session.id
+
+        session = Session.objects.prefetch_related(
+            "question_set__translation").get(id=session_id)
         serializer = SessionSerializer(session)
         return Response(data=serializer.data, status=status.HTTP_200_OK)
     
     def put(self, request, pk):
-        session = Session.objects.get(id=pk)
         duration_items = [int(date_item) for date_item in request.data["duration"].split(':')]
-        session.duration = timedelta(
+        duration = timedelta(
             hours=duration_items[0],
             minutes=duration_items[1],
             seconds=duration_items[2]
         )
 
-        total_number_of_questions = session.question_set.all().count()
-        correct_questions = session.question_set.filter(correct=True).count()
+        if not finish_session(request.user, pk, duration):
+            raise Http404
 
-        percentage = 100 * correct_questions / total_number_of_questions
+        session = get_object_or_404(
+            Session, id=pk, user=request.user, claimed_on__isnull=False)
+        refresh_practice_stats(session.user_id, get_day(session.claimed_on))
+        serializer = serialize_session(session)
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
 
-        session.score = percentage
-        session.save()
-        serializer = SessionSerializer(session)
+
+class PracticeAnswersView(APIView):
+    """PracticeAnswersView
+
+    Grades all of the answers for a session in a single request, rather than
+    sending each answer to `PracticeQuestionView` individually.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    serializer_class = AnswersSerializer
+
+    def post(self, request, pk):
+        """Answer questions
+
+        Example:
+            This endpoint will be available at::
+
+                /practice-sessions/sessions/<pk>/answers/
+
+            And the body should be::
+
+                {
+                    "answers": [
+                        {"question": 1, "guess": "hello"},
+                        {"question": 2, "guess": "goodbye"}
+                    ]
+                }
+
+            This will return the graded questions.
+
+        Raises:
+            HTTP 404 Not Found if the session doesn't belong to the user
+            HTTP 400 Bad Request if any of the questions aren't in the session
+        """
+        session = get_object_or_404(
+            Session, id=pk, user=request.user, claimed_on__isnull=False)
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return Response(data=serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        guesses = {
+            answer["question"]: answer["guess"]
+            for answer in serializer.validated_data["answers"]
+        }
+        if session.kind == Session.CONJUGATION:
+            questions = session.drill_questions.filter(id__in=guesses.keys())
+            question_serializer = DrillQuestionSerializer
+        else:
+            questions = session.question_set.select_related("translation").filter(
+                id__in=guesses.keys())
+            question_serializer = QuestionSerializer
+
+        questions = list(questions)
+        if len(questions) != len(guesses):
+            return Response(
+                data={"answers": ["Every question must belong to the session"]},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        question_guesses = [guesses[question.id] for question in questions]
+        if session.kind == Session.CONJUGATION:
+            answer_drill_questions(questions, question_guesses)
+        else:
+            answer_questions(request.user, questions, question_guesses)
+
+        serializer = question_serializer(questions, many=True)
         return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+
+class PracticeDrillView(APIView):
+    """PracticeDrillView
+
+    Starts a conjugation drill for the language that the user is learning.
+    The answers are sent to `PracticeAnswersView`, the same as any other
+    session.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    serializer_class = DrillSessionSerializer
+
+    def post(self, request):
+        """Start a drill
+
+        Example:
+            This endpoint will be available at::
+
+                /practice-sessions/drills/
+
+            And the body can optionally include the number of questions::
+
+                {
+                    "count": 20
+                }
+
+        Raises:
+            HTTP 400 Bad Request if there aren't any conjugations to drill
+            for the language
+        """
+        options = NewDrillSerializer(data=request.data)
+        if not options.is_valid():
+            return Response(data=options.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        session = create_drill_session(request.user, options.validated_data["count"])
+        if session is None:
+            return Response(
+                data={"detail": "There aren't any conjugations to practice for this language yet"},
+                status=status.HTTP_400_BAD_REQUEST)
+
+        session = Session.objects.prefetch_related("drill_questions").get(id=session.id)
+        serializer = self.serializer_class(session)
+        return Response(data=serializer.data, status=status.HTTP_201_CREATED)
@@ -1,4 +1,5 @@
 from django.contrib import admin
-from reading_sessions.models import ReadingSession
+from reading_sessions.models import ReadingEvent, ReadingSession
 
 admin.site.register(ReadingSession)
+admin.site.register(ReadingEvent)
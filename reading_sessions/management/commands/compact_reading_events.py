@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+from reading_sessions.utils import compact_reading_events
+
+
+class Command(BaseCommand):
+
+    help = "Fold the recorded reading events into the reading sessions and library books"
+
+    def handle(self, *args, **kwargs):
+        compacted = compact_reading_events()
+        self.stdout.write(f"Compacted {compacted} reading events")
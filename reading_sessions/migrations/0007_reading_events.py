@@ -0,0 +1,29 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading_sessions', '0006_remove_readingsession_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='readingsession',
+            name='lookups',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='ReadingEvent',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('P', 'Page Turn'), ('D', 'Dwell'), ('L', 'Lookup')], max_length=1)),
+                ('occurred_at', models.DateTimeField()),
+                ('value', models.FloatField(default=1)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reading_sessions.ReadingSession')),
+            ],
+        ),
+    ]
@@ -16,4 +16,33 @@ class ReadingSession(models.Model):
     pages = models.FloatField()
     created_on = models.DateTimeField(auto_now_add=True)
     status = models.CharField(
-        max_length=1, choices=STATUS_TYPES, default=STATUS_TYPES[0][0])
\ No newline at end of file
+        max_length=1, choices=STATUS_TYPES, default=STATUS_TYPES[0][0])
+    lookups = models.PositiveIntegerField(default=0)
+
+
+class ReadingEvent(models.Model):
+    """Reading Event Model
+
+    A single event that was reported by the client during a reading session.
+    The events are only appended to this table when they're received, and
+    are folded into the totals for their reading sessions and library books
+    by the `compact_reading_events` management command, after which they're
+    deleted, see `reading_sessions.utils`.
+
+    The meaning of the `value` depends on the kind of event:
+
+        - **page turn**: the number of pages that were turned
+        - **dwell**: the number of seconds that were spent reading
+        - **lookup**: the number of words that were looked up
+    """
+
+    EVENT_TYPES = (
+        ('P', 'Page Turn'),
+        ('D', 'Dwell'),
+        ('L', 'Lookup'),
+    )
+
+    session = models.ForeignKey(ReadingSession, on_delete=models.CASCADE)
+    kind = models.CharField(max_length=1, choices=EVENT_TYPES)
+    occurred_at = models.DateTimeField()
+    value = models.FloatField(default=1)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from reading_sessions.models import ReadingSession
+from reading_sessions.models import ReadingEvent, ReadingSession
 from translator.serializers import TranslationSerializer
 from library.models import LibraryBook
 
@@ -47,4 +47,33 @@ class ReadingSessionSerializer(serializers.ModelSerializer):
                 'required': False
             },
         }
-        
\ No newline at end of file
+        
+
+class ReadingEventSerializer(serializers.ModelSerializer):
+    """The Reading Event Serializer
+
+    Args:
+        kind (str): A one letter indicator of the kind of event, `P` for a
+        page turn, `D` for dwell time or `L` for a word lookup
+        occurred_at (str): The time that the event happened on the client
+        value (float): The number of pages, seconds or lookups
+    """
+
+    value = serializers.FloatField(min_value=0, required=False)
+
+    class Meta:
+        model = ReadingEvent
+        fields = ["kind", "occurred_at", "value"]
+
+
+class ReadingEventsSerializer(serializers.Serializer):
+    """The Reading Events Serializer
+
+    The serializer used to deserialise a batch of reading events for a
+    session.
+    """
+
+    MAX_EVENTS = 500
+
+    events = serializers.ListField(
+        child=ReadingEventSerializer(), allow_empty=False, max_length=MAX_EVENTS)
@@ -1,3 +1,122 @@
-from django.test import TestCase
+"""
+The test cases for the reading sessions API. This test suite should test for
+the following test cases:
 
-# Create your tests here.
+    - Ending a reading session adds the pages that were read to the progress
+        of the library book, even if the book doesn't have any progress yet
+    - A user can't update another user's reading session
+    - Batches of reading events are recorded with a single insert, and are
+        folded into the session and the library book when they're compacted
+"""
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.test import APITestCase
+from accounts.models import UserProfile
+from books.models import Book
+from languages.models import Language
+from library.models import LibraryBook
+from reading_sessions.models import ReadingEvent, ReadingSession
+
+
+class ReadingSessionTests(APITestCase):
+    """
+    The test cases for updating reading sessions
+    """
+    fixtures = ['fixtures.json']
+
+    def setUp(self):
+        """
+        Create a book in the user's library with a reading session
+        """
+        self.user = UserProfile.objects.get(email="aaronsnig@gmail.com")
+        book = Book.objects.create(
+            title="Harry Potter", author="JK Rowling",
+            language=Language.objects.get(name="Brazilian Portuguese"))
+        self.library_item = LibraryBook.objects.create(user=self.user, book=book)
+        self.session = ReadingSession.objects.create(
+            library_item=self.library_item, duration=timedelta(minutes=5), pages=0)
+        self.url = reverse("reading-sessions-detail", kwargs={"pk": self.session.id})
+
+    def test_that_the_pages_read_are_added_to_the_progress(self):
+        """
+        The progress starts from zero, and each update is added to it with a
+        single update query
+        """
+        self.client.force_authenticate(user=self.user)
+
+        self.client.patch(self.url, {"pages": "3", "status": "I"}, format="json")
+        with self.assertNumQueries(7):
+            response = self.client.patch(
+                self.url, {"pages": "2", "status": "F"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["pages"], 2.0)
+        self.library_item.refresh_from_db()
+        self.assertEqual(self.library_item.progress, 5.0)
+
+    def test_that_a_user_cant_update_another_users_session(self):
+        """
+        Another user will receive a 404
+        """
+        other_user = UserProfile.objects.create_user(
+            email="other@example.com", username="other", password="password")
+        self.client.force_authenticate(user=other_user)
+
+        response = self.client.patch(self.url, {"pages": "3"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.library_item.refresh_from_db()
+        self.assertIsNone(self.library_item.progress)
+
+    def test_that_a_batch_of_events_is_recorded_with_a_single_insert(self):
+        """
+        The events are stored without updating the session
+        """
+        url = reverse("reading-sessions-events", kwargs={"pk": self.session.id})
+        events = [
+            {"kind": "P", "occurred_at": "2020-06-01T10:00:00Z", "value": 1}
+            for _ in range(20)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNumQueries(2):
+            response = self.client.post(url, {"events": events}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["recorded"], 20)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.pages, 0)
+
+    def test_that_events_are_folded_into_the_session_when_compacted(self):
+        """
+        The pages, time and lookups are added to the session, the pages are
+        added to the progress, the last activity is moved up to the latest
+        event and the events are deleted
+        """
+        LibraryBook.objects.filter(id=self.library_item.id).update(
+            last_activity=parse_datetime("2020-05-01T00:00:00Z"))
+        url = reverse("reading-sessions-events", kwargs={"pk": self.session.id})
+        events = [
+            {"kind": "P", "occurred_at": "2020-06-01T10:00:00Z", "value": 2},
+            {"kind": "P", "occurred_at": "2020-06-01T10:01:00Z", "value": 1},
+            {"kind": "D", "occurred_at": "2020-06-01T10:01:00Z", "value": 90},
+            {"kind": "L", "occurred_at": "2020-06-01T10:01:30Z"},
+        ]
+        self.client.force_authenticate(user=self.user)
+        self.client.post(url, {"events": events}, format="json")
+
+        call_command("compact_reading_events", stdout=StringIO())
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.pages, 3)
+        self.assertEqual(self.session.duration, timedelta(minutes=6, seconds=30))
+        self.assertEqual(self.session.lookups, 1)
+        self.library_item.refresh_from_db()
+        self.assertEqual(self.library_item.progress, 3)
+        self.assertEqual(
+            self.library_item.last_activity, parse_datetime("2020-06-01T10:01:30Z"))
+        self.assertFalse(ReadingEvent.objects.exists())
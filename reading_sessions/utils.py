@@ -0,0 +1,122 @@
+"""Reading Sessions Utilities
+
+The helpers used to record the reading events that are reported by the
+clients.
+
+Rather than updating the reading session and the library book for every
+page turn, the events are appended to the `ReadingEvent` table with a single
+insert for each batch. The `compact_reading_events` management command then
+folds them into the reading sessions and library books periodically, with a
+single update for all of the sessions and one for each book and daily stats
+rollup, no matter how many events they had.
+Only one compaction should be run at a time.
+"""
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import DateTimeField, F, Max, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from dashboard.rollups import add_daily_stats, get_day
+from library.models import LibraryBook
+from library.versions import bump_library_version
+from reading_sessions.models import ReadingEvent, ReadingSession
+
+
+PAGE_TURN = "P"
+DWELL = "D"
+LOOKUP = "L"
+
+
+def get_reading_session_user_id(session):
+    """Get the user ID of a reading session
+
+    Reading sessions are usually fetched along with their library books, in
+    which case the user is read from the library book without a query.
+
+    Args:
+        session (ReadingSession): The reading session
+
+    Returns:
+        int: The ID of the user that the reading session belongs to, or None
+        if the library book has already been deleted
+    """
+    if ReadingSession.library_item.is_cached(session):
+        return session.library_item.user_id
+    return LibraryBook.objects.filter(
+        id=session.library_item_id).values_list("user_id", flat=True).first()
+
+
+def record_reading_events(session, events):
+    """Record reading events
+
+    Args:
+        session (ReadingSession): The session that the events belong to
+        events (list): The validated data for each of the events
+
+    Returns:
+        list: The new events
+    """
+    return ReadingEvent.objects.bulk_create([
+        ReadingEvent(session=session, **event) for event in events
+    ])
+
+
+def compact_reading_events():
+    """Compact reading events
+
+    Add the pages, time and lookups from the events that have been recorded
+    so far to their reading sessions, and add the pages to the progress of
+    the library books, then delete the events. The last activity of each
+    book is moved up to when its latest event occurred, rather than to when
+    the compaction ran. Events that are recorded while the compaction is
+    running are left for the next compaction.
+
+    Returns:
+        int: The number of events that were compacted
+    """
+    with transaction.atomic():
+        last_id = ReadingEvent.objects.aggregate(last_id=Max("id"))["last_id"]
+        if last_id is None:
+            return 0
+
+        events = ReadingEvent.objects.filter(id__lte=last_id)
+        totals = events.values(
+            "session_id", "session__library_item_id", "session__library_item__user_id"
+        ).annotate(
+            pages=Coalesce(Sum("value", filter=Q(kind=PAGE_TURN)), Value(0.0)),
+            seconds=Coalesce(Sum("value", filter=Q(kind=DWELL)), Value(0.0)),
+            lookups=Coalesce(Sum("value", filter=Q(kind=LOOKUP)), Value(0.0)),
+            last_event=Max("occurred_at"),
+        ).order_by()
+
+        totals = {total["session_id"]: total for total in totals}
+
+        # The sessions are locked while they're updated, so that the totals
+        # can be added to them in a single bulk update
+        sessions = list(
+            ReadingSession.objects.select_for_update().filter(id__in=totals.keys()))
+        for session in sessions:
+            total = totals[session.id]
+            session.pages += total["pages"]
+            session.duration += timedelta(seconds=total["seconds"])
+            session.lookups += int(total["lookups"])
+        ReadingSession.objects.bulk_update(sessions, ["pages", "duration", "lookups"])
+
+        for session in sessions:
+            total = totals[session.id]
+            add_daily_stats(
+                total["session__library_item__user_id"], get_day(session.created_on),
+                pages=total["pages"], seconds_read=int(total["seconds"]))
+
+        for total in totals.values():
+            updates = {"last_activity": Greatest(
+                F("last_activity"), Value(total["last_event"], output_field=DateTimeField()))}
+            if total["pages"]:
+                updates["progress"] = Coalesce(F("progress"), Value(0.0)) + total["pages"]
+            LibraryBook.objects.filter(id=total["session__library_item_id"]).update(**updates)
+
+        # The sessions were bulk updated, so the signals weren't sent
+        for user_id in {total["session__library_item__user_id"] for total in totals.values()}:
+            bump_library_version(user_id)
+
+        compacted, _ = events.delete()
+    return compacted
@@ -8,13 +8,22 @@ This view will be responsible for creating new reading sessions, return
 reading sessions, maintain the state of a reading session (if it's in progress,
 not started, finished, etc), updating reading sessions and deleting sessions.
 """
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from dashboard.rollups import add_daily_stats, get_day
+from library.models import LibraryBook
 from reading_sessions.models import ReadingSession
 from . import serializers
+from .utils import record_reading_events
 
 
 class ReadingSessionViewSet(viewsets.ModelViewSet):
@@ -50,6 +59,11 @@ class ReadingSessionViewSet(viewsets.ModelViewSet):
 
         if create_serializer.is_valid():
             model = create_serializer.save()
+            LibraryBook.objects.filter(id=model.library_item_id).update(
+                last_activity=model.created_on)
+            add_daily_stats(
+                model.library_item.user_id, get_day(model.created_on),
+                pages=model.pages, seconds_read=int(model.duration.total_seconds()))
             return_serializer = self.serializer_class(model)
             return Response(return_serializer.data)
         else:
@@ -64,7 +78,9 @@ class ReadingSessionViewSet(viewsets.ModelViewSet):
 
         This is used to update the status field and the number of pages read. The number
         of pages read will update the `progress` field of the library book, as well the
-        pages value of the Reading Session model.
+        pages value of the Reading Session model. The progress is incremented in the
+        database, in the same transaction as the session is saved, along with the last
+        activity of the library book.
 
         Args:
             pages (str): This will likely be received as a string and cast to a float
@@ -89,14 +105,69 @@ class ReadingSessionViewSet(viewsets.ModelViewSet):
                     "status": "F"
                 }
         """
-        session = ReadingSession.objects.get(id=pk)
+        session = get_object_or_404(
+            ReadingSession.objects.select_related("library_item"),
+            id=pk, library_item__user=request.user)
         serializer = self.serializer_class(session, data=request.data, partial=True)
 
         if serializer.is_valid():
-            serializer.save()
-            session.library_item.progress += float(serializer.data["pages"])
-            session.library_item.save()
+            previous_pages, previous_duration = session.pages, session.duration
+            with transaction.atomic():
+                serializer.save()
+                updates = {"last_activity": timezone.now()}
+                pages = serializer.validated_data.get("pages")
+                if pages:
+                    # Increment the progress in the database, so that updates
+                    # from different devices don't overwrite each other
+                    updates["progress"] = Coalesce(F("progress"), Value(0.0)) + pages
+                LibraryBook.objects.filter(id=session.library_item_id).update(**updates)
+
+                add_daily_stats(
+                    session.library_item.user_id, get_day(session.created_on),
+                    pages=session.pages - previous_pages,
+                    seconds_read=int((session.duration - previous_duration).total_seconds()))
 
             return Response(serializer.data)
         else:
             return Response(serializer.errors)
+
+    @action(methods=["POST"], detail=True)
+    def events(self, request, pk):
+        """Record Reading Events
+
+        Record a batch of reading events for the session. The events are
+        stored as they are, and are added to the session and the library book
+        the next time that the events are compacted.
+
+        Args:
+            events (list): The events, each with a `kind`, an `occurred_at`
+            time and a `value`
+
+        Examples:
+            The URL is as follows::
+                /reading-sessions/1/events/
+
+            And the body should be::
+                {
+                    "events": [
+                        {"kind": "P", "occurred_at": "2020-06-01T10:00:00Z", "value": 1},
+                        {"kind": "D", "occurred_at": "2020-06-01T10:00:00Z", "value": 45},
+                        {"kind": "L", "occurred_at": "2020-06-01T10:00:30Z"}
+                    ]
+                }
+
+            This will return the number of events that were recorded::
+                {
+                    "recorded": 3
+                }
+        """
+        session = get_object_or_404(
+            ReadingSession, id=pk, library_item__user=request.user)
+        serializer = serializers.ReadingEventsSerializer(data=request.data)
+
+        if serializer.is_valid():
+            events = record_reading_events(session, serializer.validated_data["events"])
+            return Response(
+                data={"recorded": len(events)}, status=status.HTTP_201_CREATED)
+        else:
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.7 on 2026-10-19 15:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('translator', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='translation',
+            index=models.Index(fields=['user', 'id'], name='translator__user_id_e186f1_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.7 on 2026-10-19 16:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('translator', '0002_auto_20261019_1557'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translation',
+            name='normalized_answer',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
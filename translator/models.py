@@ -9,6 +9,7 @@ class Translation(models.Model):
     user = models.ForeignKey(UserProfile, related_name="user", on_delete=models.CASCADE)
     source_text = models.TextField()
     translated_text = models.TextField()
+    normalized_answer = models.TextField(blank=True, default="")
     audio_file_path = models.CharField(max_length=200)
     source_language = models.ForeignKey(
         Language, on_delete=models.CASCADE, related_name="source_language"
@@ -19,5 +20,8 @@ class Translation(models.Model):
     created_on = models.DateTimeField(auto_now_add=True)
     session = models.ForeignKey(ReadingSession, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "id"])]
+
     def __str__(self):
         return "{} - {} -> {}".format(self.user, self.source_text, self.translated_text)